@@ -0,0 +1,38 @@
+"""
+Numbaカーネルの事前（AOT）コンパイルスクリプト
+
+main.py の @njit カーネルを固定シグネチャでコンパイルし、同じディレクトリに
+running_kernels 拡張モジュールを生成する。生成物がある場合、main.py は初回リクエストで
+JITコンパイルを待たずにこちらを使う（ない場合は従来どおり @njit 版にフォールバックする）。
+
+使い方:
+    cd app && python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+import main
+
+cc = CC('running_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# サーバーが扱う配列の型で固定する（座標・可視性は (F, 33) float32、インデックスは int64）
+cc.export(
+    'cycle_angles',
+    'f8[:, :](f4[:, :], f4[:, :], f4[:, :], i8[:], i8[:], f8[:], f8[:])'
+)(main._cycle_angles_kernel.py_func)
+cc.export('fill_nans_linear', 'void(f8[:, :])')(main._fill_nans_linear_kernel.py_func)
+cc.export(
+    'weighted_deviation',
+    'UniTuple(f8[:], 2)(f8[:], f8[:], f8[:], f8)'
+)(main._compute_weighted_deviation.py_func)
+cc.export(
+    'merge_alternating_strikes',
+    'Tuple((i8[:], u1[:], b1[:]))(i8[:], i8[:])'
+)(main._merge_alternating_strikes_kernel.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f"✅ AOTカーネルを生成しました: {cc.output_dir}")
@@ -1,29 +1,125 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, Field
 import uvicorn
+import anyio.to_thread
 from typing import List, Dict, Any, Optional
 import math
+import json
+import functools
+import hashlib
+import logging
+import logging.handlers
+import atexit
+import queue
+import threading
+from types import MappingProxyType
 import numpy as np
 import os
 import sys
 from scipy import signal
+from scipy.ndimage import convolve1d, uniform_filter1d
+
+# Numba（JITコンパイル）はオプション。未インストール環境ではPythonのまま動作させる
+try:
+    from numba import config as numba_config, njit, prange
+    NUMBA_AVAILABLE = True
+    # スレッドレイヤーは workqueue に固定する。TBB が入っている環境では既定で TBB が選ばれ、
+    # メインスレッド以外（スレッドプールのハンドラ）から最初に並列カーネルを起動すると応答が返らなくなる。
+    # workqueue は並列領域の同時起動に対応しないため、起動は下の PARALLEL_KERNEL_LOCK で直列化する
+    numba_config.THREADING_LAYER = 'workqueue'
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba未導入時のフォールバック（デコレータを素通しする）"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# parallel=True のカーネルはスレッドプールのハンドラや複数リクエストから同時に呼ばれうる。
+# workqueue スレッドレイヤーは並列領域の同時起動を検出するとプロセスごと終了するため、
+# 並列カーネルの起動はこのロックで1スレッドずつに直列化する（各呼び出しは引き続き全コアを使う）
+PARALLEL_KERNEL_LOCK = threading.Lock()
+
+# orjson（高速JSONシリアライザ）はオプション。未インストール環境では標準のJSONResponseを使う
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    def serialize_json(content: Any) -> bytes:
+        """レスポンスと同じ形式でJSONをバイト列にシリアライズする（numpy の値も可）"""
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    class NumpyORJSONResponse(ORJSONResponse):
+        """numpy の数値・配列もそのままシリアライズする ORJSONResponse"""
+        def render(self, content: Any) -> bytes:
+            return serialize_json(content)
+
+    FAST_JSON_RESPONSE = NumpyORJSONResponse
+else:
+    def serialize_json(content: Any) -> bytes:
+        """レスポンスと同じ形式でJSONをバイト列にシリアライズする（JSONResponse と同じ設定）"""
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                          separators=(",", ":")).encode("utf-8")
+
+    FAST_JSON_RESPONSE = JSONResponse
+
+# ログ設定（フレーム単位の詳細はDEBUGレベルで出力し、通常運用では抑制する）
+# リクエスト処理スレッドはキューに積むだけにし、実際の出力はバックグラウンドのリスナーが行う
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# 書式はリスナー側のハンドラで適用する（キューには本文のみを積む）
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO"),
+    handlers=[_log_queue_handler]
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+log = logging.getLogger(__name__)
+
+# NaNを無効値として扱うため、nnan/ninf を含まない fastmath フラグを使用する
+FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
 try:
-    from standard_model_keypoints import generate_keypoints_from_angles
+    from standard_model_keypoints import frame_angles_to_row, generate_keypoints_from_angles_batch
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(__file__))
-    from standard_model_keypoints import generate_keypoints_from_angles
+    from standard_model_keypoints import frame_angles_to_row, generate_keypoints_from_angles_batch
+
+# build_kernels.py で事前（AOT）コンパイルしたカーネルはオプション。
+# 生成物がない環境では @njit 版（初回呼び出し時にJITコンパイル）を使う
+try:
+    import running_kernels
+    AOT_KERNELS_AVAILABLE = True
+except ImportError:
+    running_kernels = None
+    AOT_KERNELS_AVAILABLE = False
 
 # 標準動作モデルデータを取得（完全版を使用）
+# モデルは静的データなので初回に一度だけ構築し、以降は同じ辞書を共有する（呼び出し側で変更しないこと）
 try:
     from standard_model_complete import get_standard_model_data as get_complete_standard_model_data
     # 完全版（101フレーム）を使用
+    @functools.lru_cache(maxsize=1)
     def get_standard_model_data():
         return get_complete_standard_model_data()
 except ImportError:
     # フォールバック: 標準動作モデルデータを直接定義（簡易版）
+    @functools.lru_cache(maxsize=1)
     def get_standard_model_data():
         """標準動作モデルの統計データを返す関数（フォールバック）"""
         # standard_model_complete.pyがインポートできない場合の簡易フォールバック
@@ -33,7 +129,8 @@ except ImportError:
 app = FastAPI(
     title="Feature Extraction Service",
     description="骨格データから絶対角度・重心上下動・ピッチを計算するサービス（足接地検出・自動身長推定機能付き）",
-    version="3.4.0"
+    version="3.4.0",
+    default_response_class=FAST_JSON_RESPONSE
 )
 
 # CORS設定
@@ -45,6 +142,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# レスポンス圧縮（比較結果や角度データなど1KB以上のJSONを gzip で返す）
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# 同期（def）エンドポイントを実行するスレッドプールのサイズ
+THREADPOOL_SIZE = 100
+
+# 動作確認用のテストエンドポイント（/test_* など）を公開するか。本番では ENABLE_TEST_ENDPOINTS=0 で無効化する
+ENABLE_TEST_ENDPOINTS = os.environ.get("ENABLE_TEST_ENDPOINTS", "1") != "0"
+
+def require_test_endpoints():
+    """テストエンドポイントが無効化されている場合は存在しないパスとして404を返す"""
+    if not ENABLE_TEST_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+# テストエンドポイント共通の依存関係（無効時はテストデータの生成まで到達しない）
+TEST_ENDPOINT_DEPENDENCIES = [Depends(require_test_endpoints)]
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """CPU処理を行う同期エンドポイントが同時に処理できるよう、スレッドプールを拡張する"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+@app.on_event("startup")
+async def warm_up_kernels():
+    """
+    最初のリクエストでJITコンパイルが走らないよう、比較判定・接地マージ・並列角度計算のカーネルを事前に呼び出しておく
+    （並列カーネルはここでメインスレッドから一度起動し、スレッドレイヤーの初期化も済ませる）
+    """
+    one = np.ones(1, dtype=np.float64)
+    compute_weighted_deviation(one, one, one, JUDGMENT_OFFSET)
+    strikes = np.arange(2, dtype=np.int64)
+    merge_alternating_strikes(strikes, strikes)
+    frames = np.full((CYCLE_PARALLEL_MIN_FRAMES, 33), 0.5, dtype=np.float32)
+    compute_cycle_angles(frames, frames, frames)
+    AngleCalculator()._calculate_relative_angles_soa(frames, frames, frames)
+
 # リクエスト・レスポンスのデータモデル
 class KeyPoint(BaseModel):
     x: float
@@ -52,6 +185,10 @@ class KeyPoint(BaseModel):
     z: float
     visibility: float
 
+# 計算済みの数値からサーバー内部でKeyPointを作るときは、フィールド検証を省いて生成する
+# （リクエストの入力検証はHTTP境界のPydanticモデルで行われる。v2 は model_construct、v1 は construct）
+construct_keypoint = getattr(KeyPoint, 'model_construct', None) or KeyPoint.construct
+
 class PoseFrame(BaseModel):
     frame_number: int
     timestamp: float
@@ -63,6 +200,67 @@ class PoseAnalysisRequest(BaseModel):
     pose_data: List[PoseFrame]
     video_info: Dict[str, Any]
 
+# 入力前処理（mode='before'）のバリデータ。v2 は field_validator、v1 は validator(pre=True)
+# あわせて、型注釈とは別にOpenAPIのスキーマを指定する必須フィールドの作り方も切り替える
+# （v2 は json_schema_extra、v1 は Field の追加引数がそのままスキーマに入る）
+try:
+    from pydantic import field_validator
+    _before_validator = functools.partial(field_validator, mode='before')
+
+    def _field_with_schema(schema: Dict[str, Any]):
+        return Field(..., json_schema_extra=schema)
+except ImportError:
+    from pydantic import validator
+    _before_validator = functools.partial(validator, pre=True)
+
+    def _field_with_schema(schema: Dict[str, Any]):
+        return Field(..., **schema)
+
+# キーポイントとして検証するフィールド。配列には解析で使う先頭3列（x, y, visibility）だけを残す
+# （z は形式の検証のみ行い、どの特徴量計算でも使わないため保持しない）
+KEYPOINT_ARRAY_FIELDS = ('x', 'y', 'visibility', 'z')
+KEYPOINT_ARRAY_COLUMNS = KEYPOINT_ARRAY_FIELDS[:3]
+
+# 配列化する前の float64 値で検証する上限（これを超える値は float32 にすると inf になる）
+KEYPOINT_VALUE_LIMIT = float(np.finfo(np.float32).max)
+
+# /extract のキーポイントのOpenAPIスキーマ（JSONの形式は PoseFrame.keypoints と同じ KeyPoint のリスト）
+KEYPOINT_LIST_SCHEMA = {
+    'type': 'array',
+    'items': (getattr(KeyPoint, 'model_json_schema', None) or KeyPoint.schema)()
+}
+
+class PoseFrameArray(BaseModel):
+    """
+    /extract 用の骨格フレーム（JSONの形式は PoseFrame と同じ）
+    キーポイントはKeyPointモデルを点ごとに生成せず、検証時に (n, 3) の float32 配列
+    （列は x, y, visibility）へ一度に変換する
+    """
+    frame_number: int
+    timestamp: float
+    keypoints: Any = _field_with_schema(KEYPOINT_LIST_SCHEMA)
+    landmarks_detected: bool
+    confidence_score: float
+
+    @_before_validator('keypoints')
+    def keypoints_to_array(cls, value):
+        try:
+            keypoints = np.array(
+                [[kp[field] for field in KEYPOINT_ARRAY_FIELDS] for kp in value], dtype=np.float64
+            ).reshape(-1, len(KEYPOINT_ARRAY_FIELDS))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"keypoints は x, y, z, visibility を持つオブジェクトのリストである必要があります: {e}")
+        # 範囲の検証は float32 へ変換する前に行う（変換後は範囲外の値も inf になり区別できない）
+        if not np.isfinite(keypoints).all():
+            raise ValueError("keypoints の値は有限の数値である必要があります")
+        if (np.abs(keypoints) > KEYPOINT_VALUE_LIMIT).any():
+            raise ValueError(f"keypoints の値は絶対値 {KEYPOINT_VALUE_LIMIT:.3e} 以下である必要があります")
+        return np.ascontiguousarray(keypoints[:, :len(KEYPOINT_ARRAY_COLUMNS)], dtype=np.float32)
+
+class PoseArrayAnalysisRequest(BaseModel):
+    pose_data: List[PoseFrameArray]
+    video_info: Dict[str, Any]
+
 class FeatureExtractionResponse(BaseModel):
     status: str
     message: str
@@ -87,6 +285,175 @@ LANDMARK_INDICES = {
     'right_foot_index': 32
 }
 
+# よく使うランドマークのインデックス（辞書引きを避けるためのモジュール定数、Numbaカーネルでは定数として埋め込まれる）
+LEFT_SHOULDER = LANDMARK_INDICES['left_shoulder']
+RIGHT_SHOULDER = LANDMARK_INDICES['right_shoulder']
+LEFT_ELBOW = LANDMARK_INDICES['left_elbow']
+RIGHT_ELBOW = LANDMARK_INDICES['right_elbow']
+LEFT_WRIST = LANDMARK_INDICES['left_wrist']
+RIGHT_WRIST = LANDMARK_INDICES['right_wrist']
+LEFT_HIP = LANDMARK_INDICES['left_hip']
+RIGHT_HIP = LANDMARK_INDICES['right_hip']
+LEFT_KNEE = LANDMARK_INDICES['left_knee']
+RIGHT_KNEE = LANDMARK_INDICES['right_knee']
+LEFT_ANKLE = LANDMARK_INDICES['left_ankle']
+RIGHT_ANKLE = LANDMARK_INDICES['right_ankle']
+LEFT_FOOT_INDEX = LANDMARK_INDICES['left_foot_index']
+RIGHT_FOOT_INDEX = LANDMARK_INDICES['right_foot_index']
+
+# 足の識別子（配列上の 0=左, 1=右 に対応）
+FOOT_SIDES = ('left', 'right')
+
+# MediaPipeのランドマーク総数
+NUM_LANDMARKS = 33
+
+# 一括gather用のランドマークインデックス配列（モジュール読み込み時に一度だけ構築）
+HIP_IDX = np.array([LEFT_HIP, RIGHT_HIP], dtype=np.int32)
+ANKLE_IDX = np.array([LEFT_ANKLE, RIGHT_ANKLE], dtype=np.int32)
+# 体幹: 左肩・右肩・左股関節・右股関節
+TRUNK_IDX = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP], dtype=np.int32)
+# 骨格身長: 鼻・左右肩・左右股関節・左右膝・左右足首
+HEIGHT_IDX = np.array([
+    0,
+    LEFT_SHOULDER, RIGHT_SHOULDER,
+    LEFT_HIP, RIGHT_HIP,
+    LEFT_KNEE, RIGHT_KNEE,
+    LEFT_ANKLE, RIGHT_ANKLE
+], dtype=np.int32)
+
+def keypoints_to_soa(time_series_keypoints: List[List[KeyPoint]]) -> tuple:
+    """
+    キーポイントの時系列（フレームごとのKeyPointリスト）を
+    x座標・y座標・可視性の3つの (F, 33) float32 配列に変換する
+
+    Args:
+        time_series_keypoints: 全フレームのキーポイントデータ
+
+    Returns:
+        (xs, ys, vis) のタプル。33点に満たないフレームは可視性0（無効）として扱う
+    """
+    n_frames = len(time_series_keypoints)
+    xs = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+    ys = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+    vis = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+
+    for i, frame_keypoints in enumerate(time_series_keypoints):
+        if len(frame_keypoints) >= NUM_LANDMARKS:
+            _write_keypoints_row(xs[i], ys[i], vis[i], frame_keypoints)
+
+    return xs, ys, vis
+
+def synthesize_keypoints_soa(n_frames: int, landmark_table: Dict[int, tuple],
+                             default: tuple = (0.5, 0.5, 0.5)) -> tuple:
+    """
+    テスト用の疑似キーポイントを (F, 33) のSoA配列として一括生成する
+
+    Args:
+        n_frames: フレーム数
+        landmark_table: ランドマークindex → (x, y, 可視性) の辞書
+            x・y にはスカラー（固定位置）か (F,) 配列（フレームごとの動き）を指定できる
+        default: テーブルにないランドマークの (x, y, 可視性)
+
+    Returns:
+        (xs, ys, vis) のタプル（float64）
+    """
+    default_x, default_y, default_vis = default
+    xs = np.full((n_frames, NUM_LANDMARKS), default_x, dtype=np.float64)
+    ys = np.full((n_frames, NUM_LANDMARKS), default_y, dtype=np.float64)
+    vis = np.full((n_frames, NUM_LANDMARKS), default_vis, dtype=np.float64)
+
+    # ランドマーク単位（十数回）のループで列ごとに書き込む
+    for idx, (x, y, visibility) in landmark_table.items():
+        xs[:, idx] = x
+        ys[:, idx] = y
+        vis[:, idx] = visibility
+
+    return xs, ys, vis
+
+def _write_keypoints_row(x_row: np.ndarray, y_row: np.ndarray, vis_row: np.ndarray,
+                         frame_keypoints: List[KeyPoint]) -> None:
+    """確保済みの float32 配列の1行に直接書き込む（中間リストを作らない）"""
+    for j in range(NUM_LANDMARKS):
+        kp = frame_keypoints[j]
+        x_row[j] = kp.x
+        y_row[j] = kp.y
+        vis_row[j] = kp.visibility
+
+def ingest_pose_data(pose_data: List[PoseFrame]) -> tuple:
+    """
+    リクエストの骨格推定データを一度だけ走査し、座標・可視性とフレーム情報をSoA配列に変換する
+
+    Args:
+        pose_data: 骨格推定データ（PoseFrame または PoseFrameArray のリスト）
+
+    Returns:
+        (xs, ys, vis, valid_mask, frame_meta) のタプル
+        valid_mask はランドマークが検出され33点揃っているフレームでTrue
+        frame_meta は frame_number / timestamp / confidence_score → (F,) 配列の辞書
+    """
+    n_frames = len(pose_data)
+    xs = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+    ys = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+    vis = np.zeros((n_frames, NUM_LANDMARKS), dtype=np.float32)
+    valid_mask = np.zeros(n_frames, dtype=bool)
+    frame_numbers = np.empty(n_frames, dtype=np.int64)
+    timestamps = np.empty(n_frames, dtype=np.float64)
+    confidence_scores = np.empty(n_frames, dtype=np.float64)
+
+    for i, frame in enumerate(pose_data):
+        frame_numbers[i] = frame.frame_number
+        timestamps[i] = frame.timestamp
+        confidence_scores[i] = frame.confidence_score
+
+        frame_keypoints = frame.keypoints
+        if len(frame_keypoints) < NUM_LANDMARKS:
+            continue
+        if isinstance(frame_keypoints, np.ndarray):
+            # PoseFrameArray は検証時に配列化済みなので列をそのまま書き込む
+            xs[i] = frame_keypoints[:NUM_LANDMARKS, 0]
+            ys[i] = frame_keypoints[:NUM_LANDMARKS, 1]
+            vis[i] = frame_keypoints[:NUM_LANDMARKS, 2]
+        else:
+            _write_keypoints_row(xs[i], ys[i], vis[i], frame_keypoints)
+        valid_mask[i] = frame.landmarks_detected
+
+    frame_meta = {
+        'frame_number': frame_numbers,
+        'timestamp': timestamps,
+        'confidence_score': confidence_scores
+    }
+    return xs, ys, vis, valid_mask, frame_meta
+
+def pose_to_soa(pose_data: List[PoseFrame]) -> tuple:
+    """
+    リクエストの骨格推定データをSoA配列に変換する
+
+    Args:
+        pose_data: 骨格推定データ
+
+    Returns:
+        (xs, ys, vis, valid_mask) のタプル
+        valid_mask はランドマークが検出され33点揃っているフレームでTrue
+    """
+    xs, ys, vis, valid_mask, _ = ingest_pose_data(pose_data)
+    return xs, ys, vis, valid_mask
+
+def valid_frame_mask(pose_data: List[PoseFrame]) -> np.ndarray:
+    """
+    解析に使えるフレーム（ランドマークが検出され33点揃っている）のマスクを返す
+
+    Args:
+        pose_data: 骨格推定データ
+
+    Returns:
+        (F,) のbool配列
+    """
+    return np.fromiter(
+        (frame.landmarks_detected and len(frame.keypoints) >= NUM_LANDMARKS for frame in pose_data),
+        dtype=bool,
+        count=len(pose_data)
+    )
+
 def calculate_absolute_angle_with_vertical(vector: np.ndarray, forward_positive: bool = True) -> Optional[float]:
     """
     ベクトルと鉛直軸がなす角度を計算する（atan2ベース、0度前後の値）
@@ -184,33 +551,23 @@ def calculate_joint_angle_from_three_points(point1: KeyPoint, point2: KeyPoint,
             point3.visibility < 0.5):
             return None
         
-        # ベクトルを計算
-        vector1 = np.array([point1.x - point2.x, point1.y - point2.y])
-        vector2 = np.array([point3.x - point2.x, point3.y - point2.y])
-        
-        # ベクトルの長さを計算
-        length1 = np.linalg.norm(vector1)
-        length2 = np.linalg.norm(vector2)
+        # ベクトルを計算（2要素なのでNumPy配列は作らずスカラーのまま扱う）
+        v1x = point1.x - point2.x
+        v1y = point1.y - point2.y
+        v2x = point3.x - point2.x
+        v2y = point3.y - point2.y
         
         # ゼロベクトルチェック
-        if length1 < 1e-10 or length2 < 1e-10:
+        if math.hypot(v1x, v1y) < 1e-10 or math.hypot(v2x, v2y) < 1e-10:
             return None
         
-        # 正規化されたベクトル
-        unit_vector1 = vector1 / length1
-        unit_vector2 = vector2 / length2
-        
-        # 内積を計算してcosを求める
-        cos_angle = np.clip(np.dot(unit_vector1, unit_vector2), -1.0, 1.0)
-        
-        # 角度を計算（ラジアン→度）
-        angle_rad = np.arccos(cos_angle)
-        angle_deg = np.degrees(angle_rad)
-        
-        return angle_deg
+        # atan2(|外積|, 内積) で角度を計算（正規化・clip が不要で、0°/180°付近でも精度が落ちない）
+        cross = v1x * v2y - v1y * v2x
+        dot = v1x * v2x + v1y * v2y
+        return math.degrees(math.atan2(abs(cross), dot))
         
     except Exception as e:
-        print(f"❌ 関節角度計算エラー: {e}")
+        log.warning("❌ 関節角度計算エラー: %s", e)
         return None
 
 def get_shoulder_center(left_shoulder: KeyPoint, right_shoulder: KeyPoint) -> Optional[tuple]:
@@ -229,7 +586,7 @@ def get_hip_center(left_hip: KeyPoint, right_hip: KeyPoint) -> Optional[tuple]:
 
 def create_keypoint_from_coordinates(x: float, y: float) -> KeyPoint:
     """座標から仮想的なKeypointを作成"""
-    return KeyPoint(x=x, y=y, z=0.0, visibility=1.0)
+    return construct_keypoint(x=x, y=y, z=0.0, visibility=1.0)
 
 # =============================================================================
 # 相対関節角度計算関数群（仕様2）
@@ -250,15 +607,15 @@ def calculate_hip_joint_angle_relative(keypoints: List[KeyPoint], side: str) ->
     """
     try:
         # 必要なキーポイントを取得
-        left_shoulder = keypoints[LANDMARK_INDICES['left_shoulder']]
-        right_shoulder = keypoints[LANDMARK_INDICES['right_shoulder']]
+        left_shoulder = keypoints[LEFT_SHOULDER]
+        right_shoulder = keypoints[RIGHT_SHOULDER]
         
         if side == 'left':
-            hip = keypoints[LANDMARK_INDICES['left_hip']]
-            knee = keypoints[LANDMARK_INDICES['left_knee']]
+            hip = keypoints[LEFT_HIP]
+            knee = keypoints[LEFT_KNEE]
         else:
-            hip = keypoints[LANDMARK_INDICES['right_hip']]
-            knee = keypoints[LANDMARK_INDICES['right_knee']]
+            hip = keypoints[RIGHT_HIP]
+            knee = keypoints[RIGHT_KNEE]
         
         # 肩の中点を計算
         shoulder_center = get_shoulder_center(left_shoulder, right_shoulder)
@@ -272,12 +629,12 @@ def calculate_hip_joint_angle_relative(keypoints: List[KeyPoint], side: str) ->
         angle = calculate_joint_angle_from_three_points(shoulder_center_kp, hip, knee)
         
         if angle is not None:
-            print(f"   🔗 {side}股関節角度（はさみ角）: {angle:.1f}° (大腿と体幹)")
+            log.debug("   🔗 %s股関節角度（はさみ角）: %.1f° (大腿と体幹)", side, angle)
         
         return angle
             
     except Exception as e:
-        print(f"❌ {side}股関節角度計算エラー: {e}")
+        log.warning("❌ %s股関節角度計算エラー: %s", side, e)
         return None
 
 def calculate_knee_joint_angle_relative(keypoints: List[KeyPoint], side: str) -> Optional[float]:
@@ -295,24 +652,24 @@ def calculate_knee_joint_angle_relative(keypoints: List[KeyPoint], side: str) ->
     """
     try:
         if side == 'left':
-            hip = keypoints[LANDMARK_INDICES['left_hip']]
-            knee = keypoints[LANDMARK_INDICES['left_knee']]
-            ankle = keypoints[LANDMARK_INDICES['left_ankle']]
+            hip = keypoints[LEFT_HIP]
+            knee = keypoints[LEFT_KNEE]
+            ankle = keypoints[LEFT_ANKLE]
         else:
-            hip = keypoints[LANDMARK_INDICES['right_hip']]
-            knee = keypoints[LANDMARK_INDICES['right_knee']]
-            ankle = keypoints[LANDMARK_INDICES['right_ankle']]
+            hip = keypoints[RIGHT_HIP]
+            knee = keypoints[RIGHT_KNEE]
+            ankle = keypoints[RIGHT_ANKLE]
         
         # 3点から角度を計算：股関節-膝-足首
         angle = calculate_joint_angle_from_three_points(hip, knee, ankle)
         
         if angle is not None:
-            print(f"   🔗 {side}膝関節角度（はさみ角）: {angle:.1f}° (大腿と下腿)")
+            log.debug("   🔗 %s膝関節角度（はさみ角）: %.1f° (大腿と下腿)", side, angle)
         
         return angle
         
     except Exception as e:
-        print(f"❌ {side}膝関節角度計算エラー: {e}")
+        log.warning("❌ %s膝関節角度計算エラー: %s", side, e)
         return None
 
 def calculate_ankle_joint_angle_relative(keypoints: List[KeyPoint], side: str) -> Optional[float]:
@@ -330,24 +687,59 @@ def calculate_ankle_joint_angle_relative(keypoints: List[KeyPoint], side: str) -
     """
     try:
         if side == 'left':
-            knee = keypoints[LANDMARK_INDICES['left_knee']]
-            ankle = keypoints[LANDMARK_INDICES['left_ankle']]
-            toe = keypoints[LANDMARK_INDICES['left_foot_index']]
+            knee = keypoints[LEFT_KNEE]
+            ankle = keypoints[LEFT_ANKLE]
+            toe = keypoints[LEFT_FOOT_INDEX]
         else:
-            knee = keypoints[LANDMARK_INDICES['right_knee']]
-            ankle = keypoints[LANDMARK_INDICES['right_ankle']]
-            toe = keypoints[LANDMARK_INDICES['right_foot_index']]
+            knee = keypoints[RIGHT_KNEE]
+            ankle = keypoints[RIGHT_ANKLE]
+            toe = keypoints[RIGHT_FOOT_INDEX]
         
         # 3点から角度を計算：膝-足首-つま先
         angle = calculate_joint_angle_from_three_points(knee, ankle, toe)
         
         if angle is not None:
-            print(f"   🔗 {side}足関節角度（はさみ角）: {angle:.1f}° (下腿と足部)")
+            log.debug("   🔗 %s足関節角度（はさみ角）: %.1f° (下腿と足部)", side, angle)
+        
+        return angle
+        
+    except Exception as e:
+        log.warning("❌ %s足関節角度計算エラー: %s", side, e)
+        return None
+
+def calculate_shoulder_joint_angle_relative(keypoints: List[KeyPoint], side: str) -> Optional[float]:
+    """
+    肩関節角度を計算（相対角度・はさみ角）
+    定義: 体幹と上腕のなす角
+    実装: 「股関節」「肩」「肘」の3点がなす角度
+    
+    Args:
+        keypoints: 全キーポイント
+        side: 'left' または 'right'
+    
+    Returns:
+        肩関節角度（度、0〜180）
+    """
+    try:
+        if side == 'left':
+            hip = keypoints[LEFT_HIP]
+            shoulder = keypoints[LEFT_SHOULDER]
+            elbow = keypoints[LEFT_ELBOW]
+        else:
+            hip = keypoints[RIGHT_HIP]
+            shoulder = keypoints[RIGHT_SHOULDER]
+            elbow = keypoints[RIGHT_ELBOW]
+        
+        # 3点から角度を計算：股関節-肩-肘
+        angle = calculate_joint_angle_from_three_points(hip, shoulder, elbow)
+        
+        if angle is not None:
+            log.debug("   🔗 %s肩関節角度（はさみ角）: %.1f° (体幹と上腕)", side, angle)
         
         return angle
         
     except Exception as e:
-        print(f"❌ {side}足関節角度計算エラー: {e}")
+        log.warning("❌ %s肩関節角度計算エラー: %s", side, e)
         return None
 
 def calculate_elbow_joint_angle_relative(keypoints: List[KeyPoint], side: str) -> Optional[float]:
@@ -365,24 +757,24 @@ def calculate_elbow_joint_angle_relative(keypoints: List[KeyPoint], side: str) -
     """
     try:
         if side == 'left':
-            shoulder = keypoints[LANDMARK_INDICES['left_shoulder']]
-            elbow = keypoints[LANDMARK_INDICES['left_elbow']]
-            wrist = keypoints[LANDMARK_INDICES['left_wrist']]
+            shoulder = keypoints[LEFT_SHOULDER]
+            elbow = keypoints[LEFT_ELBOW]
+            wrist = keypoints[LEFT_WRIST]
         else:
-            shoulder = keypoints[LANDMARK_INDICES['right_shoulder']]
-            elbow = keypoints[LANDMARK_INDICES['right_elbow']]
-            wrist = keypoints[LANDMARK_INDICES['right_wrist']]
+            shoulder = keypoints[RIGHT_SHOULDER]
+            elbow = keypoints[RIGHT_ELBOW]
+            wrist = keypoints[RIGHT_WRIST]
         
         # 3点から角度を計算：肩-肘-手首
         angle = calculate_joint_angle_from_three_points(shoulder, elbow, wrist)
         
         if angle is not None:
-            print(f"   🔗 {side}肘関節角度（はさみ角）: {angle:.1f}° (上腕と前腕)")
+            log.debug("   🔗 %s肘関節角度（はさみ角）: %.1f° (上腕と前腕)", side, angle)
         
         return angle
         
     except Exception as e:
-        print(f"❌ {side}肘関節角度計算エラー: {e}")
+        log.warning("❌ %s肘関節角度計算エラー: %s", side, e)
         return None
 
 def calculate_trunk_angle_relative(keypoints: List[KeyPoint]) -> Optional[float]:
@@ -400,6 +792,201 @@ def calculate_trunk_angle_relative(keypoints: List[KeyPoint]) -> Optional[float]
     # 既存の絶対角度計算を流用
     return calculate_trunk_angle(keypoints)
 
+# =============================================================================
+# 相対関節角度のバッチ計算（動画単位・フレーム並列）
+# =============================================================================
+
+# 肩中点を仮想ランドマークとして33番目の列に追加する
+SHOULDER_CENTER_INDEX = NUM_LANDMARKS
+
+# はさみ角の3点定義: (角度名, 第1点, 頂点, 第3点)
+RELATIVE_JOINT_TRIPLES = [
+    ('left_hip_joint_angle', SHOULDER_CENTER_INDEX, LEFT_HIP, LEFT_KNEE),
+    ('right_hip_joint_angle', SHOULDER_CENTER_INDEX, RIGHT_HIP, RIGHT_KNEE),
+    ('left_knee_joint_angle', LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+    ('right_knee_joint_angle', RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE),
+    ('left_ankle_joint_angle', LEFT_KNEE, LEFT_ANKLE, LEFT_FOOT_INDEX),
+    ('right_ankle_joint_angle', RIGHT_KNEE, RIGHT_ANKLE, RIGHT_FOOT_INDEX),
+    ('left_shoulder_joint_angle', LEFT_HIP, LEFT_SHOULDER, LEFT_ELBOW),
+    ('right_shoulder_joint_angle', RIGHT_HIP, RIGHT_SHOULDER, RIGHT_ELBOW),
+    ('left_elbow_joint_angle', LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST),
+    ('right_elbow_joint_angle', RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST),
+]
+RELATIVE_JOINT_NAMES = [t[0] for t in RELATIVE_JOINT_TRIPLES]
+RELATIVE_TRIPLES_A = np.array([t[1] for t in RELATIVE_JOINT_TRIPLES], dtype=np.int64)
+RELATIVE_TRIPLES_B = np.array([t[2] for t in RELATIVE_JOINT_TRIPLES], dtype=np.int64)
+RELATIVE_TRIPLES_C = np.array([t[3] for t in RELATIVE_JOINT_TRIPLES], dtype=np.int64)
+
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, cache=True)
+def _angles_all_frames(xs, ys, vis, triples_a, triples_b, triples_c, vis_thresh):
+    """
+    全フレーム×全関節のはさみ角をフレーム並列で計算する
+
+    Args:
+        xs, ys, vis: (F, L) の座標・可視性配列
+        triples_a, triples_b, triples_c: 各関節の第1点・頂点・第3点のインデックス (J,)
+        vis_thresh: 有効とみなす可視性の閾値
+
+    Returns:
+        (F, J) の角度配列（度、0〜180）。計算不可の要素はNaN
+    """
+    n_frames = xs.shape[0]
+    n_joints = triples_a.shape[0]
+    out = np.empty((n_frames, n_joints), dtype=np.float32)
+
+    for f in prange(n_frames):
+        for j in range(n_joints):
+            a = triples_a[j]
+            b = triples_b[j]
+            c = triples_c[j]
+            if vis[f, a] < vis_thresh or vis[f, b] < vis_thresh or vis[f, c] < vis_thresh:
+                out[f, j] = np.nan
+                continue
+
+            v1x = xs[f, a] - xs[f, b]
+            v1y = ys[f, a] - ys[f, b]
+            v2x = xs[f, c] - xs[f, b]
+            v2y = ys[f, c] - ys[f, b]
+
+            # ゼロベクトルチェック（単体版と同じ閾値）
+            if math.sqrt(v1x * v1x + v1y * v1y) < 1e-10 or math.sqrt(v2x * v2x + v2y * v2y) < 1e-10:
+                out[f, j] = np.nan
+                continue
+
+            # atan2(|外積|, 内積) はarccosと同じ値をclipなしで得られる
+            cross = v1x * v2y - v1y * v2x
+            dot = v1x * v2x + v1y * v2y
+            out[f, j] = math.degrees(math.atan2(abs(cross), dot))
+
+    return out
+
+def _angles_all_frames_numpy(xs, ys, vis, triples_a, triples_b, triples_c, vis_thresh):
+    """_angles_all_frames のNumPy版（numba未導入時に使用、戻り値は同じ）"""
+    angles = calculate_angles_between_vectors_batch(
+        xs[:, triples_a] - xs[:, triples_b], ys[:, triples_a] - ys[:, triples_b],
+        xs[:, triples_c] - xs[:, triples_b], ys[:, triples_c] - ys[:, triples_b]
+    )
+    visible = ((vis[:, triples_a] >= vis_thresh) &
+               (vis[:, triples_b] >= vis_thresh) &
+               (vis[:, triples_c] >= vis_thresh))
+    angles[~visible] = np.nan
+    return angles
+
+def _append_shoulder_center(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> tuple:
+    """肩中点を仮想ランドマークとして末尾の列に追加する（可視性は左右の小さい方）"""
+    ls, rs = LEFT_SHOULDER, RIGHT_SHOULDER
+    center_x = (xs[:, ls] + xs[:, rs]) / 2
+    center_y = (ys[:, ls] + ys[:, rs]) / 2
+    center_vis = np.minimum(vis[:, ls], vis[:, rs])
+    return (np.ascontiguousarray(np.column_stack([xs, center_x])),
+            np.ascontiguousarray(np.column_stack([ys, center_y])),
+            np.ascontiguousarray(np.column_stack([vis, center_vis])))
+
+def _trunk_angles_batch(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> np.ndarray:
+    """体幹角度（calculate_trunk_angleと同じ定義）を全フレーム分まとめて計算する"""
+    # TRUNK_IDX の並び: 左肩・右肩・左股関節・右股関節
+    tx = xs[:, TRUNK_IDX]
+    ty = ys[:, TRUNK_IDX]
+
+    trunk_x = (tx[:, 0] + tx[:, 1]) / 2 - (tx[:, 2] + tx[:, 3]) / 2
+    trunk_y = (ty[:, 0] + ty[:, 1]) / 2 - (ty[:, 2] + ty[:, 3]) / 2
+
+    # 前傾で負値、後傾で正値（forward_positive=False と同じ）
+    angles = -np.degrees(np.arctan2(trunk_x, -trunk_y))
+
+    valid = (vis[:, TRUNK_IDX] >= 0.5).all(axis=1) & ((trunk_x != 0) | (trunk_y != 0))
+    angles[~valid] = np.nan
+    return angles
+
+# =============================================================================
+# 絶対角度のベクトル化計算（体幹以外の10セグメントを一括で計算）
+# =============================================================================
+
+# セグメントベクトル（始点→終点）の定義。順序は ABSOLUTE_SEGMENT_NAMES と対応
+ABSOLUTE_SEGMENT_NAMES = [
+    'left_thigh_angle', 'right_thigh_angle',          # 膝→股関節（鉛直軸）
+    'left_shank_angle', 'right_shank_angle',          # 足首→膝（鉛直軸）
+    'left_upper_arm_angle', 'right_upper_arm_angle',  # 肘→肩（鉛直軸、符号反転）
+    'left_forearm_angle', 'right_forearm_angle',      # 肘→手首（鉛直下向きとのなす角）
+    'left_foot_angle', 'right_foot_angle'             # 足首→つま先（水平軸）
+]
+# 体幹を先頭に加えた11角度の並び（_cycle_angles_kernel の出力列と対応）
+ABSOLUTE_ANGLE_NAMES = ['trunk_angle'] + ABSOLUTE_SEGMENT_NAMES
+_ABS_TAIL = np.array([
+    LEFT_KNEE, RIGHT_KNEE,
+    LEFT_ANKLE, RIGHT_ANKLE,
+    LEFT_ELBOW, RIGHT_ELBOW,
+    LEFT_ELBOW, RIGHT_ELBOW,
+    LEFT_ANKLE, RIGHT_ANKLE
+])
+_ABS_HEAD = np.array([
+    LEFT_HIP, RIGHT_HIP,
+    LEFT_KNEE, RIGHT_KNEE,
+    LEFT_SHOULDER, RIGHT_SHOULDER,
+    LEFT_WRIST, RIGHT_WRIST,
+    LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX
+])
+# 鉛直軸基準の6角度に掛ける符号と、前腕の左右符号
+_ABS_VERTICAL_SIGNS = np.array([1.0, 1.0, 1.0, 1.0, -1.0, -1.0])
+_ABS_FOREARM_SIGNS = np.array([1.0, -1.0])
+# 可視性の閾値（始点・終点）。上腕・前腕は可視性を確認しない
+_ABS_TAIL_VIS = np.array([0.5, 0.5, 0.5, 0.5, -np.inf, -np.inf, -np.inf, -np.inf, 0.5, 0.5])
+_ABS_HEAD_VIS = _ABS_TAIL_VIS.copy()
+
+def _absolute_segment_angles(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray,
+                             tail_vis: np.ndarray = _ABS_TAIL_VIS,
+                             head_vis: np.ndarray = _ABS_HEAD_VIS) -> np.ndarray:
+    """
+    体幹以外の10セグメントの絶対角度を、gather + arctan2 でまとめて計算する
+
+    Args:
+        xs, ys, vis: (F, 33) の座標・可視性配列
+        tail_vis, head_vis: セグメントごとの始点・終点の可視性閾値 (10,)
+
+    Returns:
+        (F, 10) の角度配列（ABSOLUTE_SEGMENT_NAMES 順）。計算不可の要素はNaN
+    """
+    dx = xs[:, _ABS_HEAD] - xs[:, _ABS_TAIL]
+    dy = ys[:, _ABS_HEAD] - ys[:, _ABS_TAIL]
+    angles = np.empty_like(dx)
+
+    # 大腿・下腿・上腕: 鉛直軸（上向き）からの角度
+    angles[:, :6] = np.degrees(np.arctan2(dx[:, :6], -dy[:, :6])) * _ABS_VERTICAL_SIGNS
+
+    # 前腕: 鉛直下向きベクトルとのなす角（左は正値、右は負値）
+    angles[:, 6:8] = np.degrees(np.arctan2(np.abs(dx[:, 6:8]), dy[:, 6:8])) * _ABS_FOREARM_SIGNS
+
+    # 足部: 水平軸からの角度を -90～+90 に折り返す
+    foot = np.degrees(np.arctan2(dy[:, 8:], dx[:, 8:]))
+    foot = np.where(foot > 90, 180 - foot, foot)
+    angles[:, 8:] = np.where(foot < -90, -180 - foot, foot)
+
+    valid = ((dx != 0) | (dy != 0)) & (vis[:, _ABS_TAIL] >= tail_vis) & (vis[:, _ABS_HEAD] >= head_vis)
+    angles[~valid] = np.nan
+    return angles
+
+def _nan_to_none(value: float) -> Optional[float]:
+    """NaNをNoneに変換する（フレーム単位の結果辞書用）"""
+    return None if np.isnan(value) else float(value)
+
+def _keypoints_row_to_soa(keypoints: List[KeyPoint]) -> tuple:
+    """1フレーム分のキーポイントを (1, n) の float64 座標・可視性配列にする"""
+    n_points = len(keypoints)
+    xs = np.fromiter((kp.x for kp in keypoints), dtype=np.float64, count=n_points).reshape(1, n_points)
+    ys = np.fromiter((kp.y for kp in keypoints), dtype=np.float64, count=n_points).reshape(1, n_points)
+    vis = np.fromiter((kp.visibility for kp in keypoints), dtype=np.float64, count=n_points).reshape(1, n_points)
+    return xs, ys, vis
+
+def frame_angles_from_batch(batch_angles: Dict[str, Any], frame_idx: int) -> Dict[str, Any]:
+    """
+    calculate_all_angles_batch / calculate_all_angles_soa の結果から1フレーム分を取り出し、
+    calculate_all_angles と同じ形式（NaNはNone）の辞書にする
+    """
+    return {
+        key: value if key == 'calculation_mode' else _nan_to_none(value[frame_idx])
+        for key, value in batch_angles.items()
+    }
+
 # =============================================================================
 # 角度計算方式統合クラス
 # =============================================================================
@@ -421,6 +1008,17 @@ class AngleCalculator:
             mode: 計算モード（'absolute' または 'relative'）
         """
         self.mode = mode
+        # モードごとの計算関数をここで一度だけ確定させ、フレームごとの分岐をなくす
+        if mode == AngleCalculationMode.ABSOLUTE:
+            self._impl = self._calculate_absolute_angles
+            self._batch_impl = self._calculate_absolute_angles_batch
+            self._soa_impl = self._calculate_absolute_angles_soa
+        elif mode == AngleCalculationMode.RELATIVE:
+            self._impl = self._calculate_relative_angles
+            self._batch_impl = self._calculate_relative_angles_batch
+            self._soa_impl = self._calculate_relative_angles_soa
+        else:
+            raise ValueError(f"不明な計算モード: {mode}")
         print(f"🔧 角度計算モード: {mode}")
     
     def calculate_all_angles(self, keypoints: List[KeyPoint]) -> Dict[str, Any]:
@@ -433,73 +1031,116 @@ class AngleCalculator:
         Returns:
             計算結果の辞書
         """
-        if self.mode == AngleCalculationMode.ABSOLUTE:
-            return self._calculate_absolute_angles(keypoints)
-        elif self.mode == AngleCalculationMode.RELATIVE:
-            return self._calculate_relative_angles(keypoints)
+        return self._impl(keypoints)
+
+    def calculate_all_angles_batch(self, time_series_keypoints: List[List[KeyPoint]]) -> Dict[str, Any]:
+        """
+        指定されたモードで全フレームの全角度をまとめて計算
+
+        Args:
+            time_series_keypoints: 全フレームのキーポイントデータ
+
+        Returns:
+            角度名 → (F,) 配列の辞書（計算不可のフレームはNaN）
+        """
+        return self._batch_impl(time_series_keypoints)
+
+    def calculate_all_angles_soa(self, xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> Dict[str, Any]:
+        """
+        指定されたモードで全フレームの全角度をSoA配列から直接計算（KeyPointを経由しない）
+
+        Args:
+            xs, ys, vis: (F, 33) の座標・可視性配列
+
+        Returns:
+            角度名 → (F,) 配列の辞書（計算不可のフレームはNaN）
+        """
+        return self._soa_impl(xs, ys, vis)
+
+    def calculate_both_modes_soa(self, xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> tuple:
+        """
+        モードに関係なく絶対角度と相対関節角度の両方を計算（両モード共通の体幹角度は1回だけ計算）
+
+        Args:
+            xs, ys, vis: (F, 33) の座標・可視性配列
+
+        Returns:
+            (絶対角度の辞書, 相対関節角度の辞書)。形式は calculate_all_angles_soa と同じ
+        """
+        trunk_angles = _trunk_angles_batch(xs, ys, vis)
+        return (self._calculate_absolute_angles_soa(xs, ys, vis, trunk_angles),
+                self._calculate_relative_angles_soa(xs, ys, vis, trunk_angles))
+
+    def _calculate_absolute_angles_batch(self, time_series_keypoints: List[List[KeyPoint]]) -> Dict[str, Any]:
+        """絶対角度の全フレーム計算"""
+        xs, ys, vis = keypoints_to_soa(time_series_keypoints)
+        return self._calculate_absolute_angles_soa(xs, ys, vis)
+
+    def _calculate_absolute_angles_soa(self, xs: np.ndarray, ys: np.ndarray, vis: np.ndarray,
+                                       trunk_angles: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """絶対角度の全フレーム計算（SoA配列入力、計算済みの体幹角度があれば再利用）"""
+        segment_angles = _absolute_segment_angles(xs, ys, vis)
+        if trunk_angles is None:
+            trunk_angles = _trunk_angles_batch(xs, ys, vis)
+
+        results: Dict[str, Any] = {'trunk_angle': trunk_angles}
+        for j, name in enumerate(ABSOLUTE_SEGMENT_NAMES):
+            results[name] = segment_angles[:, j]
+        results['calculation_mode'] = 'absolute'
+        return results
+
+    def _calculate_relative_angles_batch(self, time_series_keypoints: List[List[KeyPoint]]) -> Dict[str, Any]:
+        """相対関節角度の全フレーム計算"""
+        xs, ys, vis = keypoints_to_soa(time_series_keypoints)
+        return self._calculate_relative_angles_soa(xs, ys, vis)
+
+    def _calculate_relative_angles_soa(self, xs: np.ndarray, ys: np.ndarray, vis: np.ndarray,
+                                       trunk_angles: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """相対関節角度の全フレーム計算（SoA配列入力、Numbaカーネルでフレーム並列、計算済みの体幹角度があれば再利用）"""
+        ext_xs, ext_ys, ext_vis = _append_shoulder_center(xs, ys, vis)
+        if NUMBA_AVAILABLE:
+            with PARALLEL_KERNEL_LOCK:
+                joint_angles = _angles_all_frames(
+                    ext_xs, ext_ys, ext_vis,
+                    RELATIVE_TRIPLES_A, RELATIVE_TRIPLES_B, RELATIVE_TRIPLES_C, 0.5
+                )
         else:
-            raise ValueError(f"不明な計算モード: {self.mode}")
-    
+            joint_angles = _angles_all_frames_numpy(
+                ext_xs, ext_ys, ext_vis,
+                RELATIVE_TRIPLES_A, RELATIVE_TRIPLES_B, RELATIVE_TRIPLES_C, 0.5
+            )
+        if trunk_angles is None:
+            trunk_angles = _trunk_angles_batch(xs, ys, vis)
+
+        results: Dict[str, Any] = {'trunk_angle': trunk_angles}
+        for j, name in enumerate(RELATIVE_JOINT_NAMES):
+            results[name] = joint_angles[:, j]
+        results['calculation_mode'] = 'relative'
+        return results
+
     def _calculate_absolute_angles(self, keypoints: List[KeyPoint]) -> Dict[str, Any]:
         """絶対角度計算（既存仕様 + 新規追加）"""
-        return {
-            'trunk_angle': calculate_trunk_angle(keypoints),
-            'left_thigh_angle': calculate_thigh_angle(
-                keypoints[LANDMARK_INDICES['left_hip']], 
-                keypoints[LANDMARK_INDICES['left_knee']], 
-                'left'
-            ),
-            'right_thigh_angle': calculate_thigh_angle(
-                keypoints[LANDMARK_INDICES['right_hip']], 
-                keypoints[LANDMARK_INDICES['right_knee']], 
-                'right'
-            ),
-            'left_shank_angle': calculate_lower_leg_angle(
-                keypoints[LANDMARK_INDICES['left_knee']], 
-                keypoints[LANDMARK_INDICES['left_ankle']], 
-                'left'
-            ),
-            'right_shank_angle': calculate_lower_leg_angle(
-                keypoints[LANDMARK_INDICES['right_knee']], 
-                keypoints[LANDMARK_INDICES['right_ankle']], 
-                'right'
-            ),
-            # 新規追加角度
-            'left_upper_arm_angle': calculate_upper_arm_angle(
-                keypoints[LANDMARK_INDICES['left_shoulder']], 
-                keypoints[LANDMARK_INDICES['left_elbow']], 
-                'left'
-            ),
-            'right_upper_arm_angle': calculate_upper_arm_angle(
-                keypoints[LANDMARK_INDICES['right_shoulder']], 
-                keypoints[LANDMARK_INDICES['right_elbow']], 
-                'right'
-            ),
-            'left_forearm_angle': calculate_forearm_angle(
-                keypoints[LANDMARK_INDICES['left_elbow']], 
-                keypoints[LANDMARK_INDICES['left_wrist']], 
-                'left'
-            ),
-            'right_forearm_angle': calculate_forearm_angle(
-                keypoints[LANDMARK_INDICES['right_elbow']], 
-                keypoints[LANDMARK_INDICES['right_wrist']], 
-                'right'
-            ),
-            'left_foot_angle': calculate_foot_angle(
-                keypoints[LANDMARK_INDICES['left_ankle']], 
-                keypoints[LANDMARK_INDICES['left_foot_index']], 
-                'left'
-            ),
-            'right_foot_angle': calculate_foot_angle(
-                keypoints[LANDMARK_INDICES['right_ankle']], 
-                keypoints[LANDMARK_INDICES['right_foot_index']], 
-                'right'
-            ),
-            'calculation_mode': 'absolute'
-        }
+        n_points = len(keypoints)
+        xs, ys, vis = _keypoints_row_to_soa(keypoints)
+
+        if NUMBA_AVAILABLE and n_points >= NUM_LANDMARKS:
+            # 11角度を1回のコンパイル済みカーネル呼び出しで計算（中間配列を作らない）
+            angles = _cycle_angles_kernel(xs, ys, vis, _ABS_TAIL, _ABS_HEAD, _ABS_TAIL_VIS, _ABS_HEAD_VIS)[0]
+        else:
+            angles = np.concatenate((_trunk_angles_batch(xs, ys, vis), _absolute_segment_angles(xs, ys, vis)[0]))
+
+        results: Dict[str, Any] = {name: _nan_to_none(angle) for name, angle in zip(ABSOLUTE_ANGLE_NAMES, angles)}
+        results['calculation_mode'] = 'absolute'
+        return results
     
     def _calculate_relative_angles(self, keypoints: List[KeyPoint]) -> Dict[str, Any]:
         """相対関節角度計算（新仕様）"""
+        if len(keypoints) >= NUM_LANDMARKS:
+            # 左右の膝を含む全関節のはさみ角を、1行のSoA配列に対するバッチ計算1回で求める
+            xs, ys, vis = _keypoints_row_to_soa(keypoints)
+            return frame_angles_from_batch(self._calculate_relative_angles_soa(xs, ys, vis), 0)
+
+        # ランドマークが欠けているフレームは関節ごとに計算する（取得できない関節のみNone）
         return {
             'trunk_angle': calculate_trunk_angle_relative(keypoints),
             'left_hip_joint_angle': calculate_hip_joint_angle_relative(keypoints, 'left'),
@@ -508,6 +1149,8 @@ class AngleCalculator:
             'right_knee_joint_angle': calculate_knee_joint_angle_relative(keypoints, 'right'),
             'left_ankle_joint_angle': calculate_ankle_joint_angle_relative(keypoints, 'left'),
             'right_ankle_joint_angle': calculate_ankle_joint_angle_relative(keypoints, 'right'),
+            'left_shoulder_joint_angle': calculate_shoulder_joint_angle_relative(keypoints, 'left'),
+            'right_shoulder_joint_angle': calculate_shoulder_joint_angle_relative(keypoints, 'right'),
             'left_elbow_joint_angle': calculate_elbow_joint_angle_relative(keypoints, 'left'),
             'right_elbow_joint_angle': calculate_elbow_joint_angle_relative(keypoints, 'right'),
             'calculation_mode': 'relative'
@@ -528,12 +1171,13 @@ def calculate_upper_arm_angle(shoulder: KeyPoint, elbow: KeyPoint, side: str) ->
         # 上腕ベクトル（肩→肘）- 肘を基準とした方向
         upper_arm_vector = np.array([shoulder.x - elbow.x, shoulder.y - elbow.y])
         
-        print(f"   💪 {side}上腕ベクトル: [{upper_arm_vector[0]:.3f}, {upper_arm_vector[1]:.3f}] (肘→肩)")
+        log.debug("   💪 %s上腕ベクトル: [%.3f, %.3f] (肘→肩)", side, upper_arm_vector[0], upper_arm_vector[1])
         
         # 肘を通る鉛直軸との角度を計算: 軸の右側で負値、左側で正値
         angle = calculate_absolute_angle_with_vertical(upper_arm_vector, forward_positive=False)
         
-        print(f"   💪 {side}上腕角度: {angle:.1f}° (肘基準鉛直軸、右側負値・左側正値)")
+        if angle is not None:
+            log.debug("   💪 %s上腕角度: %.1f° (肘基準鉛直軸、右側負値・左側正値)", side, angle)
         
         return angle
         
@@ -550,7 +1194,7 @@ def calculate_forearm_angle(elbow: KeyPoint, wrist: KeyPoint, side: str) -> Opti
         # 前腕ベクトル（肘→手首）- 前腕の自然な方向
         forearm_vector = np.array([wrist.x - elbow.x, wrist.y - elbow.y])
         
-        print(f"   🤚 {side}前腕ベクトル: [{forearm_vector[0]:.3f}, {forearm_vector[1]:.3f}] (肘→手首)")
+        log.debug("   🤚 %s前腕ベクトル: [%.3f, %.3f] (肘→手首)", side, forearm_vector[0], forearm_vector[1])
         
         # 鉛直軸（下向き）との角度を直接計算
         vertical_down_vector = np.array([0.0, 1.0])  # 鉛直下向き
@@ -567,7 +1211,7 @@ def calculate_forearm_angle(elbow: KeyPoint, wrist: KeyPoint, side: str) -> Opti
         else:
             angle = -raw_angle  # 右側は負の値
         
-        print(f"   🤚 {side}前腕角度: {angle:.1f}° (鉛直軸との角度、左右符号調整)")
+        log.debug("   🤚 %s前腕角度: %.1f° (鉛直軸との角度、左右符号調整)", side, angle)
         
         return angle
         
@@ -590,12 +1234,13 @@ def calculate_foot_angle(ankle: KeyPoint, toe: KeyPoint, side: str) -> Optional[
         # 足部ベクトル（足首→つま先）
         foot_vector = np.array([toe.x - ankle.x, toe.y - ankle.y])
         
-        print(f"   🦶 {side}足部ベクトル: [{foot_vector[0]:.3f}, {foot_vector[1]:.3f}] (足首→つま先)")
+        log.debug("   🦶 %s足部ベクトル: [%.3f, %.3f] (足首→つま先)", side, foot_vector[0], foot_vector[1])
         
         # 水平軸との角度計算
         angle = calculate_absolute_angle_with_horizontal(foot_vector)
         
-        print(f"   🦶 {side}足部角度: {angle:.1f}° (上で正値、下で負値)")
+        if angle is not None:
+            log.debug("   🦶 %s足部角度: %.1f° (上で正値、下で負値)", side, angle)
         
         return angle
         
@@ -639,6 +1284,44 @@ def calculate_angle_between_vectors(vector1: np.ndarray, vector2: np.ndarray) ->
     except Exception:
         return None
 
+def calculate_angles_between_vectors_batch(v1x: np.ndarray, v1y: np.ndarray,
+                                           v2x: np.ndarray, v2y: np.ndarray) -> np.ndarray:
+    """
+    calculate_angle_between_vectors のバッチ版（(F, J) など任意形状で要素ごとに計算）
+
+    Args:
+        v1x, v1y: 第1ベクトルのx・y成分
+        v2x, v2y: 第2ベクトルのx・y成分
+
+    Returns:
+        角度（度数法、0～180度）の float32 配列。長さ0のベクトルを含む要素はNaN
+
+    Note:
+        atan2(|外積|, 内積) で求めるため、正規化・clip は不要。
+        各段で中間配列を作らないよう、ufuncの out= で同じバッファに順に書き込む
+    """
+    angle_buf = np.empty(np.broadcast(v1x, v2x).shape, dtype=np.float32)
+    dot_buf = np.empty_like(angle_buf)
+    work_buf = np.empty_like(angle_buf)
+
+    # 外積の絶対値
+    np.multiply(v1x, v2y, out=angle_buf)
+    np.multiply(v1y, v2x, out=work_buf)
+    np.subtract(angle_buf, work_buf, out=angle_buf)
+    np.absolute(angle_buf, out=angle_buf)
+
+    # 内積
+    np.multiply(v1x, v2x, out=dot_buf)
+    np.multiply(v1y, v2y, out=work_buf)
+    np.add(dot_buf, work_buf, out=dot_buf)
+
+    np.arctan2(angle_buf, dot_buf, out=angle_buf)
+    np.degrees(angle_buf, out=angle_buf)
+
+    zero_length = ((v1x == 0) & (v1y == 0)) | ((v2x == 0) & (v2y == 0))
+    angle_buf[zero_length] = np.nan
+    return angle_buf
+
 def calculate_trunk_angle(keypoints: List[KeyPoint]) -> Optional[float]:
     """
     体幹角度を計算する（修正済み符号規則）
@@ -647,13 +1330,14 @@ def calculate_trunk_angle(keypoints: List[KeyPoint]) -> Optional[float]:
     ・後傾で正値（軸の左側）
     """
     try:
-        left_shoulder = keypoints[LANDMARK_INDICES['left_shoulder']]
-        right_shoulder = keypoints[LANDMARK_INDICES['right_shoulder']]
-        left_hip = keypoints[LANDMARK_INDICES['left_hip']]
-        right_hip = keypoints[LANDMARK_INDICES['right_hip']]
+        left_shoulder = keypoints[LEFT_SHOULDER]
+        right_shoulder = keypoints[RIGHT_SHOULDER]
+        left_hip = keypoints[LEFT_HIP]
+        right_hip = keypoints[RIGHT_HIP]
         
         # すべてのキーポイントが有効か確認
-        if any(kp.visibility < 0.5 for kp in [left_shoulder, right_shoulder, left_hip, right_hip]):
+        if (left_shoulder.visibility < 0.5 or right_shoulder.visibility < 0.5 or
+                left_hip.visibility < 0.5 or right_hip.visibility < 0.5):
             return None
         
         # 肩の中心点と股関節の中心点を計算
@@ -666,13 +1350,14 @@ def calculate_trunk_angle(keypoints: List[KeyPoint]) -> Optional[float]:
         trunk_vector = np.array([shoulder_center_x - hip_center_x, shoulder_center_y - hip_center_y])
         
         # デバッグ出力を追加
-        print(f"🔍 体幹角度計算: 股関節({hip_center_x:.3f}, {hip_center_y:.3f}) → 肩({shoulder_center_x:.3f}, {shoulder_center_y:.3f})")
-        print(f"   体幹ベクトル: [{trunk_vector[0]:.3f}, {trunk_vector[1]:.3f}]")
+        log.debug("🔍 体幹角度計算: 股関節(%.3f, %.3f) → 肩(%.3f, %.3f)", hip_center_x, hip_center_y, shoulder_center_x, shoulder_center_y)
+        log.debug("   体幹ベクトル: [%.3f, %.3f]", trunk_vector[0], trunk_vector[1])
         
         # 修正済み符号規則: 前傾で負値、後傾で正値
         # forward_positive=False で前方（右）への傾きを負値にする
         angle = calculate_absolute_angle_with_vertical(trunk_vector, forward_positive=False)
-        print(f"   計算された体幹角度: {angle:.1f}° (前傾で負値、後傾で正値)")
+        if angle is not None:
+            log.debug("   計算された体幹角度: %.1f° (前傾で負値、後傾で正値)", angle)
         
         return angle
         
@@ -694,12 +1379,13 @@ def calculate_thigh_angle(hip: KeyPoint, knee: KeyPoint, side: str) -> Optional[
         # 大腿ベクトル（膝→股関節）
         thigh_vector = np.array([hip.x - knee.x, hip.y - knee.y])
         
-        print(f"   🦵 {side}大腿ベクトル: [{thigh_vector[0]:.3f}, {thigh_vector[1]:.3f}] (膝→股関節)")
+        log.debug("   🦵 %s大腿ベクトル: [%.3f, %.3f] (膝→股関節)", side, thigh_vector[0], thigh_vector[1])
         
         # 修正済み符号規則: 膝が後方で正値（forward_positive=True）
         angle = calculate_absolute_angle_with_vertical(thigh_vector, forward_positive=True)
         
-        print(f"   🦵 {side}大腿角度: {angle:.1f}° (膝が後方で正値、前方で負値)")
+        if angle is not None:
+            log.debug("   🦵 %s大腿角度: %.1f° (膝が後方で正値、前方で負値)", side, angle)
         
         return angle
         
@@ -721,12 +1407,13 @@ def calculate_lower_leg_angle(knee: KeyPoint, ankle: KeyPoint, side: str) -> Opt
         # 下腿ベクトル（足首→膝）
         lower_leg_vector = np.array([knee.x - ankle.x, knee.y - ankle.y])
         
-        print(f"   🦵 {side}下腿ベクトル: [{lower_leg_vector[0]:.3f}, {lower_leg_vector[1]:.3f}] (足首→膝)")
+        log.debug("   🦵 %s下腿ベクトル: [%.3f, %.3f] (足首→膝)", side, lower_leg_vector[0], lower_leg_vector[1])
         
         # 修正済み符号規則: 足首が後方で正値（forward_positive=True）
         angle = calculate_absolute_angle_with_vertical(lower_leg_vector, forward_positive=True)
         
-        print(f"   🦵 {side}下腿角度: {angle:.1f}° (足首が後方で正値、前方で負値)")
+        if angle is not None:
+            log.debug("   🦵 %s下腿角度: %.1f° (足首が後方で正値、前方で負値)", side, angle)
         
         return angle
         
@@ -737,6 +1424,45 @@ def calculate_lower_leg_angle(knee: KeyPoint, ankle: KeyPoint, side: str) -> Opt
 # 新機能：重心上下動とピッチの計算
 # =============================================================================
 
+def calculate_skeletal_heights_batch(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> np.ndarray:
+    """
+    全フレームの「骨格上の全長」をまとめて計算する
+
+    Args:
+        xs, ys, vis: (F, 33) の座標・可視性配列
+
+    Returns:
+        (F,) の骨格上の全長。必要なキーポイントの可視性が0.5未満のフレームはNaN
+    """
+    # 必要な9点を一度のgatherで取り出す（HEIGHT_IDX の並び: 鼻・左右肩・左右股関節・左右膝・左右足首）
+    hx = xs[:, HEIGHT_IDX]
+    hy = ys[:, HEIGHT_IDX]
+    nose, ls, rs, lh, rh, lk, rk, la, ra = range(len(HEIGHT_IDX))
+
+    # 1. 下腿長: 足首から膝までの距離（左右の平均）
+    avg_lower_leg_length = (np.hypot(hx[:, lk] - hx[:, la], hy[:, lk] - hy[:, la]) +
+                            np.hypot(hx[:, rk] - hx[:, ra], hy[:, rk] - hy[:, ra])) / 2
+
+    # 2. 大腿長: 膝から股関節までの距離（左右の平均）
+    avg_thigh_length = (np.hypot(hx[:, lh] - hx[:, lk], hy[:, lh] - hy[:, lk]) +
+                        np.hypot(hx[:, rh] - hx[:, rk], hy[:, rh] - hy[:, rk])) / 2
+
+    # 3. 体幹長: 股関節の中点から肩の中点までの距離
+    hip_center_x = (hx[:, lh] + hx[:, rh]) / 2
+    hip_center_y = (hy[:, lh] + hy[:, rh]) / 2
+    shoulder_center_x = (hx[:, ls] + hx[:, rs]) / 2
+    shoulder_center_y = (hy[:, ls] + hy[:, rs]) / 2
+    trunk_length = np.hypot(shoulder_center_x - hip_center_x, shoulder_center_y - hip_center_y)
+
+    # 4. 頭部長: 肩の中点から鼻までの距離
+    head_length = np.hypot(hx[:, nose] - shoulder_center_x, hy[:, nose] - shoulder_center_y)
+
+    total_skeletal_height = avg_lower_leg_length + avg_thigh_length + trunk_length + head_length
+
+    # 可視性チェック（0.5以上で有効とする）
+    visible = (vis[:, HEIGHT_IDX] >= 0.5).all(axis=1)
+    return np.where(visible, total_skeletal_height, np.nan)
+
 def calculate_skeletal_height(frame_keypoints: List[KeyPoint]) -> Optional[float]:
     """
     1フレームの骨格データから「骨格上の全長」を計算する
@@ -751,58 +1477,38 @@ def calculate_skeletal_height(frame_keypoints: List[KeyPoint]) -> Optional[float
         if len(frame_keypoints) < 33:
             return None
         
-        # 必要なキーポイントを取得
-        left_ankle = frame_keypoints[LANDMARK_INDICES['left_ankle']]
-        right_ankle = frame_keypoints[LANDMARK_INDICES['right_ankle']]
-        left_knee = frame_keypoints[LANDMARK_INDICES['left_knee']]
-        right_knee = frame_keypoints[LANDMARK_INDICES['right_knee']]
-        left_hip = frame_keypoints[LANDMARK_INDICES['left_hip']]
-        right_hip = frame_keypoints[LANDMARK_INDICES['right_hip']]
-        left_shoulder = frame_keypoints[LANDMARK_INDICES['left_shoulder']]
-        right_shoulder = frame_keypoints[LANDMARK_INDICES['right_shoulder']]
-        
-        # 鼻（頭部の代表点）
-        nose = frame_keypoints[0]  # MediaPipeの鼻のインデックス
-        
-        # 可視性チェック（0.5以上で有効とする）
-        required_points = [left_ankle, right_ankle, left_knee, right_knee, 
-                          left_hip, right_hip, left_shoulder, right_shoulder, nose]
-        
-        for point in required_points:
-            if point.visibility < 0.5:
-                return None
-        
-        # 各セグメントの長さを計算
-        
-        # 1. 下腿長: 足首から膝までの距離（左右の平均）
-        left_lower_leg = math.sqrt((left_knee.x - left_ankle.x)**2 + (left_knee.y - left_ankle.y)**2)
-        right_lower_leg = math.sqrt((right_knee.x - right_ankle.x)**2 + (right_knee.y - right_ankle.y)**2)
-        avg_lower_leg_length = (left_lower_leg + right_lower_leg) / 2
-        
-        # 2. 大腿長: 膝から股関節までの距離（左右の平均）
-        left_thigh = math.sqrt((left_hip.x - left_knee.x)**2 + (left_hip.y - left_knee.y)**2)
-        right_thigh = math.sqrt((right_hip.x - right_knee.x)**2 + (right_hip.y - right_knee.y)**2)
-        avg_thigh_length = (left_thigh + right_thigh) / 2
-        
-        # 3. 体幹長: 股関節の中点から肩の中点までの距離
-        hip_center_x = (left_hip.x + right_hip.x) / 2
-        hip_center_y = (left_hip.y + right_hip.y) / 2
-        shoulder_center_x = (left_shoulder.x + right_shoulder.x) / 2
-        shoulder_center_y = (left_shoulder.y + right_shoulder.y) / 2
-        trunk_length = math.sqrt((shoulder_center_x - hip_center_x)**2 + (shoulder_center_y - hip_center_y)**2)
-        
-        # 4. 頭部長: 肩の中点から鼻までの距離
-        head_length = math.sqrt((nose.x - shoulder_center_x)**2 + (nose.y - shoulder_center_y)**2)
+        xs = np.array([[kp.x for kp in frame_keypoints]])
+        ys = np.array([[kp.y for kp in frame_keypoints]])
+        vis = np.array([[kp.visibility for kp in frame_keypoints]])
         
-        # 骨格上の全長を計算
-        total_skeletal_height = avg_lower_leg_length + avg_thigh_length + trunk_length + head_length
-        
-        return total_skeletal_height
+        return _nan_to_none(calculate_skeletal_heights_batch(xs, ys, vis)[0])
         
     except Exception as e:
-        print(f"骨格身長計算エラー: {str(e)}")
+        log.exception("骨格身長計算エラー: %s", e)
         return None
 
+def extract_cycle_signals(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    重心上下動・ピッチ・サイクル検出に必要な時系列信号をまとめて抽出する
+    
+    Args:
+        xs, ys, vis: 解析対象フレームの (F, 33) 座標・可視性配列
+    
+    Returns:
+        信号名 → (F,) 配列の辞書
+        可視性は左右の小さい方（両方が閾値以上かの判定にそのまま使える）
+    """
+    hip_y = ys[:, HIP_IDX]
+    ankle_y = ys[:, ANKLE_IDX]
+    return {
+        'hip_y': (hip_y[:, 0] + hip_y[:, 1]) / 2,
+        'hip_visibility': vis[:, HIP_IDX].min(axis=1),
+        'left_ankle_y': ankle_y[:, 0],
+        'right_ankle_y': ankle_y[:, 1],
+        'ankle_visibility': vis[:, ANKLE_IDX].min(axis=1),
+        'skeletal_height': calculate_skeletal_heights_batch(xs, ys, vis),
+    }
+
 def calculate_vertical_oscillation(time_series_keypoints: List[List[KeyPoint]]) -> Optional[float]:
     """
     重心上下動を計算する（骨格データから自動的に基準身長を算出）
@@ -810,65 +1516,78 @@ def calculate_vertical_oscillation(time_series_keypoints: List[List[KeyPoint]])
     Args:
         time_series_keypoints: 1サイクル分の連続したフレームのキーポイントデータ
     
+    Returns:
+        計算上の平均身長を基準とした重心上下動の比率（float型）または None
+    """
+    if not time_series_keypoints:
+        return None
+    
+    # 33点未満のフレームは可視性0として除外される
+    xs, ys, vis = keypoints_to_soa(time_series_keypoints)
+    return calculate_vertical_oscillation_from_signals(extract_cycle_signals(xs, ys, vis))
+
+def calculate_vertical_oscillation_from_signals(signals: Dict[str, np.ndarray]) -> Optional[float]:
+    """
+    重心上下動を計算する（extract_cycle_signals の信号を使用）
+    
+    Args:
+        signals: 1サイクル分の連続したフレームから抽出した時系列信号
+    
     Returns:
         計算上の平均身長を基準とした重心上下動の比率（float型）または None
     """
     try:
-        if not time_series_keypoints:
-            return None
-        
-        center_of_mass_y_positions = []
-        skeletal_heights = []
-        
-        # 各フレームで重心のY座標と骨格身長を計算
-        for frame_keypoints in time_series_keypoints:
-            if len(frame_keypoints) < 33:  # MediaPipeの最小ランドマーク数
-                continue
-                
-            left_hip = frame_keypoints[LANDMARK_INDICES['left_hip']]
-            right_hip = frame_keypoints[LANDMARK_INDICES['right_hip']]
-            
-            # 股関節の可視性チェック
-            if left_hip.visibility < 0.5 or right_hip.visibility < 0.5:
-                continue
-            
-            # 左右股関節の中点を重心として定義
-            center_of_mass_y = (left_hip.y + right_hip.y) / 2
-            center_of_mass_y_positions.append(center_of_mass_y)
-            
-            # このフレームの骨格身長を計算
-            skeletal_height = calculate_skeletal_height(frame_keypoints)
-            if skeletal_height is not None:
-                skeletal_heights.append(skeletal_height)
-        
-        # 有効なデータが不足している場合
-        if len(center_of_mass_y_positions) < 3 or len(skeletal_heights) < 3:
+        if len(signals['hip_y']) == 0:
             return None
         
-        # 「計算上の平均身長」を算出
-        avg_skeletal_height = np.mean(skeletal_heights)
+        # 股関節の可視性チェック
+        hip_visible = signals['hip_visibility'] >= 0.5
         
-        # 重心のY座標の最大値と最小値の差を計算（分子）
-        max_y = max(center_of_mass_y_positions)
-        min_y = min(center_of_mass_y_positions)
-        vertical_displacement = max_y - min_y
-        
-        # 重心上下動の比率を計算（分子 / 分母）
-        vertical_oscillation_ratio = vertical_displacement / avg_skeletal_height if avg_skeletal_height > 0 else None
-        
-        print(f"📏 骨格身長計算詳細:")
-        print(f"   - 有効フレーム数: {len(skeletal_heights)}")
-        print(f"   - 計算上の平均身長: {avg_skeletal_height:.6f} (正規化座標)")
-        print(f"   - 重心上下動: {vertical_displacement:.6f} (正規化座標)")
-        print(f"   - 上下動比率: {vertical_oscillation_ratio:.6f}")
-        
-        return vertical_oscillation_ratio
+        # 左右股関節の中点を重心とし、同じフレームの骨格身長と組にして渡す
+        return oscillation_from_arrays(signals['hip_y'][hip_visible], signals['skeletal_height'][hip_visible])
         
     except Exception as e:
-        print(f"重心上下動計算エラー: {str(e)}")
+        log.exception("重心上下動計算エラー: %s", e)
         return None
 
-def calculate_pitch(num_frames_in_cycle: int, video_fps: float) -> Optional[float]:
+def oscillation_from_arrays(hip_y: np.ndarray, heights: np.ndarray) -> Optional[float]:
+    """
+    計算済みの重心Y座標と骨格身長の配列から重心上下動の比率を求める
+    
+    Args:
+        hip_y: 股関節が見えているフレームの重心Y座標 (F,)
+        heights: 同じフレームの骨格身長 (F,)（計算できないフレームはNaN）
+    
+    Returns:
+        計算上の平均身長を基準とした重心上下動の比率（float型）または None
+    """
+    skeletal_heights = heights[~np.isnan(heights)]
+    
+    # 有効なデータが不足している場合
+    if len(hip_y) < 3 or len(skeletal_heights) < 3:
+        return None
+    
+    # 「計算上の平均身長」を算出（分母）
+    avg_skeletal_height = float(np.mean(skeletal_heights))
+    
+    # 重心のY座標の最大値と最小値の差を計算（分子）
+    vertical_displacement = float(np.ptp(hip_y))
+    
+    if avg_skeletal_height <= 0:
+        return None
+    
+    # 重心上下動の比率を計算（分子 / 分母）
+    vertical_oscillation_ratio = vertical_displacement / avg_skeletal_height
+    
+    log.debug("📏 骨格身長計算詳細:")
+    log.debug("   - 有効フレーム数: %s", len(skeletal_heights))
+    log.debug("   - 計算上の平均身長: %.6f (正規化座標)", avg_skeletal_height)
+    log.debug("   - 重心上下動: %.6f (正規化座標)", vertical_displacement)
+    log.debug("   - 上下動比率: %.6f", vertical_oscillation_ratio)
+    
+    return vertical_oscillation_ratio
+
+def calculate_pitch(num_frames_in_cycle: int, video_fps: float) -> Optional[float]:
     """
     ピッチ（ケイデンス）を計算する（レガシー関数）
     
@@ -896,7 +1615,7 @@ def calculate_pitch(num_frames_in_cycle: int, video_fps: float) -> Optional[floa
         return steps_per_minute
         
     except Exception as e:
-        print(f"ピッチ計算エラー: {str(e)}")
+        log.exception("ピッチ計算エラー: %s", e)
         return None
 
 def calculate_pitch_from_keypoints(time_series_keypoints: List[List[KeyPoint]], video_fps: float) -> Optional[float]:
@@ -907,101 +1626,83 @@ def calculate_pitch_from_keypoints(time_series_keypoints: List[List[KeyPoint]],
         time_series_keypoints: 全フレームの骨格データ
         video_fps: 動画のフレームレート
     
+    Returns:
+        動画全体の平均ピッチ（SPM単位、float型）または None
+    """
+    if not time_series_keypoints or video_fps <= 0:
+        return None
+    
+    xs, ys, vis = keypoints_to_soa(time_series_keypoints)
+    return calculate_pitch_from_signals(extract_cycle_signals(xs, ys, vis), video_fps)
+
+def detect_foot_strikes(ankle_y_data: np.ndarray, min_distance: int = 8) -> List[int]:
+    """
+    足の接地（極小値）を検出（find_peaksによる谷検出）
+    
+    Args:
+        ankle_y_data: 平滑化済みの足首Y座標
+        min_distance: 接地間の最小フレーム数
+    
+    Returns:
+        接地フレームのインデックスのリスト
+    """
+    ankle_y_data = np.asarray(ankle_y_data, dtype=np.float32)
+    
+    if len(ankle_y_data) < 5:
+        return []
+    
+    # 反転した信号のピーク = 元信号の極小値
+    # distance で接地間隔の下限を、prominence で微小な揺れの除外を行う
+    # prominence の係数0.1は pose_result.json で確認済み（0.02〜0.15 で同じ接地列になり、
+    # それより小さいと揺れを接地として拾い、0.2 以上では実際の接地を取りこぼす）
+    strikes, _ = signal.find_peaks(
+        -ankle_y_data,
+        distance=min_distance,
+        prominence=np.std(ankle_y_data) * 0.1
+    )
+    
+    return strikes.tolist()
+
+def calculate_pitch_from_signals(signals: Dict[str, np.ndarray], video_fps: float) -> Optional[float]:
+    """
+    足の接地検出に基づいてピッチ（ケイデンス）を計算する（extract_cycle_signals の信号を使用）
+    
+    Args:
+        signals: 全フレームから抽出した時系列信号
+        video_fps: 動画のフレームレート
+    
     Returns:
         動画全体の平均ピッチ（SPM単位、float型）または None
     """
     try:
-        if not time_series_keypoints or video_fps <= 0:
+        if len(signals['left_ankle_y']) == 0 or video_fps <= 0:
             return None
         
-        print(f"🦶 フットストライク検出開始...")
+        log.debug("🦶 フットストライク検出開始...")
         
         # ステップ1: フットストライク（接地）の検出
         
-        # a. データ抽出: 左右の足首のY座標を時系列データとして抽出
-        left_ankle_y = []
-        right_ankle_y = []
-        valid_frame_indices = []
-        
-        for frame_idx, frame_keypoints in enumerate(time_series_keypoints):
-            if len(frame_keypoints) < 33:
-                continue
-                
-            left_ankle = frame_keypoints[LANDMARK_INDICES['left_ankle']]
-            right_ankle = frame_keypoints[LANDMARK_INDICES['right_ankle']]
-            
-            # 足首の可視性チェック
-            if left_ankle.visibility > 0.5 and right_ankle.visibility > 0.5:
-                left_ankle_y.append(left_ankle.y)
-                right_ankle_y.append(right_ankle.y)
-                valid_frame_indices.append(frame_idx)
+        # a. データ抽出: 左右の足首のY座標を時系列データとして抽出（足首の可視性チェック）
+        ankle_visible = signals['ankle_visibility'] > 0.5
+        left_ankle_y = signals['left_ankle_y'][ankle_visible]
+        right_ankle_y = signals['right_ankle_y'][ankle_visible]
         
         if len(left_ankle_y) < 10:  # 最小フレーム数チェック
-            print(f"❌ 有効フレーム数が不足: {len(left_ankle_y)}")
+            log.debug("❌ 有効フレーム数が不足: %s", len(left_ankle_y))
             return None
         
-        # b. 平滑化: 移動平均フィルタを適用
-        def moving_average(data, window_size=5):
-            """移動平均フィルタ"""
-            if len(data) < window_size:
-                return data
-            smoothed = []
-            for i in range(len(data)):
-                start = max(0, i - window_size // 2)
-                end = min(len(data), i + window_size // 2 + 1)
-                smoothed.append(np.mean(data[start:end]))
-            return smoothed
-        
-        left_ankle_y_smooth = moving_average(left_ankle_y, window_size=5)
-        right_ankle_y_smooth = moving_average(right_ankle_y, window_size=5)
+        # b. 平滑化: 移動平均フィルタを適用（端は最端の値を延長して窓幅を保つ）
+        left_ankle_y_smooth = uniform_filter1d(left_ankle_y, size=5, mode='nearest')
+        right_ankle_y_smooth = uniform_filter1d(right_ankle_y, size=5, mode='nearest')
         
         # c. 極小値の検出: 足が地面に最も近づいた瞬間（接地）を検出
-        def detect_foot_strikes(ankle_y_data, min_distance=8):
-            """足の接地（極小値）を検出（改良版）"""
-            strikes = []
-            
-            if len(ankle_y_data) < 5:
-                return strikes
-            
-            # より堅牢な極小値検出（3点窓）
-            for i in range(2, len(ankle_y_data) - 2):
-                # 中心点が周囲の点より低いかチェック（3点窓）
-                center = ankle_y_data[i]
-                left = ankle_y_data[i-1]
-                right = ankle_y_data[i+1]
-                left2 = ankle_y_data[i-2]
-                right2 = ankle_y_data[i+2]
-                
-                # より厳密な極小値判定
-                is_local_minimum = (center <= left and center <= right and 
-                                   center <= left2 and center <= right2)
-                
-                # 前回の接地から十分な距離があるかチェック
-                if is_local_minimum and (not strikes or (i - strikes[-1]) >= min_distance):
-                    strikes.append(i)
-            
-            # 閾値ベースのバックアップ検出
-            if len(strikes) < 2:
-                # データの下位25%を接地候補として検出
-                threshold = np.percentile(ankle_y_data, 25)
-                
-                for i in range(1, len(ankle_y_data) - 1):
-                    if (ankle_y_data[i] <= threshold and 
-                        ankle_y_data[i] <= ankle_y_data[i-1] and 
-                        ankle_y_data[i] <= ankle_y_data[i+1]):
-                        
-                        if not strikes or (i - strikes[-1]) >= min_distance:
-                            strikes.append(i)
-            
-            return strikes
-        
         # 左右の足の接地フレームを検出
         left_foot_strikes = detect_foot_strikes(left_ankle_y_smooth)
         right_foot_strikes = detect_foot_strikes(right_ankle_y_smooth)
         
-        print(f"🦶 接地検出結果:")
-        print(f"   - 左足接地: {len(left_foot_strikes)}回 {left_foot_strikes}")
-        print(f"   - 右足接地: {len(right_foot_strikes)}回 {right_foot_strikes}")
+        log.debug("🦶 接地検出結果:")
+        log.debug("   - 左足接地: %s回 %s", len(left_foot_strikes), left_foot_strikes)
+        log.debug("   - 右足接地: %s回 %s", len(right_foot_strikes), right_foot_strikes)
         
         # ステップ2: ランニングサイクルの定義と期間の計算
         
@@ -1010,43 +1711,39 @@ def calculate_pitch_from_keypoints(time_series_keypoints: List[List[KeyPoint]],
         foot_type = "右足" if len(right_foot_strikes) >= len(left_foot_strikes) else "左足"
         
         if len(primary_foot_strikes) < 2:
-            print(f"❌ 検出された接地が不足: {len(primary_foot_strikes)}回")
+            log.debug("❌ 検出された接地が不足: %s回", len(primary_foot_strikes))
             return None
         
-        # a. サイクル期間のリスト作成: 隣り合う接地間のフレーム数
-        cycle_lengths_in_frames = []
-        for i in range(1, len(primary_foot_strikes)):
-            cycle_length = primary_foot_strikes[i] - primary_foot_strikes[i-1]
-            cycle_lengths_in_frames.append(cycle_length)
+        # a. サイクル期間の配列作成: 隣り合う接地間のフレーム数
+        cycle_lengths_in_frames = np.diff(primary_foot_strikes)
         
-        print(f"📊 サイクル分析結果（{foot_type}基準）:")
-        print(f"   - 検出サイクル数: {len(cycle_lengths_in_frames)}")
-        print(f"   - サイクル長（フレーム）: {cycle_lengths_in_frames}")
+        log.debug("📊 サイクル分析結果（%s基準）:", foot_type)
+        log.debug("   - 検出サイクル数: %s", len(cycle_lengths_in_frames))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("   - サイクル長（フレーム）: %s", cycle_lengths_in_frames.tolist())
         
         # ステップ3: ピッチ（ケイデンス）の計算
         
-        # a. サイクルごとのピッチ計算
-        cycle_pitches = []
-        for total_frames in cycle_lengths_in_frames:
-            # サイクル時間を秒単位で計算
-            cycle_time_seconds = total_frames / video_fps
-            
-            # ピッチ（SPM）を計算: 1サイクル = 2歩
-            pitch_spm = (2 / cycle_time_seconds) * 60
-            cycle_pitches.append(pitch_spm)
+        # a. サイクルごとのピッチ計算（配列のまま計算し、統計値の算出でリストから変換しない）
+        # サイクル時間を秒単位で計算
+        cycle_time_seconds = cycle_lengths_in_frames / video_fps
+        
+        # ピッチ（SPM）を計算: 1サイクル = 2歩
+        cycle_pitches = (2 / cycle_time_seconds) * 60
         
         # b. 平均ピッチの算出
-        average_pitch = np.mean(cycle_pitches)
+        average_pitch = cycle_pitches.mean()
         
-        print(f"🏃 ピッチ計算詳細:")
-        print(f"   - 各サイクルのピッチ: {[f'{p:.1f}' for p in cycle_pitches]} SPM")
-        print(f"   - 平均ピッチ: {average_pitch:.1f} SPM")
-        print(f"   - 標準偏差: {np.std(cycle_pitches):.1f} SPM")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🏃 ピッチ計算詳細:")
+            log.debug("   - 各サイクルのピッチ: %s SPM", [f'{p:.1f}' for p in cycle_pitches])
+            log.debug("   - 平均ピッチ: %.1f SPM", average_pitch)
+            log.debug("   - 標準偏差: %.1f SPM", cycle_pitches.std())
         
         return average_pitch
         
     except Exception as e:
-        print(f"高精度ピッチ計算エラー: {str(e)}")
+        log.exception("高精度ピッチ計算エラー: %s", e)
         return None
 
 def detect_running_cycles(pose_data: List[PoseFrame]) -> int:
@@ -1059,22 +1756,27 @@ def detect_running_cycles(pose_data: List[PoseFrame]) -> int:
     Returns:
         検出されたランニングサイクル数
     """
-    try:
-        # 有効なフレームのみを抽出
-        valid_frames = [frame for frame in pose_data if frame.landmarks_detected and len(frame.keypoints) >= 33]
+    xs, ys, vis, valid_mask = pose_to_soa(pose_data)
+    return detect_running_cycles_from_signals(
+        extract_cycle_signals(xs[valid_mask], ys[valid_mask], vis[valid_mask])
+    )
+
+def detect_running_cycles_from_signals(signals: Dict[str, np.ndarray]) -> int:
+    """
+    重心の上下動からランニングサイクル数を検出する（extract_cycle_signals の信号を使用）
+    
+    Args:
+        signals: 有効フレームから抽出した時系列信号
         
-        if len(valid_frames) < 10:
+    Returns:
+        検出されたランニングサイクル数
+    """
+    try:
+        if len(signals['hip_y']) < 10:
             return 1  # 最小限のデータの場合は1サイクルとする
         
-        # 重心のY座標を抽出
-        center_of_mass_y = []
-        for frame in valid_frames:
-            left_hip = frame.keypoints[LANDMARK_INDICES['left_hip']]
-            right_hip = frame.keypoints[LANDMARK_INDICES['right_hip']]
-            
-            if left_hip.visibility > 0.5 and right_hip.visibility > 0.5:
-                y_coord = (left_hip.y + right_hip.y) / 2
-                center_of_mass_y.append(y_coord)
+        # 股関節が見えているフレームの重心Y座標を抽出
+        center_of_mass_y = signals['hip_y'][signals['hip_visibility'] > 0.5]
         
         if len(center_of_mass_y) < 5:
             return 1
@@ -1088,32 +1790,24 @@ def detect_running_cycles(pose_data: List[PoseFrame]) -> int:
         threshold = y_mean + y_std * 0.3
         
         # 閾値を超える点を検出
-        above_threshold = [y > threshold for y in center_of_mass_y]
-        
-        # 連続する True の塊を数える（ピーク検出）
-        peaks = 0
-        in_peak = False
+        above_threshold = center_of_mass_y > threshold
         
-        for is_above in above_threshold:
-            if is_above and not in_peak:
-                peaks += 1
-                in_peak = True
-            elif not is_above:
-                in_peak = False
+        # 連続する True の塊を数える（ピーク検出 = False→True の立ち上がり数）
+        peaks = int(above_threshold[0]) + int(np.count_nonzero(above_threshold[1:] & ~above_threshold[:-1]))
         
         # ピーク数からサイクル数を推定
         # ランニングでは1サイクルに約1-2回のピークが発生する
         estimated_cycles = max(1, peaks // 2)  # 保守的に見積もり
         
-        print(f"🔍 サイクル検出詳細:")
-        print(f"   - 有効フレーム数: {len(center_of_mass_y)}")
-        print(f"   - 検出されたピーク数: {peaks}")
-        print(f"   - 推定サイクル数: {estimated_cycles}")
+        log.debug("🔍 サイクル検出詳細:")
+        log.debug("   - 有効フレーム数: %s", len(center_of_mass_y))
+        log.debug("   - 検出されたピーク数: %s", peaks)
+        log.debug("   - 推定サイクル数: %s", estimated_cycles)
         
         return estimated_cycles
         
     except Exception as e:
-        print(f"サイクル検出エラー: {str(e)}")
+        log.exception("サイクル検出エラー: %s", e)
         return 1
 
 def analyze_running_cycle(pose_data: List[PoseFrame], video_fps: float) -> Dict[str, Optional[float]]:
@@ -1124,268 +1818,250 @@ def analyze_running_cycle(pose_data: List[PoseFrame], video_fps: float) -> Dict[
         pose_data: 骨格推定データ
         video_fps: 動画フレームレート
     
+    Returns:
+        分析結果（重心上下動、ピッチ）
+    """
+    xs, ys, vis, valid_mask = pose_to_soa(pose_data)
+    # 有効なフレームのみを抽出
+    return analyze_running_cycle_soa(xs[valid_mask], ys[valid_mask], vis[valid_mask], video_fps)
+
+def analyze_running_cycle_soa(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray,
+                              video_fps: float) -> Dict[str, Optional[float]]:
+    """
+    ランニングサイクルの分析（SoA配列版）
+    
+    Args:
+        xs, ys, vis: 有効フレームのみの (F, 33) 座標・可視性配列
+        video_fps: 動画フレームレート
+    
     Returns:
         分析結果（重心上下動、ピッチ）
     """
     try:
-        # 有効なフレームのみを抽出
-        valid_frames = [frame for frame in pose_data if frame.landmarks_detected and len(frame.keypoints) >= 33]
+        num_valid_frames = len(xs)
         
-        if len(valid_frames) < 10:  # 最小フレーム数チェック
+        if num_valid_frames < 10:  # 最小フレーム数チェック
             return {"vertical_oscillation": None, "pitch": None}
         
-        # 全フレームのキーポイントデータを抽出
-        time_series_keypoints = [frame.keypoints for frame in valid_frames]
-        
-        # ランニングサイクル数を検出
-        detected_cycles = detect_running_cycles(pose_data)
-        
-        # 1サイクルあたりの平均フレーム数を計算
-        avg_frames_per_cycle = len(valid_frames) / detected_cycles
-        
-        print(f"📊 サイクル分析結果:")
-        print(f"   - 全フレーム数: {len(valid_frames)}")
-        print(f"   - 検出サイクル数: {detected_cycles}")
-        print(f"   - 1サイクル平均フレーム数: {avg_frames_per_cycle:.1f}")
+        # 3つの解析で使う信号を一度に抽出する
+        signals = extract_cycle_signals(xs, ys, vis)
         
         # 重心上下動を計算（骨格データから自動的に基準身長を算出）
-        vertical_oscillation = calculate_vertical_oscillation(time_series_keypoints)
-        
-        # 新機能: 高精度ピッチ計算（足の接地検出ベース）
-        print("🏃 高精度ピッチ計算を実行中...")
-        accurate_pitch = calculate_pitch_from_keypoints(time_series_keypoints, video_fps)
-        
-        # レガシーピッチ計算（比較用）
-        legacy_pitch = calculate_pitch(avg_frames_per_cycle, video_fps)
+        vertical_oscillation = calculate_vertical_oscillation_from_signals(signals)
+        
+        # 高精度ピッチ計算（足の接地検出ベース）
+        log.debug("🏃 高精度ピッチ計算を実行中...")
+        accurate_pitch = calculate_pitch_from_signals(signals, video_fps)
+        
+        # 高精度計算が失敗した場合のみ、重心サイクル検出によるレガシー計算を行う
+        detected_cycles = None
+        avg_frames_per_cycle = None
+        legacy_pitch = None
+        if accurate_pitch is None:
+            # ランニングサイクル数を検出
+            detected_cycles = detect_running_cycles_from_signals(signals)
+            
+            # 1サイクルあたりの平均フレーム数を計算
+            avg_frames_per_cycle = num_valid_frames / detected_cycles
+            
+            log.debug("📊 サイクル分析結果:")
+            log.debug("   - 全フレーム数: %s", num_valid_frames)
+            log.debug("   - 検出サイクル数: %s", detected_cycles)
+            log.debug("   - 1サイクル平均フレーム数: %.1f", avg_frames_per_cycle)
+            
+            legacy_pitch = calculate_pitch(avg_frames_per_cycle, video_fps)
         
-        # 高精度計算が成功した場合はそれを使用、失敗した場合はレガシー計算を使用
         pitch = accurate_pitch if accurate_pitch is not None else legacy_pitch
         
-        print(f"📊 ピッチ計算比較:")
-        print(f"   - 高精度ピッチ: {accurate_pitch:.1f} SPM" if accurate_pitch else "   - 高精度ピッチ: 計算失敗")
-        print(f"   - レガシーピッチ: {legacy_pitch:.1f} SPM" if legacy_pitch else "   - レガシーピッチ: 計算失敗")
-        print(f"   - 採用ピッチ: {pitch:.1f} SPM" if pitch else "   - 採用ピッチ: 計算失敗")
+        log.debug("📊 ピッチ計算結果:")
+        log.debug("   - 高精度ピッチ: %s SPM", f"{accurate_pitch:.1f}" if accurate_pitch else "計算失敗")
+        log.debug("   - レガシーピッチ: %s SPM", f"{legacy_pitch:.1f}" if legacy_pitch else "未使用")
+        log.debug("   - 採用ピッチ: %s SPM", f"{pitch:.1f}" if pitch else "計算失敗")
         
         return {
             "vertical_oscillation": vertical_oscillation,
             "pitch": pitch,
-            "cycle_frames": int(avg_frames_per_cycle),
-            "valid_frames": len(valid_frames),
+            "cycle_frames": int(avg_frames_per_cycle) if avg_frames_per_cycle is not None else None,
+            "valid_frames": num_valid_frames,
             "detected_cycles": detected_cycles,
-            "total_video_duration": len(valid_frames) / video_fps,
+            "total_video_duration": num_valid_frames / video_fps,
             "accurate_pitch": accurate_pitch,
             "legacy_pitch": legacy_pitch,
             "pitch_calculation_method": "足接地検出ベース" if accurate_pitch is not None else "重心サイクル推定ベース"
         }
         
     except Exception as e:
-        print(f"ランニングサイクル分析エラー: {str(e)}")
+        log.exception("ランニングサイクル分析エラー: %s", e)
         return {"vertical_oscillation": None, "pitch": None}
 
+# /extract が返す絶対角度のキー（_absolute_segment_angles の並びに体幹を先頭に加えたもの）
+EXTRACT_ANGLE_KEYS = [
+    'trunk_angle', 'left_thigh_angle', 'right_thigh_angle',
+    'left_lower_leg_angle', 'right_lower_leg_angle',
+    'left_upper_arm_angle', 'right_upper_arm_angle',
+    'left_forearm_angle', 'right_forearm_angle',
+    'left_foot_angle', 'right_foot_angle'
+]
+# 左上腕・左前腕は可視性の閾値を下げる（肘0.1、肩・手首0.3）
+_EXTRACT_TAIL_VIS = _ABS_TAIL_VIS.copy()
+_EXTRACT_HEAD_VIS = _ABS_HEAD_VIS.copy()
+_EXTRACT_TAIL_VIS[[4, 6]] = 0.1
+_EXTRACT_HEAD_VIS[[4, 6]] = 0.3
+
+def extract_all_angles_batched(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    全フレームから新仕様の絶対角度をまとめて抽出する
+    
+    Args:
+        xs, ys, vis: (F, 33) の座標・可視性配列
+    
+    Returns:
+        角度名 → (F,) 配列の辞書（計算不可のフレームはNaN）
+    """
+    segment_angles = _absolute_segment_angles(xs, ys, vis, _EXTRACT_TAIL_VIS, _EXTRACT_HEAD_VIS)
+    
+    angles = {'trunk_angle': _trunk_angles_batch(xs, ys, vis)}
+    for j, angle_key in enumerate(EXTRACT_ANGLE_KEYS[1:]):
+        angles[angle_key] = segment_angles[:, j]
+    return angles
+
 def extract_absolute_angles_from_frame(keypoints: List[KeyPoint]) -> Dict[str, Optional[float]]:
     """
     1フレームから新仕様の絶対角度を抽出する
     """
-    angles = {}
+    if len(keypoints) < NUM_LANDMARKS:
+        return {angle_key: None for angle_key in EXTRACT_ANGLE_KEYS}
     
-    # 各角度を個別に計算（エラーがあっても他に影響しない）
-    try:
-        angles['trunk_angle'] = calculate_trunk_angle(keypoints)
-    except (IndexError, KeyError):
-        angles['trunk_angle'] = None
-        
-    try:
-        left_hip = keypoints[LANDMARK_INDICES['left_hip']]
-        left_knee = keypoints[LANDMARK_INDICES['left_knee']]
-        angles['left_thigh_angle'] = calculate_thigh_angle(left_hip, left_knee, 'left')
-    except (IndexError, KeyError):
-        angles['left_thigh_angle'] = None
-        
-    try:
-        right_hip = keypoints[LANDMARK_INDICES['right_hip']]
-        right_knee = keypoints[LANDMARK_INDICES['right_knee']]
-        angles['right_thigh_angle'] = calculate_thigh_angle(right_hip, right_knee, 'right')
-    except (IndexError, KeyError):
-        angles['right_thigh_angle'] = None
-        
-    try:
-        left_knee = keypoints[LANDMARK_INDICES['left_knee']]
-        left_ankle = keypoints[LANDMARK_INDICES['left_ankle']]
-        angles['left_lower_leg_angle'] = calculate_lower_leg_angle(left_knee, left_ankle, 'left')
-    except (IndexError, KeyError):
-        angles['left_lower_leg_angle'] = None
-        
-    try:
-        right_knee = keypoints[LANDMARK_INDICES['right_knee']]
-        right_ankle = keypoints[LANDMARK_INDICES['right_ankle']]
-        angles['right_lower_leg_angle'] = calculate_lower_leg_angle(right_knee, right_ankle, 'right')
-    except (IndexError, KeyError):
-        angles['right_lower_leg_angle'] = None
+    xs = np.array([[kp.x for kp in keypoints]])
+    ys = np.array([[kp.y for kp in keypoints]])
+    vis = np.array([[kp.visibility for kp in keypoints]])
     
-    try:
-        left_shoulder = keypoints[LANDMARK_INDICES['left_shoulder']]
-        left_elbow = keypoints[LANDMARK_INDICES['left_elbow']]
-        
-        # 可視性チェック（左肘の閾値を下げる）
-        if left_shoulder.visibility < 0.3 or left_elbow.visibility < 0.1:
-            print(f"   ❌ left上腕計算失敗: 肩可視性={left_shoulder.visibility:.2f}, 肘可視性={left_elbow.visibility:.2f}")
-            angles['left_upper_arm_angle'] = None
-        else:
-            angles['left_upper_arm_angle'] = calculate_upper_arm_angle(left_shoulder, left_elbow, 'left')
-            if angles['left_upper_arm_angle'] is not None:
-                print(f"   💪 left上腕角度: {angles['left_upper_arm_angle']:.1f}° (計算成功)")
-            else:
-                print(f"   ❌ left上腕角度: 計算関数がNoneを返却")
-    except (IndexError, KeyError) as e:
-        angles['left_upper_arm_angle'] = None
-        print(f"   ❌ left上腕角度キーポイントエラー: {e}")
+    batched = extract_all_angles_batched(xs, ys, vis)
+    return {angle_key: _nan_to_none(values[0]) for angle_key, values in batched.items()}
+
+def calculate_angle_statistics(angle_values: np.ndarray) -> Dict[str, float]:
+    """
+    角度の統計値（平均、最小、最大）を計算する
+    NaN（計算不可のフレーム）は除外する
+    """
+    values = np.asarray(angle_values, dtype=np.float64)
+    finite_values = values[np.isfinite(values)]
+    if finite_values.size == 0:
+        return {"avg": 0.0, "min": 0.0, "max": 0.0}
     
-    try:
-        right_shoulder = keypoints[LANDMARK_INDICES['right_shoulder']]
-        right_elbow = keypoints[LANDMARK_INDICES['right_elbow']]
-        angles['right_upper_arm_angle'] = calculate_upper_arm_angle(right_shoulder, right_elbow, 'right')
-    except (IndexError, KeyError):
-        angles['right_upper_arm_angle'] = None
+    return {
+        "avg": round(float(finite_values.mean()), 1),
+        "min": round(float(finite_values.min()), 1),
+        "max": round(float(finite_values.max()), 1)
+    }
+
+def run_all_features(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray, video_fps: float) -> Dict[str, Any]:
+    """
+    /extract の全特徴量（角度・角度統計・重心上下動・ピッチ）をまとめて計算する
     
-    try:
-        left_elbow = keypoints[LANDMARK_INDICES['left_elbow']]
-        left_wrist = keypoints[LANDMARK_INDICES['left_wrist']]
-        
-        # 可視性チェック（左肘・手首の閾値を下げる）
-        if left_elbow.visibility < 0.1 or left_wrist.visibility < 0.3:
-            print(f"   ❌ left前腕計算失敗: 肘可視性={left_elbow.visibility:.2f}, 手首可視性={left_wrist.visibility:.2f}")
-            angles['left_forearm_angle'] = None
+    Args:
+        xs, ys, vis: 有効フレームのみの (F, 33) 座標・可視性配列
+        video_fps: 動画フレームレート
+    
+    Returns:
+        angles（角度名 → (F,) 配列）、angle_statistics、running_cycle_analysis を含む辞書
+    """
+    # 全角度をまとめて計算
+    angles = extract_all_angles_batched(xs, ys, vis)
+    
+    # 統計情報を計算
+    angle_stats = {}
+    for angle_key in EXTRACT_ANGLE_KEYS:
+        angle_stats[angle_key] = calculate_angle_statistics(angles[angle_key])
+        valid_count = int(np.count_nonzero(~np.isnan(angles[angle_key])))
+        
+        # デバッグ出力: 体幹角度の統計情報
+        if angle_key == 'trunk_angle':
+            log.debug("📊 体幹角度統計: %s個の値から計算", valid_count)
+            log.debug("   平均: %.1f°", angle_stats[angle_key]['avg'])
+            log.debug("   範囲: %.1f° ～ %.1f°", angle_stats[angle_key]['min'], angle_stats[angle_key]['max'])
+        
+        # デバッグ出力: 各角度の計算成功フレーム数（フレーム単位の出力をここに集約）
+        if valid_count:
+            log.debug("🔍 %s統計: %d/%d個の値から計算, 平均=%.1f°", angle_key, valid_count, len(xs), angle_stats[angle_key]['avg'])
         else:
-            angles['left_forearm_angle'] = calculate_forearm_angle(left_elbow, left_wrist, 'left')
-            if angles['left_forearm_angle'] is not None:
-                print(f"   🤚 left前腕角度: {angles['left_forearm_angle']:.1f}° (計算成功)")
-            else:
-                print(f"   ❌ left前腕角度: 計算関数がNoneを返却")
-    except (IndexError, KeyError) as e:
-        angles['left_forearm_angle'] = None
-        print(f"   ❌ left前腕角度キーポイントエラー: {e}")
+            log.debug("⚠️ %s: 有効値なし", angle_key)
     
-    try:
-        right_elbow = keypoints[LANDMARK_INDICES['right_elbow']]
-        right_wrist = keypoints[LANDMARK_INDICES['right_wrist']]
-        angles['right_forearm_angle'] = calculate_forearm_angle(right_elbow, right_wrist, 'right')
-    except (IndexError, KeyError):
-        angles['right_forearm_angle'] = None
+    # ランニングサイクル分析（重心上下動とピッチ）
+    log.debug("🔄 ランニングサイクル分析を実行中...")
+    running_cycle_analysis = analyze_running_cycle_soa(xs, ys, vis, video_fps)
     
-    try:
-        left_ankle = keypoints[LANDMARK_INDICES['left_ankle']]
-        left_toe = keypoints[LANDMARK_INDICES['left_foot_index']]
-        angles['left_foot_angle'] = calculate_foot_angle(left_ankle, left_toe, 'left')
-    except (IndexError, KeyError):
-        angles['left_foot_angle'] = None
+    log.debug("📊 重心上下動: %s", running_cycle_analysis.get('vertical_oscillation', 'N/A'))
+    log.debug("🏃 ピッチ: %s SPM", running_cycle_analysis.get('pitch', 'N/A'))
     
-    try:
-        right_ankle = keypoints[LANDMARK_INDICES['right_ankle']]
-        right_toe = keypoints[LANDMARK_INDICES['right_foot_index']]
-        angles['right_foot_angle'] = calculate_foot_angle(right_ankle, right_toe, 'right')
-    except (IndexError, KeyError):
-        angles['right_foot_angle'] = None
-    
-    # デバッグ：計算された角度を確認
-    calculated_angles = [k for k, v in angles.items() if v is not None and 'angle' in k]
-    print(f"🔍 計算成功角度: {len(calculated_angles)}/11個 - {calculated_angles}")
-    
-    # 新しい角度の個別デバッグ
-    new_angles = {
-        'left_upper_arm_angle': angles.get('left_upper_arm_angle'),
-        'right_upper_arm_angle': angles.get('right_upper_arm_angle'),
-        'left_forearm_angle': angles.get('left_forearm_angle'),
-        'right_forearm_angle': angles.get('right_forearm_angle'),
-        'left_foot_angle': angles.get('left_foot_angle'),
-        'right_foot_angle': angles.get('right_foot_angle')
+    return {
+        "angles": angles,
+        "angle_statistics": angle_stats,
+        "running_cycle_analysis": running_cycle_analysis
     }
-    calculated_new = {k: v for k, v in new_angles.items() if v is not None}
-    print(f"🔍 新しい角度詳細: {calculated_new}")
-    
-    # 全体のエラーハンドリング（削除）- 個別エラーハンドリングに変更済み
-    
-    return angles
 
-def calculate_angle_statistics(angle_values: List[float]) -> Dict[str, float]:
+def build_angle_rows_from_batched(angles: Dict[str, np.ndarray], frame_meta: Dict[str, np.ndarray],
+                                  valid_mask: np.ndarray) -> List[Dict[str, Any]]:
     """
-    角度の統計値（平均、最小、最大）を計算する
-    """
-    if not angle_values:
-        return {"avg": 0.0, "min": 0.0, "max": 0.0}
+    角度名 → (F,) 配列の辞書を、レスポンス用のフレーム単位の辞書リストに転置する
     
-    return {
-        "avg": round(np.mean(angle_values), 1),
-        "min": round(np.min(angle_values), 1),
-        "max": round(np.max(angle_values), 1)
-    }
+    Args:
+        angles: run_all_features が返す有効フレームの角度配列
+        frame_meta: ingest_pose_data が返す全フレームのフレーム情報
+        valid_mask: 有効フレームのマスク
+    
+    Returns:
+        フレームごとの角度データ（NaNはNone）
+    """
+    stacked = np.column_stack([angles[angle_key] for angle_key in EXTRACT_ANGLE_KEYS])
+    angle_rows = np.where(np.isnan(stacked), None, stacked).tolist()
+    
+    # 行数は有効フレーム数で確定しているので、リストは先に確保してインデックスで埋める
+    rows = [None] * len(angle_rows)
+    for i, (frame_number, timestamp, confidence_score, row) in enumerate(zip(
+            frame_meta['frame_number'][valid_mask].tolist(),
+            frame_meta['timestamp'][valid_mask].tolist(),
+            frame_meta['confidence_score'][valid_mask].tolist(),
+            angle_rows)):
+        frame_angles = {
+            'frame_number': frame_number,
+            'timestamp': timestamp,
+            'confidence_score': confidence_score
+        }
+        frame_angles.update(zip(EXTRACT_ANGLE_KEYS, row))
+        rows[i] = frame_angles
+    return rows
 
-@app.post("/extract", response_model=FeatureExtractionResponse)
-async def extract_features(request: PoseAnalysisRequest):
+@app.post("/extract", response_model=FeatureExtractionResponse, response_class=FAST_JSON_RESPONSE)
+def extract_features(request: PoseArrayAnalysisRequest):
     """
     骨格データから絶対角度（体幹・大腿・下腿）を抽出する
     """
     try:
-        print("🔄 特徴量抽出サービス開始")
-        print(f"📊 処理フレーム数: {len(request.pose_data)}")
+        log.info("🔄 特徴量抽出サービス開始")
+        log.debug("📊 処理フレーム数: %s", len(request.pose_data))
         
         # 進行方向を左→右に固定
-        print("🔒 進行方向を左→右に固定設定")
-        print("📐 角度符号規則:")
-        print("   ・体幹角度: 左傾き=後傾で正値、右傾き=前傾で正値")
-        print("   ・大腿角度: 膝が後方で正値、前方で負値")
-        print("   ・下腿角度: 足首が後方で正値、前方で負値")
-        
-        # 各フレームから角度を抽出
-        all_angles = []
-        valid_frames = 0
-        
-        for frame in request.pose_data:
-            if frame.landmarks_detected and len(frame.keypoints) >= 33:
-                angles = extract_absolute_angles_from_frame(frame.keypoints)
-                
-                # フレーム情報を追加
-                frame_angles = {
-                    'frame_number': frame.frame_number,
-                    'timestamp': frame.timestamp,
-                    'confidence_score': frame.confidence_score,
-                    **angles
-                }
-                all_angles.append(frame_angles)
-                valid_frames += 1
-        
-        print(f"✅ 有効フレーム数: {valid_frames}/{len(request.pose_data)}")
-        
-        # 統計情報を計算
-        angle_stats = {}
-        angle_keys = ['trunk_angle', 'left_thigh_angle', 'right_thigh_angle', 
-                     'left_lower_leg_angle', 'right_lower_leg_angle',
-                     'left_upper_arm_angle', 'right_upper_arm_angle',
-                     'left_forearm_angle', 'right_forearm_angle',
-                     'left_foot_angle', 'right_foot_angle']
-        
-        for angle_key in angle_keys:
-            valid_values = [frame[angle_key] for frame in all_angles 
-                           if frame[angle_key] is not None]
-            angle_stats[angle_key] = calculate_angle_statistics(valid_values)
-            
-            # デバッグ出力: 体幹角度の統計情報
-            if angle_key == 'trunk_angle':
-                print(f"📊 体幹角度統計: {len(valid_values)}個の値から計算")
-                print(f"   平均: {angle_stats[angle_key]['avg']:.1f}°")
-                print(f"   範囲: {angle_stats[angle_key]['min']:.1f}° ～ {angle_stats[angle_key]['max']:.1f}°")
-            
-            # デバッグ出力: 全ての新しい角度の統計情報
-            if angle_key in ['left_upper_arm_angle', 'right_upper_arm_angle', 'left_forearm_angle', 'right_forearm_angle', 'left_foot_angle', 'right_foot_angle']:
-                print(f"🔍 {angle_key}統計: {len(valid_values)}個の値から計算, 平均={angle_stats[angle_key]['avg']:.1f}°" if valid_values else f"⚠️ {angle_key}: 有効値なし")
-        
-        # 新機能: ランニングサイクル分析（重心上下動とピッチ）
-        print("🔄 ランニングサイクル分析を実行中...")
+        log.debug("🔒 進行方向を左→右に固定設定")
+        log.debug("📐 角度符号規則:")
+        log.debug("   ・体幹角度: 左傾き=後傾で正値、右傾き=前傾で正値")
+        log.debug("   ・大腿角度: 膝が後方で正値、前方で負値")
+        log.debug("   ・下腿角度: 足首が後方で正値、前方で負値")
+        
+        # リクエストの骨格データは一度だけ配列化し、有効フレームの全特徴量をまとめて計算する
+        xs, ys, vis, valid_mask, frame_meta = ingest_pose_data(request.pose_data)
+        # マスクの走査は一度だけにして、スライスと有効フレーム数の両方にインデックスを使う
+        valid_indices = np.flatnonzero(valid_mask)
+        valid_frames = len(valid_indices)
         video_fps = request.video_info.get("fps", 30)
+        result = run_all_features(xs[valid_indices], ys[valid_indices], vis[valid_indices], video_fps)
+        angle_stats = result["angle_statistics"]
+        running_cycle_analysis = result["running_cycle_analysis"]
         
-        running_cycle_analysis = analyze_running_cycle(request.pose_data, video_fps)
+        # フレーム単位の角度データはレスポンス構築時に一度だけ転置して作る
+        all_angles = build_angle_rows_from_batched(result["angles"], frame_meta, valid_mask)
         
-        print(f"📊 重心上下動: {running_cycle_analysis.get('vertical_oscillation', 'N/A')}")
-        print(f"🏃 ピッチ: {running_cycle_analysis.get('pitch', 'N/A')} SPM")
+        log.info("✅ 有効フレーム数: %d/%d", valid_frames, len(request.pose_data))
         
         # レスポンスを構築
         features = {
@@ -1401,12 +2077,13 @@ async def extract_features(request: PoseAnalysisRequest):
         }
         
         # デバッグ: レスポンス構造を確認
-        print(f"🔍 APIレスポンス構造デバッグ:")
-        print(f"   features.angle_statistics keys: {list(angle_stats.keys())}")
-        for key, value in angle_stats.items():
-            if 'upper_arm' in key or 'forearm' in key or 'foot' in key:
-                print(f"   {key}: {value}")
-        print(f"   features keys: {list(features.keys())}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🔍 APIレスポンス構造デバッグ:")
+            log.debug("   features.angle_statistics keys: %s", list(angle_stats.keys()))
+            for key, value in angle_stats.items():
+                if 'upper_arm' in key or 'forearm' in key or 'foot' in key:
+                    log.debug("   %s: %s", key, value)
+            log.debug("   features keys: %s", list(features.keys()))
         
         analysis_details = {
             "total_frames_analyzed": len(request.pose_data),
@@ -1416,7 +2093,7 @@ async def extract_features(request: PoseAnalysisRequest):
             "fps": request.video_info.get("fps", 30)
         }
         
-        print("✅ 特徴量抽出完了")
+        log.info("✅ 特徴量抽出完了")
         
         return FeatureExtractionResponse(
             status="success",
@@ -1426,7 +2103,7 @@ async def extract_features(request: PoseAnalysisRequest):
         )
         
     except Exception as e:
-        print(f"❌ 特徴量抽出エラー: {str(e)}")
+        log.exception("❌ 特徴量抽出エラー: %s", e)
         raise HTTPException(status_code=500, detail=f"特徴量抽出に失敗しました: {str(e)}")
 
 @app.get("/")
@@ -1459,11 +2136,11 @@ async def analyze_comprehensive_running_stats(request: PoseAnalysisRequest):
     try:
         print("🏃 統括解析リクエスト受信")
         
-        # キーポイントデータを抽出
-        all_keypoints = []
-        for frame in request.pose_data:
-            if frame.landmarks_detected and len(frame.keypoints) >= 33:
-                all_keypoints.append(frame.keypoints)
+        # キーポイントデータを一度だけSoA配列に変換し、有効フレームのマスクで選択
+        xs, ys, vis, valid_mask, _ = ingest_pose_data(request.pose_data)
+        valid_indices = np.flatnonzero(valid_mask)
+        all_keypoints = [request.pose_data[i].keypoints for i in valid_indices]
+        soa = (xs[valid_indices], ys[valid_indices], vis[valid_indices])
         
         if len(all_keypoints) < 20:
             raise HTTPException(status_code=400, detail="解析に必要な最小フレーム数（20フレーム）に達していません")
@@ -1472,7 +2149,7 @@ async def analyze_comprehensive_running_stats(request: PoseAnalysisRequest):
         video_fps = request.video_info.get("fps", 30.0)
         
         # 統括解析を実行
-        stats_results = analyze_user_run_and_get_stats(all_keypoints, video_fps)
+        stats_results = analyze_user_run_and_get_stats(all_keypoints, video_fps, soa)
         
         if stats_results is None:
             raise HTTPException(status_code=422, detail="サイクル検出に失敗しました。より長い動画での解析をお試しください")
@@ -1483,7 +2160,7 @@ async def analyze_comprehensive_running_stats(request: PoseAnalysisRequest):
             "analysis_results": stats_results,
             "analysis_details": {
                 "total_frames": len(request.pose_data),
-                "valid_frames": len(all_keypoints),
+                "valid_frames": len(valid_indices),
                 "video_fps": video_fps,
                 "analysis_type": "single_cycle_representative"
             }
@@ -1492,7 +2169,7 @@ async def analyze_comprehensive_running_stats(request: PoseAnalysisRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 統括解析エラー: {str(e)}")
+        log.exception("❌ 統括解析エラー: %s", e)
         raise HTTPException(status_code=500, detail=f"統括解析に失敗しました: {str(e)}")
 
 @app.get("/standard_model")
@@ -1513,38 +2190,105 @@ async def get_standard_model():
             }
         }
     except Exception as e:
-        print(f"❌ 標準モデル取得エラー: {str(e)}")
+        log.exception("❌ 標準モデル取得エラー: %s", e)
         raise HTTPException(status_code=500, detail=f"標準モデルデータの取得に失敗しました: {str(e)}")
 
-@app.post("/compare_with_standard")
-async def compare_user_stats_with_standard(user_stats: Dict[str, Dict[str, float]]):
+# エラー時のレスポンス詳細（原因はログに記録し、クライアントには固定文言を返す）
+_DETAIL_COMPARE_FAIL = "比較処理に失敗しました"
+_DETAIL_TEST_FAIL = "テスト実行に失敗しました"
+_DETAIL_JUDGMENT_TEST_FAIL = "統計判定テストに失敗しました"
+
+# レスポンスのメッセージ文言（各レスポンスボディはこれらを含めて一度だけシリアライズされる）
+_MSG_COMPARE_DONE = "ユーザー統計値と標準モデルの比較が完了しました"
+_MSG_COMPARE_CONSOLE = "詳細な比較結果はサーバーコンソールに出力されました"
+_MSG_TEST_COMPARISON_DONE = "比較機能テストが完了しました"
+_MSG_TEST_COMPARISON_CONSOLE = "詳細な比較結果表示はサーバーコンソールをご確認ください"
+_MSG_JUDGMENT_TEST_DONE = "統計的判定機能のテストが完了しました"
+_MSG_JUDGMENT_TEST_CONSOLE = "詳細なテスト結果はサーバーコンソールをご確認ください"
+
+# 比較結果レスポンスの固定部分（リクエストごとに作り直さない）
+_COMPARE_RESPONSE_TEMPLATE = MappingProxyType({
+    "status": "success",
+    "message": _MSG_COMPARE_DONE,
+    "console_output": _MSG_COMPARE_CONSOLE
+})
+# 固定部分はシリアライズ済みの接頭辞にしておき、リクエストごとには comparison_data だけをシリアライズする
+_COMPARE_RESPONSE_PREFIX = serialize_json(dict(_COMPARE_RESPONSE_TEMPLATE))[:-1] + b',"comparison_data":'
+
+def encode_compare_response(comparison_result: Dict[str, Any]) -> bytes:
+    """/compare_with_standard のレスポンスボディを組み立てる"""
+    return _COMPARE_RESPONSE_PREFIX + serialize_json(comparison_result) + b'}'
+
+@app.post("/compare_with_standard", response_model=None, response_class=FAST_JSON_RESPONSE)
+def compare_user_stats_with_standard(user_stats: Dict[str, Dict[str, float]], background_tasks: BackgroundTasks):
     """
     ユーザーの統計値を標準動作モデルと比較するエンドポイント
+    コンソールへの比較結果表示はレスポンス送信後にバックグラウンドで行う
+    """
+    log.info("🔍 ユーザー統計値と標準モデルの比較を開始...")
+    
+    # 比較処理を実行（内部で発生した例外は status='error' として返される）
+    standard_model = get_standard_model_data()
+    comparison_result = compute_comparison(user_stats, standard_model)
+    
+    if comparison_result['status'] == 'error':
+        log.error("❌ 比較エラー: %s", comparison_result['message'])
+        raise HTTPException(status_code=500, detail=_DETAIL_COMPARE_FAIL)
+    
+    background_tasks.add_task(display_comparison_results, user_stats, standard_model)
+    
+    return Response(encode_compare_response(comparison_result), media_type="application/json")
+
+@functools.lru_cache(maxsize=1)
+def _standard_model_keypoints_data() -> Dict[str, Any]:
+    """
+    標準モデルの全フレームのキーポイントデータ（入力が静的なため一度だけ生成して保持する）
     """
+    # 提供された座標データから生成
     try:
-        print("🔍 ユーザー統計値と標準モデルの比較を開始...")
-        
-        # 比較処理を実行
-        comparison_result = compare_with_standard_model(user_stats)
-        
-        if comparison_result['status'] == 'error':
-            raise HTTPException(status_code=500, detail=comparison_result['message'])
+        from standard_model_from_coordinates import get_standard_model_keypoints_from_coordinates
+        return get_standard_model_keypoints_from_coordinates()
+    except ImportError:
+        # フォールバック: 角度データから生成
+        standard_data = get_standard_model_data()
+        frame_keys = [k for k in standard_data.keys() if k.startswith('Frame_')]
+        frame_keys.sort(key=lambda x: int(x.split('_')[1]))
+        
+        # 全フレームの角度を (フレーム数, 5) にまとめ、キーポイントを一度に生成する
+        angle_rows = [frame_angles_to_row(standard_data[frame_key]) for frame_key in frame_keys]
+        keypoints_batch = generate_keypoints_from_angles_batch(np.array(angle_rows, dtype=np.float64))
+        
+        all_keypoints = {}
+        for frame_key, frame_keypoints in zip(frame_keys, keypoints_batch.tolist()):
+            frame_num = int(frame_key.split('_')[1])
+            all_keypoints[frame_num] = {
+                "keypoints": [
+                    {"x": x, "y": y, "z": z, "visibility": visibility}
+                    for x, y, z, visibility in frame_keypoints
+                ],
+                "angles": standard_data[frame_key]
+            }
         
+        sorted_frames = {str(k): all_keypoints[k] for k in sorted(all_keypoints.keys())}
         return {
             "status": "success",
-            "message": "ユーザー統計値と標準モデルの比較が完了しました",
-            "comparison_data": comparison_result,
-            "console_output": "詳細な比較結果はサーバーコンソールに出力されました"
+            "total_frames": len(sorted_frames),
+            "frames": sorted_frames,
+            "is_cycle": True,
+            "note": "このデータは1周期分です。リピートして使用してください。"
         }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ 比較エラー: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"比較処理に失敗しました: {str(e)}")
 
-@app.get("/standard_model/keypoints")
-async def get_standard_model_keypoints(frame: Optional[int] = None):
+@functools.lru_cache(maxsize=1)
+def _cached_standard_model_keypoints_body() -> tuple:
+    """
+    全フレームのキーポイントデータ（数千個の辞書）をorjsonで一度だけシリアライズし、
+    レスポンスボディとETagの組として保持する
+    """
+    body = FAST_JSON_RESPONSE(_standard_model_keypoints_data()).body
+    return body, _compute_etag(body)
+
+@app.get("/standard_model/keypoints", response_model=None, response_class=FAST_JSON_RESPONSE)
+def get_standard_model_keypoints(request: Request, frame: Optional[int] = None):
     """
     標準モデルのキーポイントデータを取得するエンドポイント
     
@@ -1555,209 +2299,448 @@ async def get_standard_model_keypoints(frame: Optional[int] = None):
         指定されたフレームのキーポイントデータ、または全フレームのデータ
     """
     try:
-        # 提供された座標データから生成
-        try:
-            from standard_model_from_coordinates import get_standard_model_keypoints_from_coordinates
-            standard_model_data = get_standard_model_keypoints_from_coordinates()
-        except ImportError:
-            # フォールバック: 角度データから生成
-            standard_data = get_standard_model_data()
-            frame_keys = [k for k in standard_data.keys() if k.startswith('Frame_')]
-            frame_keys.sort(key=lambda x: int(x.split('_')[1]))
-            
-            all_keypoints = {}
-            for frame_key in frame_keys:
-                frame_num = int(frame_key.split('_')[1])
-                frame_data = standard_data[frame_key]
-                keypoints = generate_keypoints_from_angles(frame_data)
-                all_keypoints[frame_num] = {
-                    "keypoints": keypoints,
-                    "angles": frame_data
-                }
-            
-            sorted_frames = {str(k): all_keypoints[k] for k in sorted(all_keypoints.keys())}
-            standard_model_data = {
-                "status": "success",
-                "total_frames": len(sorted_frames),
-                "frames": sorted_frames,
-                "is_cycle": True,
-                "note": "このデータは1周期分です。リピートして使用してください。"
-            }
+        if frame is None:
+            # 全フレームを返す（シリアライズ済みのボディを使い回す）
+            body, etag = _cached_standard_model_keypoints_body()
+            return _static_json_response(request, body, etag)
         
-        if frame is not None:
-            # 特定のフレームを取得
-            max_frame = standard_model_data['total_frames'] - 1
-            if frame < 0 or frame > max_frame:
-                raise HTTPException(status_code=400, detail=f"フレーム番号は0-{max_frame}の範囲で指定してください")
-            
-            frame_key = str(frame)
-            if frame_key not in standard_model_data['frames']:
-                raise HTTPException(status_code=404, detail=f"フレーム{frame}のデータが見つかりません")
-            
-            frame_data = standard_model_data['frames'][frame_key]
-            
-            return {
-                "status": "success",
-                "frame": frame,
-                "keypoints": frame_data['keypoints'],
-                "frame_number": frame_data.get('frame_number', frame)
-            }
-        else:
-            # 全フレームを返す
-            return standard_model_data
+        standard_model_data = _standard_model_keypoints_data()
+        
+        # 特定のフレームを取得
+        max_frame = standard_model_data['total_frames'] - 1
+        if frame < 0 or frame > max_frame:
+            raise HTTPException(status_code=400, detail=f"フレーム番号は0-{max_frame}の範囲で指定してください")
+        
+        frame_key = str(frame)
+        if frame_key not in standard_model_data['frames']:
+            raise HTTPException(status_code=404, detail=f"フレーム{frame}のデータが見つかりません")
+        
+        frame_data = standard_model_data['frames'][frame_key]
+        
+        return {
+            "status": "success",
+            "frame": frame,
+            "keypoints": frame_data['keypoints'],
+            "frame_number": frame_data.get('frame_number', frame)
+        }
             
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 標準モデルキーポイント取得エラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ 標準モデルキーポイント取得エラー: %s", e)
         raise HTTPException(status_code=500, detail=f"標準モデルキーポイントデータの取得に失敗しました: {str(e)}")
 
-@app.get("/test_comparison")
-async def test_comparison_endpoint():
+def _compute_etag(body: bytes) -> str:
+    """
+    レスポンスボディからETagを作成する
+
+    GZipMiddleware が Accept-Encoding に応じてボディを圧縮し、同じETagでもバイト列が変わるため、
+    強いETagではなく弱いETag（W/"..."）とする
+    """
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーが指定のETagに一致するかを弱い比較（W/ の有無を無視）で判定する"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+def _static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    シリアライズ済みの固定レスポンスを返す
+    クライアントが同じETagを持っている場合はボディなしの304を返す
+    """
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+@functools.lru_cache(maxsize=1)
+def _cached_sample_comparison_body() -> tuple:
+    """
+    サンプル統計値と標準モデルの比較結果（入力が固定のため結果も不変）を
+    一度だけ計算し、シリアライズ済みのレスポンスボディとETagの組として保持する
+    """
+    # サンプルユーザー統計値を作成
+    sample_user_stats = create_sample_user_stats()
+    
+    # 比較処理を実行
+    comparison_result = compare_with_standard_model(sample_user_stats)
+    
+    body = FAST_JSON_RESPONSE({
+        "status": "success",
+        "message": _MSG_TEST_COMPARISON_DONE,
+        "sample_user_stats": sample_user_stats,
+        "comparison_result": comparison_result,
+        "console_note": _MSG_TEST_COMPARISON_CONSOLE
+    }).body
+    return body, _compute_etag(body)
+
+@app.get("/test_comparison", response_model=None, response_class=FAST_JSON_RESPONSE,
+         dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_comparison_endpoint(request: Request):
     """
     比較機能のテスト用エンドポイント
-    サンプルデータで比較結果をデモ表示
+    サンプルデータで比較結果をデモ表示（2回目以降はキャッシュを返す）
     """
     try:
-        print("🧪 比較機能テストエンドポイント実行...")
-        
-        # サンプルユーザー統計値を作成
-        sample_user_stats = create_sample_user_stats()
+        log.info("🧪 比較機能テストエンドポイント実行...")
         
-        # 比較処理を実行
-        comparison_result = compare_with_standard_model(sample_user_stats)
+        body, etag = _cached_sample_comparison_body()
+        return _static_json_response(request, body, etag)
         
-        return {
-            "status": "success",
-            "message": "比較機能テストが完了しました",
-            "sample_user_stats": sample_user_stats,
-            "comparison_result": comparison_result,
-            "console_note": "詳細な比較結果表示はサーバーコンソールをご確認ください"
-        }
-        
-    except Exception as e:
-        print(f"❌ テスト実行エラー: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"テスト実行に失敗しました: {str(e)}")
+    except (KeyError, TypeError, ValueError) as e:
+        log.exception("❌ テスト実行エラー")
+        raise HTTPException(status_code=500, detail=_DETAIL_TEST_FAIL) from e
 
-@app.get("/test_statistical_judgment")
-async def test_statistical_judgment_endpoint():
+# 統計的判定の基準（固定値のため、レスポンスボディごと起動時に一度だけシリアライズする）
+_JUDGMENT_CRITERIA = {
+    "offset_value": 1.5,
+    "formula": "重み付け変動度 = |標準平均 - ユーザー値| / 標準偏差 / CV",
+    "threshold": "閾値 = Offset値 / CV",
+    "decision": "重み付け変動度 > 閾値 → 課題あり"
+}
+_JUDGMENT_RESPONSE_TEMPLATE = MappingProxyType({
+    "status": "success",
+    "message": _MSG_JUDGMENT_TEST_DONE,
+    "test_note": _MSG_JUDGMENT_TEST_CONSOLE,
+    "judgment_criteria": _JUDGMENT_CRITERIA
+})
+_JUDGMENT_RESPONSE_BODY = FAST_JSON_RESPONSE(dict(_JUDGMENT_RESPONSE_TEMPLATE)).body
+_JUDGMENT_RESPONSE_ETAG = _compute_etag(_JUDGMENT_RESPONSE_BODY)
+
+@app.get("/test_statistical_judgment", response_model=None, response_class=FAST_JSON_RESPONSE,
+         dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_statistical_judgment_endpoint(request: Request):
     """
     統計的判定機能のテスト用エンドポイント
     """
     try:
-        print("🧪 統計的判定機能テストエンドポイント実行...")
+        log.info("🧪 統計的判定機能テストエンドポイント実行...")
+        
+        # 取得済みのクライアントにはテストを再実行せず304を返す
+        if request.headers.get("if-none-match") == _JUDGMENT_RESPONSE_ETAG:
+            return _static_json_response(request, _JUDGMENT_RESPONSE_BODY, _JUDGMENT_RESPONSE_ETAG)
         
         # テスト実行
         test_statistical_judgment()
         
-        return {
-            "status": "success",
-            "message": "統計的判定機能のテストが完了しました",
-            "test_note": "詳細なテスト結果はサーバーコンソールをご確認ください",
-            "judgment_criteria": {
-                "offset_value": 1.5,
-                "formula": "重み付け変動度 = |標準平均 - ユーザー値| / 標準偏差 / CV",
-                "threshold": "閾値 = Offset値 / CV",
-                "decision": "重み付け変動度 > 閾値 → 課題あり"
-            }
-        }
+        return _static_json_response(request, _JUDGMENT_RESPONSE_BODY, _JUDGMENT_RESPONSE_ETAG)
         
-    except Exception as e:
-        print(f"❌ 統計判定テストエラー: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"統計判定テストに失敗しました: {str(e)}")
+    except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+        log.exception("❌ 統計判定テストエラー")
+        raise HTTPException(status_code=500, detail=_DETAIL_JUDGMENT_TEST_FAIL) from e
 
 # =============================================================================
 # 統括的なランニング解析関数
 # =============================================================================
 
-def find_foot_strikes(time_series_keypoints: List[List[KeyPoint]], foot_type: str = 'right') -> List[int]:
+def _find_foot_strikes_impl(time_series_keypoints: Optional[List[List[KeyPoint]]], foot_type: str = 'right',
+                            soa: Optional[tuple] = None) -> List[int]:
+    """足の接地フレームを検出する（find_foot_strikes の本体、例外は呼び出し側で処理する）"""
+    print(f"🦶 {foot_type}足の接地検出を開始...")
+    
+    n_frames = len(soa[0]) if soa is not None else len(time_series_keypoints)
+    if n_frames < 10:
+        print("❌ フレーム数が不足しています")
+        return []
+    
+    # 足首とつま先のキーポイントインデックス
+    if foot_type == 'right':
+        ankle_idx = RIGHT_ANKLE
+        toe_idx = RIGHT_FOOT_INDEX
+    else:
+        ankle_idx = LEFT_ANKLE
+        toe_idx = LEFT_FOOT_INDEX
+    
+    # 足首のY座標（高さ）を時系列で抽出し、可視性の高いフレームのみ残す
+    if soa is None:
+        soa = keypoints_to_soa(time_series_keypoints)
+    _, ys, vis = soa
+    ankle_visible = vis[:, ankle_idx] > 0.5
+    valid_frames = np.flatnonzero(ankle_visible)
+    valid_heights = ys[ankle_visible, ankle_idx].astype(np.float64)
+    if len(valid_heights) < 10:
+        print("❌ 有効な足首データが不足しています")
+        return []
+    
+    # 移動平均でスムージング（ノイズ除去）
+    # smoothed_heights[i] は valid_frames[i] のフレームの値
+    window_size = min(5, len(valid_heights) // 3)
+    smoothed_heights = uniform_filter1d(valid_heights, size=window_size, mode='nearest')
+    
+    # 極小値（接地候補）を検出し、近すぎる接地を除去する（接地間隔の正規化）
+    # 反転した信号のピーク = 元信号の極小値
+    min_interval = max(10, n_frames // 20)  # 最小間隔
+    strike_indices, _ = signal.find_peaks(-smoothed_heights, distance=min_interval)
+    foot_strikes = valid_frames[strike_indices].tolist()
+    
+    print(f"🦶 {foot_type}足接地検出結果: {len(foot_strikes)}回 {foot_strikes}")
+    return foot_strikes
+
+def find_foot_strikes(time_series_keypoints: Optional[List[List[KeyPoint]]], foot_type: str = 'right',
+                      soa: Optional[tuple] = None) -> List[int]:
     """
     足の接地フレームを検出する
     
     Args:
-        time_series_keypoints: 時系列キーポイントデータ
+        time_series_keypoints: 時系列キーポイントデータ（soa を渡す場合は None でもよい）
         foot_type: 'right' または 'left'
+        soa: keypoints_to_soa で変換済みの (xs, ys, vis)（省略時はここで変換する）
     
     Returns:
         接地フレーム番号のリスト
     """
     try:
-        print(f"🦶 {foot_type}足の接地検出を開始...")
-        
-        if len(time_series_keypoints) < 10:
-            print("❌ フレーム数が不足しています")
-            return []
-        
-        # 足首とつま先のキーポイントインデックス
-        if foot_type == 'right':
-            ankle_idx = LANDMARK_INDICES['right_ankle']
-            toe_idx = LANDMARK_INDICES['right_foot_index']
-        else:
-            ankle_idx = LANDMARK_INDICES['left_ankle']
-            toe_idx = LANDMARK_INDICES['left_foot_index']
-        
-        # 足首のY座標（高さ）を時系列で抽出
-        ankle_heights = []
-        for frame_keypoints in time_series_keypoints:
-            if len(frame_keypoints) > ankle_idx and frame_keypoints[ankle_idx].visibility > 0.5:
-                ankle_heights.append(frame_keypoints[ankle_idx].y)
-            else:
-                ankle_heights.append(None)
-        
-        # 有効なデータのみでフィルタリング
-        valid_heights = [(i, h) for i, h in enumerate(ankle_heights) if h is not None]
-        if len(valid_heights) < 10:
-            print("❌ 有効な足首データが不足しています")
-            return []
-        
-        # 移動平均でスムージング（ノイズ除去）
-        window_size = min(5, len(valid_heights) // 3)
-        smoothed_heights = []
-        for i in range(len(valid_heights)):
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(valid_heights), i + window_size // 2 + 1)
-            avg_height = np.mean([valid_heights[j][1] for j in range(start_idx, end_idx)])
-            smoothed_heights.append((valid_heights[i][0], avg_height))
-        
-        # 極小値（接地候補）を検出
-        foot_strikes = []
-        for i in range(1, len(smoothed_heights) - 1):
-            prev_frame, prev_height = smoothed_heights[i-1]
-            curr_frame, curr_height = smoothed_heights[i]
-            next_frame, next_height = smoothed_heights[i+1]
-            
-            # 極小値の条件：前後よりも低い
-            if curr_height < prev_height and curr_height < next_height:
-                foot_strikes.append(curr_frame)
-        
-        # 接地間隔の正規化（近すぎる接地を除去）
-        if len(foot_strikes) > 1:
-            filtered_strikes = [foot_strikes[0]]
-            min_interval = max(10, len(time_series_keypoints) // 20)  # 最小間隔
-            
-            for strike in foot_strikes[1:]:
-                if strike - filtered_strikes[-1] >= min_interval:
-                    filtered_strikes.append(strike)
-            
-            foot_strikes = filtered_strikes
-        
-        print(f"🦶 {foot_type}足接地検出結果: {len(foot_strikes)}回 {foot_strikes}")
-        return foot_strikes
-        
+        return _find_foot_strikes_impl(time_series_keypoints, foot_type, soa)
     except Exception as e:
-        print(f"❌ 足接地検出エラー ({foot_type}): {str(e)}")
+        log.exception("❌ 足接地検出エラー (%s): %s", foot_type, e)
         return []
 
-def detect_foot_strikes_advanced(all_keypoints: List[List[KeyPoint]], video_fps: float) -> List[tuple]:
+@njit(cache=True, nogil=True)
+def _fill_nans_linear_kernel(y):
+    """
+    (F, C) 配列の各列のNaNを前後の有効値からの線形補間でin-placeに埋める
+
+    np.interp と同じく先頭・末尾のNaNは最も近い有効値で埋め、有効値が2点未満の列はそのままにする
+    """
+    n_frames, n_cols = y.shape
+    for c in range(n_cols):
+        n_valid = 0
+        for i in range(n_frames):
+            if not np.isnan(y[i, c]):
+                n_valid += 1
+        if n_valid < 2:
+            continue
+
+        # 有効値を1回走査し、直前の有効値との間のギャップを閉じるたびに埋める
+        last = -1
+        for i in range(n_frames):
+            value = y[i, c]
+            if np.isnan(value):
+                continue
+            if last == -1:
+                for k in range(i):
+                    y[k, c] = value
+            elif i - last > 1:
+                start = y[last, c]
+                slope = (value - start) / (i - last)
+                for k in range(last + 1, i):
+                    y[k, c] = start + slope * (k - last)
+            last = i
+        for k in range(last + 1, n_frames):
+            y[k, c] = y[last, c]
+
+def _fill_nans_linear_numpy(y: np.ndarray) -> None:
+    """_fill_nans_linear_kernel のNumPy版（numba未導入時に使用）"""
+    indices = np.arange(y.shape[0])
+    for c in range(y.shape[1]):
+        column = y[:, c]
+        mask = ~np.isnan(column)
+        if np.count_nonzero(mask) < 2:
+            continue
+        column[~mask] = np.interp(indices[~mask], indices[mask], column[mask])
+
+_fill_nans_linear_jit = _fill_nans_linear_kernel if NUMBA_AVAILABLE else _fill_nans_linear_numpy
+
+def _fill_nans_linear_aot(y: np.ndarray) -> None:
+    """
+    AOT版の fill_nans_linear を呼ぶアダプタ
+
+    AOT版は (F, C) float64 のシグネチャで固定されており、他の型を渡すと例外ではなくプロセスが落ちる。
+    in-placeで埋めるため型変換したコピーには渡せないので、それ以外の配列は @njit 版で埋める
+    """
+    if y.ndim == 2 and y.dtype == np.float64 and y.flags.c_contiguous and y.flags.writeable:
+        running_kernels.fill_nans_linear(y)
+    else:
+        _fill_nans_linear_jit(y)
+
+fill_nans_linear_inplace = _fill_nans_linear_aot if AOT_KERNELS_AVAILABLE else _fill_nans_linear_jit
+
+@functools.lru_cache(maxsize=16)
+def _savgol_kernels(window_length: int, polyorder: int = 3) -> tuple:
+    """
+    Savitzky-Golay フィルタの係数を窓長ごとに一度だけ計算する
+
+    Returns:
+        (内部用の畳み込み係数 (W,), 先頭端の当てはめ行列 (W//2, W), 末尾端の当てはめ行列 (W//2, W))
+    """
+    coeffs = signal.savgol_coeffs(window_length, polyorder)
+    # 端点は savgol_filter(mode='interp') と同じく、端の1窓に多項式を最小二乗で当てはめた値を使う
+    vander = np.vander(np.arange(window_length, dtype=np.float64), polyorder + 1)
+    fit = vander @ np.linalg.pinv(vander)
+    half = window_length // 2
+    kernels = (coeffs, fit[:half].copy(), fit[window_length - half:].copy())
+    for kernel in kernels:
+        kernel.setflags(write=False)
+    return kernels
+
+def savgol_smooth(y: np.ndarray, window_length: int, polyorder: int = 3) -> np.ndarray:
+    """
+    signal.savgol_filter(y, window_length, polyorder, axis=0) と同じ平滑化を、キャッシュ済みの係数で計算する
+
+    Args:
+        y: (F,) または (F, C) の信号（window_length 以上のフレーム数が必要）
+        window_length: 窓長（奇数）
+        polyorder: 多項式の次数（window_length 未満）
+
+    Returns:
+        y と同じ形状の平滑化済み信号
+    """
+    coeffs, head_fit, tail_fit = _savgol_kernels(window_length, polyorder)
+    half = window_length // 2
+    smoothed = convolve1d(y, coeffs, axis=0, mode='constant')
+    smoothed[:half] = head_fit @ y[:window_length]
+    smoothed[-half:] = tail_fit @ y[-window_length:]
+    return smoothed
+
+@njit(cache=True, nogil=True)
+def _fill_smooth_and_invert_kernel(y, coeffs, head_fit, tail_fit, out_neg):
+    """
+    (F, C) の信号を列ごとに NaN補間 → Savitzky-Golay 平滑化 → 符号反転し、(C, F) の out_neg に書き込む
+
+    平滑化と反転は1回の走査で行い、中間配列は作らない（値は savgol_smooth の符号反転と同じ）
+    """
+    _fill_nans_linear_kernel(y)
+
+    n_frames, n_cols = y.shape
+    window = coeffs.shape[0]
+    half = window // 2
+    for c in range(n_cols):
+        for i in range(n_frames):
+            acc = 0.0
+            if i < half:
+                # 先頭端: 最初の1窓への多項式当てはめ
+                for k in range(window):
+                    acc += head_fit[i, k] * y[k, c]
+            elif i >= n_frames - half:
+                # 末尾端: 最後の1窓への多項式当てはめ
+                row = i - (n_frames - half)
+                for k in range(window):
+                    acc += tail_fit[row, k] * y[n_frames - window + k, c]
+            else:
+                for k in range(window):
+                    acc += coeffs[k] * y[i + half - k, c]
+            out_neg[c, i] = -acc
+
+def fill_smooth_and_invert(y: np.ndarray, window_length: int, polyorder: int = 3) -> np.ndarray:
+    """
+    NaN補間（in-place）・Savitzky-Golay 平滑化・符号反転をまとめて行う
+
+    Args:
+        y: (F, C) の信号（NaNは線形補間で埋められる）
+        window_length: 窓長（奇数、F 以下）
+        polyorder: 多項式の次数（window_length 未満）
+
+    Returns:
+        (C, F) の反転済み平滑化信号（行ごとにそのまま find_peaks に渡せる）
+    """
+    coeffs, head_fit, tail_fit = _savgol_kernels(window_length, polyorder)
+    if NUMBA_AVAILABLE:
+        out_neg = np.empty((y.shape[1], y.shape[0]), dtype=np.float64)
+        _fill_smooth_and_invert_kernel(y, coeffs, head_fit, tail_fit, out_neg)
+        return out_neg
+    fill_nans_linear_inplace(y)
+    return -savgol_smooth(y, window_length, polyorder).T
+
+@njit(cache=True, nogil=True)
+def _merge_alternating_strikes_kernel(left, right):
+    """
+    昇順の左右接地候補を1パスでマージし、直前の候補と同じ足の候補を除外するマスクを作る
+
+    同一フレームでは左足を先に並べる（安定ソートで統合した場合と同じ順）
+
+    Returns:
+        (frames, feet, keep) のタプル。feet は 0=左, 1=右、keep は左右交互制約で残す候補でTrue
+    """
+    n_left = left.shape[0]
+    n_right = right.shape[0]
+    n = n_left + n_right
+    frames = np.empty(n, dtype=np.int64)
+    feet = np.empty(n, dtype=np.uint8)
+    keep = np.empty(n, dtype=np.bool_)
+
+    i = 0
+    j = 0
+    for k in range(n):
+        if j >= n_right or (i < n_left and left[i] <= right[j]):
+            frames[k] = left[i]
+            feet[k] = 0
+            i += 1
+        else:
+            frames[k] = right[j]
+            feet[k] = 1
+            j += 1
+        # スキップされた候補の足は直前に採用した足と同じなので、隣接比較で判定できる
+        keep[k] = k == 0 or feet[k] != feet[k - 1]
+    return frames, feet, keep
+
+def _merge_alternating_strikes_numpy(left: np.ndarray, right: np.ndarray) -> tuple:
+    """_merge_alternating_strikes_kernel のNumPy版（numba未導入時に使用、戻り値は同じ）"""
+    frames = np.concatenate((left, right)).astype(np.int64)
+    feet = np.concatenate((np.zeros(len(left), dtype=np.uint8), np.ones(len(right), dtype=np.uint8)))
+    order = np.argsort(frames, kind='stable')
+    frames = frames[order]
+    feet = feet[order]
+    keep = np.ones(len(frames), dtype=bool)
+    keep[1:] = feet[1:] != feet[:-1]
+    return frames, feet, keep
+
+def _merge_alternating_strikes_aot(left: np.ndarray, right: np.ndarray) -> tuple:
+    """AOT版の merge_alternating_strikes を呼ぶアダプタ（シグネチャが int64 の1次元配列で固定されているため変換して渡す）"""
+    return running_kernels.merge_alternating_strikes(
+        np.ascontiguousarray(left, dtype=np.int64), np.ascontiguousarray(right, dtype=np.int64)
+    )
+
+if AOT_KERNELS_AVAILABLE:
+    merge_alternating_strikes = _merge_alternating_strikes_aot
+elif NUMBA_AVAILABLE:
+    merge_alternating_strikes = _merge_alternating_strikes_kernel
+else:
+    merge_alternating_strikes = _merge_alternating_strikes_numpy
+
+def stride_interval_limits(video_fps: float) -> tuple:
+    """
+    同じ足の接地間隔（1ストライド = 2歩）の下限・上限フレーム数を返す
+    SPM制約: 120-220 SPM (0.27-0.5秒/歩) なので、同じ足の接地間隔は 0.55-1.0秒
+    """
+    min_interval_frames = max(1, int(video_fps * 2 * 60 / 220))  # 220 SPM
+    max_interval_frames = int(video_fps * 2 * 60 / 120)  # 120 SPM
+    return min_interval_frames, max_interval_frames
+
+def select_stride_cycle(foot_strikes: List[int], video_fps: float) -> Optional[tuple]:
+    """
+    同じ足の接地フレーム列から、間隔が1ストライドの範囲に収まる最初の連続した接地ペアを選ぶ
+    範囲外の間隔は接地の検出漏れや誤検出を含むため、代表サイクルには使わない
+    
+    Returns:
+        (ペアの番号, 開始フレーム, 終了フレーム)、該当するペアがなければNone
+    """
+    strikes = np.asarray(foot_strikes, dtype=np.int64)
+    if len(strikes) < 2:
+        return None
+    
+    min_interval_frames, max_interval_frames = stride_interval_limits(video_fps)
+    intervals = np.diff(strikes)
+    within_limits = np.flatnonzero((intervals >= min_interval_frames) & (intervals <= max_interval_frames))
+    if within_limits.size == 0:
+        return None
+    
+    pair_index = int(within_limits[0])
+    return pair_index, int(strikes[pair_index]), int(strikes[pair_index + 1])
+
+def detect_foot_strikes_advanced(all_keypoints: Optional[List[List[KeyPoint]]], video_fps: float,
+                                 soa: Optional[tuple] = None) -> List[tuple]:
     """
     高精度な歩数カウント（フットストライク検出）関数
     スムージングと人間工学的制約を用いたフィルタリングを実装
     
     Args:
-        all_keypoints: 動画全体のキーポイントデータ
+        all_keypoints: 動画全体のキーポイントデータ（soa を渡す場合は None でもよい）
         video_fps: 動画のフレームレート
+        soa: keypoints_to_soa で変換済みの (xs, ys, vis)（省略時はここで変換する）
     
     Returns:
         検出された全ての接地イベントのリスト [(フレーム番号, 'left'/'right'), ...]
@@ -1765,151 +2748,85 @@ def detect_foot_strikes_advanced(all_keypoints: List[List[KeyPoint]], video_fps:
     """
     try:
         print(f"🚀 高精度フットストライク検出を開始...")
-        print(f"📊 入力データ: {len(all_keypoints)}フレーム, FPS: {video_fps}")
+        n_frames = len(soa[0]) if soa is not None else len(all_keypoints)
+        print(f"📊 入力データ: {n_frames}フレーム, FPS: {video_fps}")
         
-        if len(all_keypoints) < 20:
+        if n_frames < 20:
             print("❌ フレーム数が不足しています（最低20フレーム必要）")
             return []
         
         # ステップ1: データ準備とスムージング
         print("📈 ステップ1: データ準備とスムージング")
         
-        # 左右足首のY座標を抽出
-        left_ankle_y = []
-        right_ankle_y = []
+        # 左右足首のY座標を抽出（可視性0.5以下のフレームはNaN）
+        _, ys, vis = soa if soa is not None else keypoints_to_soa(all_keypoints)
+        ankle_y = np.where(vis[:, ANKLE_IDX] > 0.5, ys[:, ANKLE_IDX], np.nan).astype(np.float64)
         
-        left_ankle_idx = LANDMARK_INDICES['left_ankle']
-        right_ankle_idx = LANDMARK_INDICES['right_ankle']
-        
-        for frame_keypoints in all_keypoints:
-            # 左足首
-            if len(frame_keypoints) > left_ankle_idx and frame_keypoints[left_ankle_idx].visibility > 0.5:
-                left_ankle_y.append(frame_keypoints[left_ankle_idx].y)
-            else:
-                left_ankle_y.append(np.nan)
-            
-            # 右足首
-            if len(frame_keypoints) > right_ankle_idx and frame_keypoints[right_ankle_idx].visibility > 0.5:
-                right_ankle_y.append(frame_keypoints[right_ankle_idx].y)
-            else:
-                right_ankle_y.append(np.nan)
-        
-        # NaNを線形補間で埋める
-        left_ankle_y = np.array(left_ankle_y)
-        right_ankle_y = np.array(right_ankle_y)
-        
-        def interpolate_nans(arr):
-            """NaN値を線形補間で埋める"""
-            mask = ~np.isnan(arr)
-            if np.sum(mask) < 2:
-                return arr
-            indices = np.arange(len(arr))
-            arr[~mask] = np.interp(indices[~mask], indices[mask], arr[mask])
-            return arr
-        
-        left_ankle_y = interpolate_nans(left_ankle_y)
-        right_ankle_y = interpolate_nans(right_ankle_y)
-        
-        # Savitzky-Golay フィルタでスムージング
-        window_length = min(7, len(all_keypoints) // 3)
+        # NaN補間・Savitzky-Golay スムージング・符号反転をまとめて行う（左右の列を一括処理）
+        window_length = min(7, n_frames // 3)
         if window_length % 2 == 0:
             window_length -= 1  # 奇数にする
         window_length = max(3, window_length)  # 最小値は3
         
         try:
-            left_smoothed = signal.savgol_filter(left_ankle_y, window_length, 3)
-            right_smoothed = signal.savgol_filter(right_ankle_y, window_length, 3)
+            # 極小値（谷）を検出するため信号を反転した (2, F) 配列（行ごとに find_peaks に渡せる）
+            inverted = fill_smooth_and_invert(ankle_y, window_length, 3)
             print(f"✅ スムージング完了 (window_length: {window_length})")
         except Exception as e:
-            print(f"⚠️ スムージングエラー、移動平均にフォールバック: {e}")
-            # フォールバック: 単純移動平均
-            def moving_average(arr, window):
-                return np.convolve(arr, np.ones(window)/window, mode='same')
-            left_smoothed = moving_average(left_ankle_y, 5)
-            right_smoothed = moving_average(right_ankle_y, 5)
+            log.warning("⚠️ スムージングエラー、移動平均にフォールバック: %s", e)
+            # フォールバック: 単純移動平均（np.convolve(mode='same') と同じくゼロ埋め）
+            fill_nans_linear_inplace(ankle_y)
+            inverted = -convolve1d(ankle_y, np.full(5, 1 / 5), axis=0, mode='constant').T
         
         # ステップ2: 全ての接地候補を検出
         print("🔍 ステップ2: 接地候補検出")
+        left_inverted = inverted[0]
+        right_inverted = inverted[1]
         
-        # 極小値（谷）を検出するため信号を反転
-        left_inverted = -left_smoothed
-        right_inverted = -right_smoothed
+        # 同じ足の接地間隔の下限（1ストライド分、220 SPM）
+        min_interval_frames, _ = stride_interval_limits(video_fps)
         
-        # find_peaksで極小値（谷）を検出
-        min_prominence = np.std(left_smoothed) * 0.3  # プロミネンス閾値
-        left_candidates, _ = signal.find_peaks(left_inverted, prominence=min_prominence)
-        right_candidates, _ = signal.find_peaks(right_inverted, prominence=min_prominence)
+        # find_peaksで極小値（谷）を検出（間隔の下限は distance で適用し、近接候補は深い谷を残す）
+        min_prominence = np.std(left_inverted) * 0.3  # プロミネンス閾値（左足の振幅を基準）
+        left_candidates, _ = signal.find_peaks(left_inverted, prominence=min_prominence,
+                                               distance=min_interval_frames)
+        right_candidates, _ = signal.find_peaks(right_inverted, prominence=min_prominence,
+                                                distance=min_interval_frames)
         
-        print(f"📍 左足候補: {len(left_candidates)}個 {list(left_candidates)}")
-        print(f"📍 右足候補: {len(right_candidates)}個 {list(right_candidates)}")
+        print(f"📍 接地候補: 左足{len(left_candidates)}個, 右足{len(right_candidates)}個")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("📍 左足候補フレーム: %s", left_candidates.tolist())
+            log.debug("📍 右足候補フレーム: %s", right_candidates.tolist())
         
-        # ステップ3: 候補のフィルタリングと最終リストの構築
-        print("🔧 ステップ3: フィルタリングと最終構築")
+        # ステップ3: 最終リストの構築
+        # 間隔の下限は find_peaks の distance で適用済み。上限を超える間隔は接地の検出漏れを含みうるため
+        # 候補は除外せず、代表サイクルの選択（select_stride_cycle）で1ストライドの範囲に収まるペアだけを使う
+        print("🔄 ステップ3: 左右交互フィルタ適用中...")
         
-        # 時間制約フィルタ
-        def apply_time_constraints(candidates, foot_name):
-            """物理的制約に基づいて候補をフィルタリング"""
-            if len(candidates) < 2:
-                return candidates
-            
-            # SPM制約: 120-220 SPM (0.27-0.5秒/歩)
-            min_interval_frames = int(video_fps * 60 / 220)  # 220 SPM
-            max_interval_frames = int(video_fps * 60 / 120)  # 120 SPM
-            
-            filtered = [candidates[0]]
-            for candidate in candidates[1:]:
-                interval = candidate - filtered[-1]
-                if min_interval_frames <= interval <= max_interval_frames:
-                    filtered.append(candidate)
-                else:
-                    print(f"⚠️ {foot_name}足候補除外: フレーム{candidate} (間隔: {interval})")
-            
-            print(f"✅ {foot_name}足フィルタ後: {len(filtered)}個 {list(filtered)}")
-            return np.array(filtered)
-        
-        left_filtered = apply_time_constraints(left_candidates, "左")
-        right_filtered = apply_time_constraints(right_candidates, "右")
-        
-        # 左右交互フィルタ
-        print("🔄 左右交互フィルタ適用中...")
-        
-        # 全候補を統合してソート
-        all_candidates = []
-        for frame in left_filtered:
-            all_candidates.append((frame, 'left'))
-        for frame in right_filtered:
-            all_candidates.append((frame, 'right'))
-        
-        # フレーム番号でソート
-        all_candidates.sort(key=lambda x: x[0])
-        print(f"📊 統合候補: {len(all_candidates)}個 {all_candidates}")
-        
-        # 左右交互制約を適用
-        final_strikes = []
-        if all_candidates:
-            final_strikes.append(all_candidates[0])
-            
-            for candidate in all_candidates[1:]:
-                current_frame, current_foot = candidate
-                last_frame, last_foot = final_strikes[-1]
-                
-                # 異なる足の場合のみ追加
-                if current_foot != last_foot:
-                    final_strikes.append(candidate)
-                else:
-                    print(f"⚠️ 同一足連続をスキップ: {current_foot}足フレーム{current_frame}")
+        # 全候補をフレーム番号順に統合し（足は 0=左, 1=右 の配列で並走させる）、
+        # 左右交互制約（直前の候補と同じ足の候補はスキップ）を1パスで適用
+        frames, feet, keep = merge_alternating_strikes(left_candidates.astype(np.int64, copy=False),
+                                                       right_candidates.astype(np.int64, copy=False))
+        print(f"📊 統合候補: {len(frames)}個")
+        
+        if log.isEnabledFor(logging.DEBUG):
+            for frame, foot in zip(frames[~keep].tolist(), feet[~keep].tolist()):
+                log.debug("⚠️ 同一足連続をスキップ: %s足フレーム%d", FOOT_SIDES[foot], frame)
+        
+        final_strikes = [(frame, FOOT_SIDES[foot]) for frame, foot in zip(frames[keep].tolist(), feet[keep].tolist())]
         
         print(f"✅ 最終フットストライク検出結果: {len(final_strikes)}個")
-        for frame, foot in final_strikes:
-            print(f"  🦶 フレーム{frame}: {foot}足")
+        if log.isEnabledFor(logging.DEBUG):
+            for frame, foot in final_strikes:
+                log.debug("  🦶 フレーム%d: %s足", frame, foot)
         
         # 検出統計
-        left_count = sum(1 for _, foot in final_strikes if foot == 'left')
-        right_count = sum(1 for _, foot in final_strikes if foot == 'right')
+        right_count = int(np.count_nonzero(feet[keep]))
         total_steps = len(final_strikes)
+        left_count = total_steps - right_count
         
         if len(final_strikes) > 1:
-            duration_seconds = len(all_keypoints) / video_fps
+            duration_seconds = n_frames / video_fps
             spm = (total_steps * 60) / duration_seconds
             print(f"📊 検出統計:")
             print(f"  👣 総歩数: {total_steps}歩")
@@ -1920,157 +2837,175 @@ def detect_foot_strikes_advanced(all_keypoints: List[List[KeyPoint]], video_fps:
         return final_strikes
         
     except Exception as e:
-        print(f"❌ 高精度フットストライク検出エラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ 高精度フットストライク検出エラー: %s", e)
         return []
 
-def analyze_angles_for_single_cycle(cycle_keypoints: List[List[KeyPoint]]) -> Dict[str, Dict[str, float]]:
+# =============================================================================
+# 1サイクル分の角度計算カーネル（体幹＋10セグメントを1パスで計算）
+# =============================================================================
+
+# compute_cycle_angles の列順（体幹の後は ABSOLUTE_SEGMENT_NAMES と同じ並び、下腿は lower_leg 名）
+CYCLE_ANGLE_KEYS = [
+    'trunk_angle',
+    'left_thigh_angle', 'right_thigh_angle',
+    'left_lower_leg_angle', 'right_lower_leg_angle',
+    'left_upper_arm_angle', 'right_upper_arm_angle',
+    'left_forearm_angle', 'right_forearm_angle',
+    'left_foot_angle', 'right_foot_angle'
+]
+
+# フレーム数がこれ未満ならスレッド起動コストの方が大きいため逐次版を使う
+CYCLE_PARALLEL_MIN_FRAMES = 64
+
+@njit(fastmath=FASTMATH_FLAGS, cache=True, nogil=True)
+def _cycle_angles_frame(xs, ys, vis, f, tail, head, tail_vis, head_vis, out):
+    """1フレーム分の体幹角度と10セグメントの絶対角度を out[f] に書き込む"""
+    n_segments = tail.shape[0]
+    # 体幹: 股関節中点→肩中点ベクトルの鉛直軸からの角度（前傾で負値）
+    # インデックスはモジュール定数なのでコンパイル時に定数として埋め込まれる
+    ls, rs, lh, rh = LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP
+    trunk_x = (np.float64(xs[f, ls]) + xs[f, rs]) / 2 - (np.float64(xs[f, lh]) + xs[f, rh]) / 2
+    trunk_y = (np.float64(ys[f, ls]) + ys[f, rs]) / 2 - (np.float64(ys[f, lh]) + ys[f, rh]) / 2
+    if (vis[f, ls] >= 0.5 and vis[f, rs] >= 0.5 and vis[f, lh] >= 0.5 and vis[f, rh] >= 0.5
+            and (trunk_x != 0 or trunk_y != 0)):
+        out[f, 0] = -math.degrees(math.atan2(trunk_x, -trunk_y))
+    else:
+        out[f, 0] = np.nan
+
+    for j in range(n_segments):
+        t = tail[j]
+        h = head[j]
+        dx = np.float64(xs[f, h]) - xs[f, t]
+        dy = np.float64(ys[f, h]) - ys[f, t]
+        if (dx == 0 and dy == 0) or vis[f, t] < tail_vis[j] or vis[f, h] < head_vis[j]:
+            out[f, j + 1] = np.nan
+        elif j < 4:
+            # 大腿・下腿: 鉛直軸（上向き）からの角度
+            out[f, j + 1] = math.degrees(math.atan2(dx, -dy))
+        elif j < 6:
+            # 上腕: 鉛直軸からの角度（符号反転）
+            out[f, j + 1] = -math.degrees(math.atan2(dx, -dy))
+        elif j < 8:
+            # 前腕: 鉛直下向きベクトルとのなす角（左は正値、右は負値）
+            angle = math.degrees(math.atan2(abs(dx), dy))
+            out[f, j + 1] = angle if j == 6 else -angle
+        else:
+            # 足部: 水平軸からの角度を -90～+90 に折り返す
+            angle = math.degrees(math.atan2(dy, dx))
+            if angle > 90:
+                angle = 180 - angle
+            if angle < -90:
+                angle = -180 - angle
+            out[f, j + 1] = angle
+
+@njit(fastmath=FASTMATH_FLAGS, cache=True, nogil=True)
+def _cycle_angles_kernel(xs, ys, vis, tail, head, tail_vis, head_vis):
+    """
+    フレームごとに体幹角度と10セグメントの絶対角度を計算する（逐次版）
+
+    Args:
+        xs, ys, vis: (F, 33) の座標・可視性配列
+        tail, head: セグメントの始点・終点インデックス (10,)
+        tail_vis, head_vis: セグメントごとの始点・終点の可視性閾値 (10,)
+
+    Returns:
+        (F, 11) の角度配列（CYCLE_ANGLE_KEYS 順）。計算不可の要素はNaN
+    """
+    n_frames = xs.shape[0]
+    out = np.empty((n_frames, tail.shape[0] + 1), dtype=np.float64)
+    for f in range(n_frames):
+        _cycle_angles_frame(xs, ys, vis, f, tail, head, tail_vis, head_vis, out)
+    return out
+
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, cache=True, nogil=True)
+def _cycle_angles_kernel_parallel(xs, ys, vis, tail, head, tail_vis, head_vis):
+    """_cycle_angles_kernel のフレーム並列版（各フレームは独立、戻り値は同じ）"""
+    n_frames = xs.shape[0]
+    out = np.empty((n_frames, tail.shape[0] + 1), dtype=np.float64)
+    for f in prange(n_frames):
+        _cycle_angles_frame(xs, ys, vis, f, tail, head, tail_vis, head_vis, out)
+    return out
+
+def compute_cycle_angles(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> np.ndarray:
+    """
+    1サイクル分の11指標（体幹＋10セグメント）を (F, 11) 配列で計算する
+
+    フレーム数が CYCLE_PARALLEL_MIN_FRAMES 以上ならフレーム並列版カーネルを使い、
+    それ未満ではAOTコンパイル済みの逐次版があればそれを使う。
+    AOT版は (F, 33) float32 のシグネチャで固定されており、他の型を渡すと例外ではなくプロセスが落ちるため、
+    float32 以外の入力は @njit 版（任意の型を受け付ける）で計算する。
+    どちらのカーネルも使えない場合は _trunk_angles_batch / _absolute_segment_angles のNumPy版で同じ値を返す
+    """
+    if NUMBA_AVAILABLE and xs.shape[0] >= CYCLE_PARALLEL_MIN_FRAMES:
+        with PARALLEL_KERNEL_LOCK:
+            return _cycle_angles_kernel_parallel(xs, ys, vis, _ABS_TAIL, _ABS_HEAD, _ABS_TAIL_VIS, _ABS_HEAD_VIS)
+    if AOT_KERNELS_AVAILABLE and xs.dtype == ys.dtype == vis.dtype == np.float32:
+        return running_kernels.cycle_angles(xs, ys, vis, _ABS_TAIL, _ABS_HEAD, _ABS_TAIL_VIS, _ABS_HEAD_VIS)
+    if NUMBA_AVAILABLE:
+        return _cycle_angles_kernel(xs, ys, vis, _ABS_TAIL, _ABS_HEAD, _ABS_TAIL_VIS, _ABS_HEAD_VIS)
+    return np.column_stack([
+        _trunk_angles_batch(xs, ys, vis),
+        _absolute_segment_angles(xs, ys, vis)
+    ]).astype(np.float64)
+
+def _analyze_angles_for_single_cycle_impl(cycle_keypoints: List[List[KeyPoint]],
+                                          soa: Optional[tuple] = None) -> Dict[str, Dict[str, float]]:
+    """単一サイクルの各指標の統計値を計算する（analyze_angles_for_single_cycle の本体、例外は呼び出し側で処理する）"""
+    print(f"📊 1サイクル解析開始 - フレーム数: {len(cycle_keypoints)}")
+    
+    # 全フレームの11指標を (F, 11) 配列で一括計算（列順は CYCLE_ANGLE_KEYS）
+    xs, ys, vis = soa if soa is not None else keypoints_to_soa(cycle_keypoints)
+    cycle_angles = compute_cycle_angles(xs, ys, vis)
+    
+    # 統計値を列方向の一括リダクションで計算（NaNは計算不可の要素として除外）
+    # 33点未満のフレームは可視性0のため全列NaNになり除外される
+    valid = ~np.isnan(cycle_angles)
+    counts = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(valid, cycle_angles, 0.0).sum(axis=0) / counts
+        stds = np.sqrt(np.where(valid, (cycle_angles - means) ** 2, 0.0).sum(axis=0) / counts)
+    mins = np.where(valid, cycle_angles, np.inf).min(axis=0, initial=np.inf)
+    maxs = np.where(valid, cycle_angles, -np.inf).max(axis=0, initial=-np.inf)
+    
+    stats_results = {}
+    for j, angle_type in enumerate(CYCLE_ANGLE_KEYS):
+        if counts[j]:
+            stats_results[angle_type] = {
+                'mean': float(means[j]),
+                'min': float(mins[j]),
+                'max': float(maxs[j]),
+                'std': float(stds[j]),
+                'count': int(counts[j])
+            }
+            log.debug("📐 %s: 平均=%.1f°, 範囲=[%.1f, %.1f]°",
+                      angle_type, means[j], mins[j], maxs[j])
+        else:
+            stats_results[angle_type] = {
+                'mean': None, 'min': None, 'max': None, 'std': None, 'count': 0
+            }
+    
+    return stats_results
+
+def analyze_angles_for_single_cycle(cycle_keypoints: List[List[KeyPoint]],
+                                    soa: Optional[tuple] = None) -> Dict[str, Dict[str, float]]:
     """
     単一サイクルの各指標の統計値を計算する
     
     Args:
         cycle_keypoints: 1サイクル分のキーポイントデータ
+        soa: keypoints_to_soa で変換済みの1サイクル分の (xs, ys, vis)（省略時はここで変換する）
     
     Returns:
         各指標の統計値辞書
     """
     try:
-        print(f"📊 1サイクル解析開始 - フレーム数: {len(cycle_keypoints)}")
-        
-        # 各フレームの角度を計算
-        cycle_angles = {
-            'trunk_angle': [],
-            'left_thigh_angle': [],
-            'right_thigh_angle': [],
-            'left_lower_leg_angle': [],
-            'right_lower_leg_angle': [],
-            # 新規追加角度
-            'left_upper_arm_angle': [],
-            'right_upper_arm_angle': [],
-            'left_forearm_angle': [],
-            'right_forearm_angle': [],
-            'left_foot_angle': [],
-            'right_foot_angle': []
-        }
-        
-        for frame_keypoints in cycle_keypoints:
-            if len(frame_keypoints) >= 33:
-                # 体幹角度
-                trunk_angle = calculate_trunk_angle(frame_keypoints)
-                if trunk_angle is not None:
-                    cycle_angles['trunk_angle'].append(trunk_angle)
-                
-                # 大腿角度
-                left_thigh = calculate_thigh_angle(
-                    frame_keypoints[LANDMARK_INDICES['left_hip']],
-                    frame_keypoints[LANDMARK_INDICES['left_knee']],
-                    'left'
-                )
-                if left_thigh is not None:
-                    cycle_angles['left_thigh_angle'].append(left_thigh)
-                
-                right_thigh = calculate_thigh_angle(
-                    frame_keypoints[LANDMARK_INDICES['right_hip']],
-                    frame_keypoints[LANDMARK_INDICES['right_knee']],
-                    'right'
-                )
-                if right_thigh is not None:
-                    cycle_angles['right_thigh_angle'].append(right_thigh)
-                
-                # 下腿角度
-                left_lower_leg = calculate_lower_leg_angle(
-                    frame_keypoints[LANDMARK_INDICES['left_knee']],
-                    frame_keypoints[LANDMARK_INDICES['left_ankle']],
-                    'left'
-                )
-                if left_lower_leg is not None:
-                    cycle_angles['left_lower_leg_angle'].append(left_lower_leg)
-                
-                right_lower_leg = calculate_lower_leg_angle(
-                    frame_keypoints[LANDMARK_INDICES['right_knee']],
-                    frame_keypoints[LANDMARK_INDICES['right_ankle']],
-                    'right'
-                )
-                if right_lower_leg is not None:
-                    cycle_angles['right_lower_leg_angle'].append(right_lower_leg)
-                
-                # 上腕角度
-                left_upper_arm = calculate_upper_arm_angle(
-                    frame_keypoints[LANDMARK_INDICES['left_shoulder']],
-                    frame_keypoints[LANDMARK_INDICES['left_elbow']],
-                    'left'
-                )
-                if left_upper_arm is not None:
-                    cycle_angles['left_upper_arm_angle'].append(left_upper_arm)
-                
-                right_upper_arm = calculate_upper_arm_angle(
-                    frame_keypoints[LANDMARK_INDICES['right_shoulder']],
-                    frame_keypoints[LANDMARK_INDICES['right_elbow']],
-                    'right'
-                )
-                if right_upper_arm is not None:
-                    cycle_angles['right_upper_arm_angle'].append(right_upper_arm)
-                
-                # 前腕角度
-                left_forearm = calculate_forearm_angle(
-                    frame_keypoints[LANDMARK_INDICES['left_elbow']],
-                    frame_keypoints[LANDMARK_INDICES['left_wrist']],
-                    'left'
-                )
-                if left_forearm is not None:
-                    cycle_angles['left_forearm_angle'].append(left_forearm)
-                
-                right_forearm = calculate_forearm_angle(
-                    frame_keypoints[LANDMARK_INDICES['right_elbow']],
-                    frame_keypoints[LANDMARK_INDICES['right_wrist']],
-                    'right'
-                )
-                if right_forearm is not None:
-                    cycle_angles['right_forearm_angle'].append(right_forearm)
-                
-                # 足部角度
-                left_foot = calculate_foot_angle(
-                    frame_keypoints[LANDMARK_INDICES['left_ankle']],
-                    frame_keypoints[LANDMARK_INDICES['left_foot_index']],
-                    'left'
-                )
-                if left_foot is not None:
-                    cycle_angles['left_foot_angle'].append(left_foot)
-                
-                right_foot = calculate_foot_angle(
-                    frame_keypoints[LANDMARK_INDICES['right_ankle']],
-                    frame_keypoints[LANDMARK_INDICES['right_foot_index']],
-                    'right'
-                )
-                if right_foot is not None:
-                    cycle_angles['right_foot_angle'].append(right_foot)
-        
-        # 統計値を計算
-        stats_results = {}
-        for angle_type, values in cycle_angles.items():
-            if values:
-                stats_results[angle_type] = {
-                    'mean': float(np.mean(values)),
-                    'min': float(np.min(values)),
-                    'max': float(np.max(values)),
-                    'std': float(np.std(values)),
-                    'count': len(values)
-                }
-                print(f"📐 {angle_type}: 平均={stats_results[angle_type]['mean']:.1f}°, "
-                      f"範囲=[{stats_results[angle_type]['min']:.1f}, {stats_results[angle_type]['max']:.1f}]°")
-            else:
-                stats_results[angle_type] = {
-                    'mean': None, 'min': None, 'max': None, 'std': None, 'count': 0
-                }
-        
-        return stats_results
-        
+        return _analyze_angles_for_single_cycle_impl(cycle_keypoints, soa)
     except Exception as e:
-        print(f"❌ サイクル解析エラー: {str(e)}")
+        log.exception("❌ サイクル解析エラー: %s", e)
         return {}
 
-def analyze_user_run_and_get_stats(all_keypoints: List[List[KeyPoint]], video_fps: float) -> Optional[Dict[str, Dict[str, float]]]:
+def analyze_user_run_and_get_stats(all_keypoints: List[List[KeyPoint]], video_fps: float,
+                                   soa: Optional[tuple] = None) -> Optional[Dict[str, Dict[str, float]]]:
     """
     ランニングのキーポイントデータ全体を入力として受け取り、
     代表的な1サイクルの各指標の統計値（最小値・最大値・平均値）を返す統括的な解析関数
@@ -2078,6 +3013,7 @@ def analyze_user_run_and_get_stats(all_keypoints: List[List[KeyPoint]], video_fp
     Args:
         all_keypoints: 動画全体のキーポイントデータ
         video_fps: 動画のフレームレート
+        soa: keypoints_to_soa で変換済みの (xs, ys, vis)（省略時はここで一度だけ変換する）
     
     Returns:
         解析結果の統計値が入った辞書、またはNone
@@ -2094,48 +3030,58 @@ def analyze_user_run_and_get_stats(all_keypoints: List[List[KeyPoint]], video_fp
         
         # ステップ1: フットストライク検出
         print("\n🦶 フットストライク検出...")
-        right_foot_strikes = find_foot_strikes(all_keypoints, 'right')
-        left_foot_strikes = find_foot_strikes(all_keypoints, 'left')
+        # 高精度検出で左右の接地を1パスで取得し、足ごとに振り分ける
+        if soa is None:
+            soa = keypoints_to_soa(all_keypoints)
+        foot_strikes = detect_foot_strikes_advanced(all_keypoints, video_fps, soa)
+        advanced_strikes = {
+            'right': [int(frame) for frame, foot in foot_strikes if foot == 'right'],
+            'left': [int(frame) for frame, foot in foot_strikes if foot == 'left'],
+        }
         
-        # より多く検出された方を使用
-        if len(right_foot_strikes) >= len(left_foot_strikes):
-            primary_foot_strikes = right_foot_strikes
-            foot_type = 'right'
+        # より多く検出された足を優先
+        if len(advanced_strikes['right']) >= len(advanced_strikes['left']):
+            foot_order = ('right', 'left')
         else:
-            primary_foot_strikes = left_foot_strikes
-            foot_type = 'left'
+            foot_order = ('left', 'right')
+        
+        # ステップ2: 代表的なサイクルを選択
+        print("\n🔄 代表サイクル選択...")
+        
+        def candidate_strike_lists():
+            """高精度検出の接地列を優先し、次に足ごとの谷検出（find_foot_strikes）の接地列を必要な時だけ返す"""
+            for foot in foot_order:
+                yield foot, advanced_strikes[foot]
+            for foot in foot_order:
+                yield foot, find_foot_strikes(all_keypoints, foot, soa)
         
-        print(f"🦶 使用する足: {foot_type}足 ({len(primary_foot_strikes)}回の接地)")
+        # 間隔が1ストライドの範囲に収まる最初の連続した接地ペアを1サイクルとする
+        cycle = None
+        for foot_type, strikes in candidate_strike_lists():
+            cycle = select_stride_cycle(strikes, video_fps)
+            if cycle is not None:
+                break
         
         # サイクルが検出できない場合
-        if len(primary_foot_strikes) < 2:
-            print("❌ 足接地が2回未満のため、サイクルを検出できません")
+        if cycle is None:
+            print("❌ 1ストライドの範囲に収まる接地ペアがないため、サイクルを検出できません")
             return None
         
-        # ステップ2: 代表的なサイクルを選択
-        print("\n🔄 代表サイクル選択...")
-        
-        if len(primary_foot_strikes) >= 3:
-            # 2回目から3回目の接地まで（より安定した中間部分）
-            cycle_start = primary_foot_strikes[1]
-            cycle_end = primary_foot_strikes[2]
-            cycle_description = "2回目〜3回目の接地"
-        else:
-            # 1回目から2回目の接地まで（1サイクルのみ）
-            cycle_start = primary_foot_strikes[0]
-            cycle_end = primary_foot_strikes[1]
-            cycle_description = "1回目〜2回目の接地"
+        pair_index, cycle_start, cycle_end = cycle
+        cycle_description = f"{foot_type}足 {pair_index + 1}回目〜{pair_index + 2}回目の接地"
         
         print(f"📍 選択サイクル: {cycle_description}")
         print(f"📍 フレーム範囲: {cycle_start} 〜 {cycle_end} ({cycle_end - cycle_start}フレーム)")
         print(f"⏱️ 時間: {cycle_start/video_fps:.2f}s 〜 {cycle_end/video_fps:.2f}s")
         
-        # ステップ3: サイクルデータを抽出
+        # ステップ3: サイクルデータを抽出（SoA配列はスライスのビューなのでコピーしない）
         cycle_keypoints = all_keypoints[cycle_start:cycle_end + 1]
+        cycle_soa = tuple(arr[cycle_start:cycle_end + 1] for arr in soa)
         
         # ステップ4: 選択したサイクルの統計値を計算
         print(f"\n📊 サイクル解析実行...")
-        stats_results = analyze_angles_for_single_cycle(cycle_keypoints)
+        # 例外はこの関数の except でまとめて処理する
+        stats_results = _analyze_angles_for_single_cycle_impl(cycle_keypoints, cycle_soa)
         
         if not stats_results:
             print("❌ サイクル解析に失敗しました")
@@ -2151,7 +3097,7 @@ def analyze_user_run_and_get_stats(all_keypoints: List[List[KeyPoint]], video_fp
         return stats_results
         
     except Exception as e:
-        print(f"❌ 統括解析エラー: {str(e)}")
+        log.exception("❌ 統括解析エラー: %s", e)
         return None
 
 def display_comparison_results(user_stats: Dict[str, Dict[str, float]], standard_model: Dict[str, Dict[str, float]]) -> None:
@@ -2184,6 +3130,29 @@ def display_comparison_results(user_stats: Dict[str, Dict[str, float]], standard
         'min': '最小値',
         'std': '標準偏差'
     }
+    # 統計項目に対応する標準モデル側のキー
+    standard_key_mapping = {
+        'mean': 'mean',
+        'max': 'max',
+        'min': 'min',
+        'std': 'std_dev'
+    }
+    
+    # 判定対象（両方の値があり標準偏差が正の項目）を表示順に集め、統計的判定はまとめて計算する
+    judge_inputs = []
+    for user_indicator, user_data in user_stats.items():
+        standard_indicator = indicator_mapping.get(user_indicator)
+        if not standard_indicator:
+            continue
+        standard_data = standard_model.get(standard_indicator, {})
+        standard_std_dev = standard_data.get('std_dev', 0)
+        for stat_key, standard_key in standard_key_mapping.items():
+            if (user_data.get(stat_key) is not None and standard_data.get(standard_key) is not None
+                    and standard_std_dev > 0):
+                judge_inputs.append((user_data[stat_key], standard_data[standard_key], standard_std_dev))
+    
+    user_values, model_means, model_std_devs = np.array(judge_inputs, dtype=np.float64).reshape(-1, 3).T.copy()
+    judgments = iter(judge_deviation_significance_batch(user_values, model_means, model_std_devs))
     
     for user_indicator, user_data in user_stats.items():
         # 対応する標準モデルの指標名を取得
@@ -2204,15 +3173,7 @@ def display_comparison_results(user_stats: Dict[str, Dict[str, float]], standard
             user_value = user_data.get(stat_key)
             
             # 標準モデルでの対応するキーを探す
-            standard_value = None
-            if stat_key == 'mean':
-                standard_value = standard_data.get('mean')
-            elif stat_key == 'max':
-                standard_value = standard_data.get('max')
-            elif stat_key == 'min':
-                standard_value = standard_data.get('min')
-            elif stat_key == 'std':
-                standard_value = standard_data.get('std_dev')
+            standard_value = standard_data.get(standard_key_mapping[stat_key])
             
             # 値が存在する場合のみ表示
             if user_value is not None:
@@ -2221,10 +3182,10 @@ def display_comparison_results(user_stats: Dict[str, Dict[str, float]], standard
                     diff = user_value - standard_value
                     diff_str = f"{diff:+.1f}°" if diff >= 0 else f"{diff:.1f}°"
                     
-                    # 統計的判定を実行（標準偏差が必要）
+                    # 統計的判定の結果を取り出す（標準偏差が必要）
                     standard_std_dev = standard_data.get('std_dev', 0)
                     if standard_std_dev > 0:
-                        judgment = judge_deviation_significance(user_value, standard_value, standard_std_dev)
+                        judgment = next(judgments)
                         judgment_color = "🔴" if judgment == "課題あり" else "🟢"
                         judgment_display = f"{judgment_color}[{judgment}]"
                     else:
@@ -2248,7 +3209,7 @@ def display_comparison_results(user_stats: Dict[str, Dict[str, float]], standard
 
 def compare_with_standard_model(user_stats: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
     """
-    ユーザー統計値を標準モデルと比較し、結果を辞書で返す
+    ユーザー統計値を標準モデルと比較し、結果をコンソールに表示して辞書で返す
     
     Args:
         user_stats: ユーザーの統計値辞書
@@ -2263,6 +3224,24 @@ def compare_with_standard_model(user_stats: Dict[str, Dict[str, float]]) -> Dict
         # コンソールに比較結果を表示
         display_comparison_results(user_stats, standard_model)
         
+    except Exception as e:
+        log.exception("❌ 比較処理エラー: %s", e)
+        return {'status': 'error', 'message': str(e)}
+    
+    return compute_comparison(user_stats, standard_model)
+
+def compute_comparison(user_stats: Dict[str, Dict[str, float]], standard_model: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ユーザー統計値を標準モデルと比較し、結果を辞書で返す（コンソール表示なし）
+    
+    Args:
+        user_stats: ユーザーの統計値辞書
+        standard_model: 標準動作モデルの辞書 (get_standard_model_data の結果)
+        
+    Returns:
+        比較結果の辞書
+    """
+    try:
         # 指標名のマッピング（新しい角度は比較対象外）
         indicator_mapping = {
             'trunk_angle': '体幹角度',
@@ -2274,6 +3253,11 @@ def compare_with_standard_model(user_stats: Dict[str, Dict[str, float]]) -> Dict
         
         comparison_results = {}
         
+        # 比較対象の (指標, 統計項目, ユーザー値, 標準値, 標準偏差) を集め、判定はまとめて計算する
+        stat_keys = ['mean', 'max', 'min']
+        standard_keys = ['mean', 'max', 'min']
+        compared_items = []
+        
         for user_indicator, user_data in user_stats.items():
             standard_indicator = indicator_mapping.get(user_indicator)
             if not standard_indicator:
@@ -2282,40 +3266,40 @@ def compare_with_standard_model(user_stats: Dict[str, Dict[str, float]]) -> Dict
             standard_data = standard_model.get(standard_indicator, {})
             
             # 比較結果を辞書形式で保存
-            indicator_comparison = {
+            comparison_results[standard_indicator] = {
                 'user_data': user_data,
                 'standard_data': standard_data,
                 'differences': {}
             }
             
-            # 各統計値の差分を計算
-            stat_keys = ['mean', 'max', 'min']
-            standard_keys = ['mean', 'max', 'min']
-            
             for i, stat_key in enumerate(stat_keys):
                 user_value = user_data.get(stat_key)
                 standard_value = standard_data.get(standard_keys[i])
                 
                 if user_value is not None and standard_value is not None:
-                    diff = user_value - standard_value
-                    
-                    # 統計的判定を実行
+                    # 標準偏差が0以下の場合は判定不可（カーネルでは0として扱う）
                     standard_std_dev = standard_data.get('std_dev', 0)
-                    if standard_std_dev > 0:
-                        judgment = judge_deviation_significance(user_value, standard_value, standard_std_dev)
-                    else:
-                        judgment = "判定不可"
-                    
-                    indicator_comparison['differences'][stat_key] = {
-                        'user_value': user_value,
-                        'standard_value': standard_value,
-                        'difference': diff,
-                        'percentage_diff': (diff / standard_value) * 100 if standard_value != 0 else None,
-                        'statistical_judgment': judgment,
-                        'needs_improvement': judgment == "課題あり"
-                    }
-            
-            comparison_results[standard_indicator] = indicator_comparison
+                    compared_items.append((standard_indicator, stat_key, user_value, standard_value,
+                                           standard_std_dev if standard_std_dev > 0 else 0.0))
+        
+        # 統計的判定を実行
+        judgments = judge_deviation_significance_batch(
+            np.array([item[2] for item in compared_items], dtype=np.float64),
+            np.array([item[3] for item in compared_items], dtype=np.float64),
+            np.array([item[4] for item in compared_items], dtype=np.float64)
+        )
+        
+        # 各統計値の差分を計算
+        for (standard_indicator, stat_key, user_value, standard_value, _), judgment in zip(compared_items, judgments):
+            diff = user_value - standard_value
+            comparison_results[standard_indicator]['differences'][stat_key] = {
+                'user_value': user_value,
+                'standard_value': standard_value,
+                'difference': diff,
+                'percentage_diff': (diff / standard_value) * 100 if standard_value != 0 else None,
+                'statistical_judgment': judgment,
+                'needs_improvement': judgment == "課題あり"
+            }
         
         return {
             'status': 'success',
@@ -2327,7 +3311,7 @@ def compare_with_standard_model(user_stats: Dict[str, Dict[str, float]]) -> Dict
         }
         
     except Exception as e:
-        print(f"❌ 比較処理エラー: {str(e)}")
+        log.exception("❌ 比較処理エラー: %s", e)
         return {'status': 'error', 'message': str(e)}
 
 def judge_deviation_significance(user_value: float, model_mean: float, model_std_dev: float) -> str:
@@ -2342,31 +3326,83 @@ def judge_deviation_significance(user_value: float, model_mean: float, model_std
     Returns:
         判定結果（"課題あり" または "OK"）
     """
-    try:
-        # ゼロ除算を避ける
-        if model_mean == 0 or model_std_dev == 0:
-            return "判定不可"
-        
-        # 変動係数 (CV) を計算
-        cv = abs(model_std_dev / model_mean)
-        
-        # Offset値を1.5と設定し、閾値を計算
-        offset = 1.5
-        threshold = offset / cv if cv != 0 else float('inf')
-        
-        # 重み付け変動度を計算
-        raw_deviation = abs(model_mean - user_value) / model_std_dev
-        weighted_deviation = raw_deviation / cv if cv != 0 else 0
-        
-        # 判定
-        if weighted_deviation > threshold:
-            return "課題あり"
-        else:
-            return "OK"
-            
-    except Exception as e:
-        print(f"⚠️ 統計判定エラー: {str(e)}")
-        return "判定エラー"
+    # ゼロ除算を避ける
+    if model_mean == 0 or model_std_dev == 0:
+        return "判定不可"
+    
+    # 変動係数 (CV) を計算
+    cv = abs(model_std_dev / model_mean)
+    
+    # Offset値を1.5と設定し、閾値を計算
+    offset = 1.5
+    threshold = offset / cv if cv != 0 else float('inf')
+    
+    # 重み付け変動度を計算
+    raw_deviation = abs(model_mean - user_value) / model_std_dev
+    weighted_deviation = raw_deviation / cv if cv != 0 else 0
+    
+    # 判定
+    if weighted_deviation > threshold:
+        return "課題あり"
+    else:
+        return "OK"
+
+# 統計的判定のOffset値
+JUDGMENT_OFFSET = 1.5
+
+@njit(cache=True, nogil=True)
+def _compute_weighted_deviation(user_vals, mean, std, offset):
+    """
+    重み付け変動度と閾値をまとめて計算するカーネル
+    平均値または標準偏差が0の項目は判定不可としてNaNを返す
+    （nogil: スレッドプール上の同時リクエストがGILを待たずに並行して実行できる）
+    """
+    n = user_vals.shape[0]
+    weighted = np.empty(n, dtype=np.float64)
+    threshold = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if mean[i] == 0 or std[i] == 0:
+            weighted[i] = np.nan
+            threshold[i] = np.nan
+            continue
+        # 変動係数 (CV)
+        cv = abs(std[i] / mean[i])
+        threshold[i] = offset / cv
+        weighted[i] = abs(mean[i] - user_vals[i]) / std[i] / cv
+    return weighted, threshold
+
+def _compute_weighted_deviation_aot(user_vals, mean, std, offset):
+    """AOT版の weighted_deviation を呼ぶアダプタ（シグネチャが float64 の1次元配列で固定されているため変換して渡す）"""
+    return running_kernels.weighted_deviation(
+        np.ascontiguousarray(user_vals, dtype=np.float64),
+        np.ascontiguousarray(mean, dtype=np.float64),
+        np.ascontiguousarray(std, dtype=np.float64),
+        float(offset)
+    )
+
+# AOTコンパイル済みの版があればそれを使う（戻り値は同じ）
+compute_weighted_deviation = _compute_weighted_deviation_aot if AOT_KERNELS_AVAILABLE else _compute_weighted_deviation
+
+def judge_deviation_significance_batch(user_values: np.ndarray, model_means: np.ndarray,
+                                       model_std_devs: np.ndarray) -> List[str]:
+    """
+    judge_deviation_significance の配列版（複数の計測値をまとめて判定する）
+    
+    Args:
+        user_values: ユーザーの計測値
+        model_means: 標準モデルの平均値
+        model_std_devs: 標準モデルの標準偏差
+    
+    Returns:
+        判定結果（"課題あり" / "OK" / "判定不可"）のリスト
+    """
+    if len(user_values) == 0:
+        return []
+    
+    weighted, threshold = compute_weighted_deviation(user_values, model_means, model_std_devs, JUDGMENT_OFFSET)
+    judgments = np.where(weighted > threshold, "課題あり", "OK").astype(object)
+    judgments[np.isnan(weighted)] = "判定不可"
+    return judgments.tolist()
 
 def create_sample_user_stats() -> Dict[str, Dict[str, float]]:
     """
@@ -2427,43 +3463,141 @@ def test_comparison_display():
     
     print("\n✅ 比較機能テスト完了！")
 
+# 統計的判定のテストケース（ユーザー値・標準平均・標準偏差は判定用に配列化しておく）
+_JUDGMENT_TEST_CASES = [
+    {"user": 12.1, "mean": 4.3, "std": 1.2, "expected": "課題あり", "case": "大きな差分"},
+    {"user": 4.5, "mean": 4.3, "std": 1.2, "expected": "OK", "case": "小さな差分"},
+    {"user": 2.0, "mean": 4.3, "std": 1.2, "expected": "課題あり", "case": "負の大きな差分"},
+    {"user": 10.5, "mean": -13.2, "std": 10.8, "expected": "課題あり", "case": "負の標準値との比較"},
+    {"user": 0, "mean": 0, "std": 1.0, "expected": "判定不可", "case": "ゼロ平均値"}
+]
+_JUDGMENT_TEST_USER = np.array([case["user"] for case in _JUDGMENT_TEST_CASES], dtype=np.float64)
+_JUDGMENT_TEST_MEAN = np.array([case["mean"] for case in _JUDGMENT_TEST_CASES], dtype=np.float64)
+_JUDGMENT_TEST_STD = np.array([case["std"] for case in _JUDGMENT_TEST_CASES], dtype=np.float64)
+
 def test_statistical_judgment():
     """
     統計的判定機能の単体テスト
     """
     print("\n🧪 統計的判定機能テスト開始...")
     
-    test_cases = [
-        {"user": 12.1, "mean": 4.3, "std": 1.2, "expected": "課題あり", "case": "大きな差分"},
-        {"user": 4.5, "mean": 4.3, "std": 1.2, "expected": "OK", "case": "小さな差分"},
-        {"user": 2.0, "mean": 4.3, "std": 1.2, "expected": "課題あり", "case": "負の大きな差分"},
-        {"user": 10.5, "mean": -13.2, "std": 10.8, "expected": "課題あり", "case": "負の標準値との比較"},
-        {"user": 0, "mean": 0, "std": 1.0, "expected": "判定不可", "case": "ゼロ平均値"}
-    ]
+    # 全テストケースの判定と計算過程をまとめて求める
+    results = judge_deviation_significance_batch(_JUDGMENT_TEST_USER, _JUDGMENT_TEST_MEAN, _JUDGMENT_TEST_STD)
+    weighted, threshold = compute_weighted_deviation(_JUDGMENT_TEST_USER, _JUDGMENT_TEST_MEAN,
+                                                      _JUDGMENT_TEST_STD, JUDGMENT_OFFSET)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.abs(_JUDGMENT_TEST_STD / _JUDGMENT_TEST_MEAN)
     
     print("テストケース実行:")
-    for i, case in enumerate(test_cases, 1):
-        result = judge_deviation_significance(case["user"], case["mean"], case["std"])
+    for i, case in enumerate(_JUDGMENT_TEST_CASES):
+        result = results[i]
         status = "✅ PASS" if result == case["expected"] else f"❌ FAIL (期待: {case['expected']}, 実際: {result})"
         
+        print(f"  {i + 1}. {case['case']}: {status}")
+        print(f"      ユーザー値: {case['user']}, 標準平均: {case['mean']}, 標準偏差: {case['std']}")
         # 計算過程も表示
-        if case["mean"] != 0 and case["std"] != 0:
-            cv = abs(case["std"] / case["mean"])
-            threshold = 1.5 / cv if cv != 0 else float('inf')
-            raw_deviation = abs(case["mean"] - case["user"]) / case["std"]
-            weighted_deviation = raw_deviation / cv if cv != 0 else 0
-            
-            print(f"  {i}. {case['case']}: {status}")
-            print(f"      ユーザー値: {case['user']}, 標準平均: {case['mean']}, 標準偏差: {case['std']}")
-            print(f"      CV: {cv:.3f}, 閾値: {threshold:.3f}, 重み付け変動度: {weighted_deviation:.3f}")
-        else:
-            print(f"  {i}. {case['case']}: {status}")
-            print(f"      ユーザー値: {case['user']}, 標準平均: {case['mean']}, 標準偏差: {case['std']}")
+        if not np.isnan(weighted[i]):
+            print(f"      CV: {cv[i]:.3f}, 閾値: {threshold[i]:.3f}, 重み付け変動度: {weighted[i]:.3f}")
     
     print("\n✅ 統計的判定機能テスト完了！")
 
-@app.post("/test_advanced_foot_strikes")
-async def test_advanced_foot_strikes(request: dict):
+# =============================================================================
+# テストエンドポイント用の疑似キーポイント
+# 入力（フレーム数）が同じなら結果も同じなので一度だけ生成し、読み取り専用の配列として使い回す
+# （テストエンドポイントはCPU処理のみなので同期（def）で定義し、スレッドプール上で実行してイベントループを塞がない）
+# =============================================================================
+
+def _round_angle_dict(angles: Dict[str, Any], ndigits: int = 1) -> Dict[str, Any]:
+    """角度の辞書の数値をまとめて丸める（None や計算モード名などの値はそのまま残す）"""
+    numeric_keys = [key for key, value in angles.items() if isinstance(value, (int, float))]
+    values = np.fromiter((angles[key] for key in numeric_keys), dtype=np.float64, count=len(numeric_keys))
+    rounded = dict(angles)
+    rounded.update(zip(numeric_keys, np.round(values, ndigits).tolist()))
+    return rounded
+
+def _sample_angles(frame_angles: Dict[str, Any]) -> Dict[str, Any]:
+    """1フレーム分の結果から計算できた角度だけを取り出す（フレーム番号・計算モードは除く）"""
+    return {
+        key: value for key, value in frame_angles.items()
+        if key not in ('frame_index', 'calculation_mode') and isinstance(value, (int, float))
+    }
+
+def _freeze_soa(xs: np.ndarray, ys: np.ndarray, vis: np.ndarray) -> tuple:
+    """キャッシュして共有するSoA配列を読み取り専用にする"""
+    for array in (xs, ys, vis):
+        array.setflags(write=False)
+    return xs, ys, vis
+
+@functools.lru_cache(maxsize=1)
+def _foot_strike_test_soa() -> tuple:
+    """test_advanced_foot_strikes 用: 50フレーム（3秒動画想定）の足首上下動"""
+    n_frames = 50
+    frame_idx = np.arange(n_frames, dtype=np.float64)
+    xs = np.full((n_frames, NUM_LANDMARKS), 0.5, dtype=np.float32)  # 固定
+    ys = np.full((n_frames, NUM_LANDMARKS), 0.5, dtype=np.float32)  # その他のキーポイント
+    vis = np.full((n_frames, NUM_LANDMARKS), 0.9, dtype=np.float32)  # 高い可視性
+    # 左右共通の高調波成分は一度だけ計算する
+    ankle_base = 0.8 + 0.05 * np.sin(frame_idx * 0.8)
+    # 左足首: 周期的な上下動（接地時に低い値）
+    ys[:, LEFT_ANKLE] = ankle_base + 0.1 * np.sin(frame_idx * 0.4)
+    # 右足首: 左足と位相差のある周期的上下動
+    ys[:, RIGHT_ANKLE] = ankle_base + 0.1 * np.sin(frame_idx * 0.4 + math.pi * 0.6)
+    return _freeze_soa(xs, ys, vis)
+
+# テスト用合成データのフレーム数上限（frame_count はクライアント入力かつキャッシュのキーになるため範囲を制限する）
+MAX_TEST_FRAME_COUNT = 100
+
+def validate_test_frame_count(frame_count: Any) -> int:
+    """テストエンドポイントの frame_count を検証する（1〜MAX_TEST_FRAME_COUNT の整数以外は400）"""
+    if isinstance(frame_count, bool) or not isinstance(frame_count, int) or not 1 <= frame_count <= MAX_TEST_FRAME_COUNT:
+        raise HTTPException(status_code=400, detail=f"frame_count は1-{MAX_TEST_FRAME_COUNT}の整数で指定してください")
+    return frame_count
+
+@functools.lru_cache(maxsize=8)
+def _relative_angles_test_soa(n_frames: int) -> tuple:
+    """test_relative_angles 用: 基本的な人体ポーズ（膝のみフレームごとに上下動）"""
+    # 右膝は逆位相（sin(x + π) = -sin(x)）なので、同じ正弦波を符号反転して使う
+    knee_offset = 0.1 * np.sin(np.arange(n_frames, dtype=np.float64) * 0.3)
+    return _freeze_soa(*synthesize_keypoints_soa(n_frames, {
+        LEFT_SHOULDER: (0.4, 0.3, 0.9),       # 左肩
+        RIGHT_SHOULDER: (0.6, 0.3, 0.9),      # 右肩
+        LEFT_HIP: (0.45, 0.6, 0.9),           # 左股関節
+        RIGHT_HIP: (0.55, 0.6, 0.9),          # 右股関節
+        LEFT_KNEE: (0.4, 0.8 + knee_offset, 0.9),   # 左膝（動的変化）
+        RIGHT_KNEE: (0.6, 0.8 - knee_offset, 0.9),  # 右膝（動的変化）
+        LEFT_ANKLE: (0.4, 0.95, 0.9),         # 左足首
+        RIGHT_ANKLE: (0.6, 0.95, 0.9),        # 右足首
+        LEFT_FOOT_INDEX: (0.39, 0.98, 0.9),   # 左つま先
+        RIGHT_FOOT_INDEX: (0.61, 0.98, 0.9),  # 右つま先
+        LEFT_ELBOW: (0.35, 0.45, 0.9),        # 左肘
+        RIGHT_ELBOW: (0.65, 0.45, 0.9),       # 右肘
+        LEFT_WRIST: (0.32, 0.6, 0.9),         # 左手首
+        RIGHT_WRIST: (0.68, 0.6, 0.9),        # 右手首
+    }))
+
+@functools.lru_cache(maxsize=8)
+def _enhanced_absolute_test_soa(n_frames: int) -> tuple:
+    """test_enhanced_absolute_angles 用: さまざまなポーズ（フレームごとに線形に変化）"""
+    pose_variation = np.arange(n_frames, dtype=np.float64) * 0.1
+    return _freeze_soa(*synthesize_keypoints_soa(n_frames, {
+        LEFT_SHOULDER: (0.40 + pose_variation * 0.05, 0.25, 0.95),   # 左肩（体幹の左上）
+        RIGHT_SHOULDER: (0.60 - pose_variation * 0.05, 0.25, 0.95),  # 右肩（体幹の右上）
+        LEFT_HIP: (0.42 + pose_variation * 0.03, 0.55, 0.95),        # 左股関節（体幹の左下）
+        RIGHT_HIP: (0.58 - pose_variation * 0.03, 0.55, 0.95),       # 右股関節（体幹の右下）
+        LEFT_ELBOW: (0.30 + pose_variation * 0.1, 0.40 + pose_variation * 0.05, 0.90),      # 左肘（動的変化）
+        RIGHT_ELBOW: (0.70 - pose_variation * 0.1, 0.40 + pose_variation * 0.05, 0.90),     # 右肘（動的変化）
+        LEFT_WRIST: (0.25 + pose_variation * 0.15, 0.50 + pose_variation * 0.1, 0.85),      # 左手首（動的変化）
+        RIGHT_WRIST: (0.75 - pose_variation * 0.15, 0.50 + pose_variation * 0.1, 0.85),     # 右手首（動的変化）
+        LEFT_KNEE: (0.40 + pose_variation * 0.08, 0.75 + pose_variation * 0.03, 0.95),      # 左膝（動的変化）
+        RIGHT_KNEE: (0.60 - pose_variation * 0.08, 0.75 + pose_variation * 0.03, 0.95),     # 右膝（動的変化）
+        LEFT_ANKLE: (0.38 + pose_variation * 0.05, 0.92, 0.95),      # 左足首
+        RIGHT_ANKLE: (0.62 - pose_variation * 0.05, 0.92, 0.95),     # 右足首
+        LEFT_FOOT_INDEX: (0.35 + pose_variation * 0.08, 0.95 + pose_variation * 0.02, 0.90),   # 左つま先（動的変化）
+        RIGHT_FOOT_INDEX: (0.65 - pose_variation * 0.08, 0.95 + pose_variation * 0.02, 0.90),  # 右つま先（動的変化）
+    }))
+
+@app.post("/test_advanced_foot_strikes", dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_advanced_foot_strikes(request: dict):
     """
     高精度フットストライク検出機能をテストする
     """
@@ -2482,44 +3616,28 @@ async def test_advanced_foot_strikes(request: dict):
         
         print(f"📝 テスト対象動画ID: {video_id}")
         
-        # ダミーテストデータを生成（実際の実装では既存のキーポイントデータを使用）
-        # ここでは高精度検出機能の動作確認のためのテストデータを作成
-        
-        # 50フレームの疑似キーポイントデータ（3秒動画想定）
-        test_keypoints = []
-        for frame_idx in range(50):
-            frame_keypoints = []
-            
-            # 33個のキーポイントを生成
-            for kp_idx in range(33):
-                if kp_idx == LANDMARK_INDICES['left_ankle']:
-                    # 左足首: 周期的な上下動（接地時に低い値）
-                    y_val = 0.8 + 0.1 * math.sin(frame_idx * 0.4) + 0.05 * math.sin(frame_idx * 0.8)
-                elif kp_idx == LANDMARK_INDICES['right_ankle']:
-                    # 右足首: 左足と位相差のある周期的上下動
-                    y_val = 0.8 + 0.1 * math.sin(frame_idx * 0.4 + math.pi * 0.6) + 0.05 * math.sin(frame_idx * 0.8)
-                else:
-                    # その他のキーポイント
-                    y_val = 0.5
-                
-                keypoint = KeyPoint(
-                    x=0.5,  # 固定
-                    y=y_val,
-                    z=0.0,  # 固定
-                    visibility=0.9  # 高い可視性
-                )
-                frame_keypoints.append(keypoint)
-            
-            test_keypoints.append(frame_keypoints)
+        # ダミーテストデータ（実際の実装では既存のキーポイントデータを使用）
+        # ここでは高精度検出機能の動作確認のためのテストデータを使う
+        test_soa = _foot_strike_test_soa()
+        n_frames = len(test_soa[0])
         
-        print(f"✅ テストデータ生成完了: {len(test_keypoints)}フレーム")
+        print(f"✅ テストデータ生成完了: {n_frames}フレーム")
         
         # 高精度フットストライク検出を実行
-        detected_strikes = detect_foot_strikes_advanced(test_keypoints, test_fps)
+        detected_strikes = detect_foot_strikes_advanced(None, test_fps, test_soa)
         
         # 従来の検出方法との比較
-        left_strikes_old = find_foot_strikes(test_keypoints, 'left')
-        right_strikes_old = find_foot_strikes(test_keypoints, 'right')
+        left_strikes_old = find_foot_strikes(None, 'left', test_soa)
+        right_strikes_old = find_foot_strikes(None, 'right', test_soa)
+        
+        # 検出結果の詳細と左右の歩数を1回の走査でまとめて作る
+        strikes_detail = []
+        left_count = 0
+        for frame, foot in detected_strikes:
+            strikes_detail.append({"frame": int(frame), "foot": foot})
+            if foot == 'left':
+                left_count += 1
+        right_count = len(detected_strikes) - left_count
         
         # 結果を整理
         result = {
@@ -2527,15 +3645,15 @@ async def test_advanced_foot_strikes(request: dict):
             "message": "高精度フットストライク検出テスト完了",
             "test_data": {
                 "video_id": video_id,
-                "total_frames": len(test_keypoints),
+                "total_frames": n_frames,
                 "fps": test_fps,
-                "duration_seconds": len(test_keypoints) / test_fps
+                "duration_seconds": n_frames / test_fps
             },
             "advanced_detection": {
                 "total_strikes": len(detected_strikes),
-                "strikes_detail": [{"frame": int(frame), "foot": foot} for frame, foot in detected_strikes],
-                "left_count": sum(1 for _, foot in detected_strikes if foot == 'left'),
-                "right_count": sum(1 for _, foot in detected_strikes if foot == 'right')
+                "strikes_detail": strikes_detail,
+                "left_count": left_count,
+                "right_count": right_count
             },
             "traditional_detection": {
                 "left_strikes": [int(x) for x in left_strikes_old],
@@ -2550,7 +3668,7 @@ async def test_advanced_foot_strikes(request: dict):
         }
         
         if detected_strikes:
-            duration = len(test_keypoints) / test_fps
+            duration = n_frames / test_fps
             spm_estimated = (len(detected_strikes) * 60) / duration
             result["advanced_detection"]["estimated_spm"] = round(spm_estimated, 1)
         
@@ -2560,16 +3678,14 @@ async def test_advanced_foot_strikes(request: dict):
         return result
         
     except Exception as e:
-        print(f"❌ 高精度フットストライクテストエラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ 高精度フットストライクテストエラー: %s", e)
         return {
             "status": "error",
             "message": f"テスト実行エラー: {str(e)}"
         }
 
-@app.post("/test_relative_angles")
-async def test_relative_angles(request: dict):
+@app.post("/test_relative_angles", dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_relative_angles(request: dict):
     """
     新しい相対関節角度計算機能をテストする
     """
@@ -2578,99 +3694,41 @@ async def test_relative_angles(request: dict):
         
         # リクエストから必要データを取得
         calculation_mode = request.get('mode', 'relative')
-        test_frame_count = request.get('frame_count', 10)
+        test_frame_count = validate_test_frame_count(request.get('frame_count', 10))
         
         print(f"📝 テスト設定: モード={calculation_mode}, フレーム数={test_frame_count}")
         
-        # ダミーテストデータを生成
-        test_keypoints = []
-        for frame_idx in range(test_frame_count):
-            frame_keypoints = []
-            
-            # 33個のキーポイントを生成（基本的な人体ポーズ）
-            for kp_idx in range(33):
-                if kp_idx == LANDMARK_INDICES['left_shoulder']:
-                    # 左肩
-                    keypoint = KeyPoint(x=0.4, y=0.3, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_shoulder']:
-                    # 右肩
-                    keypoint = KeyPoint(x=0.6, y=0.3, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_hip']:
-                    # 左股関節
-                    keypoint = KeyPoint(x=0.45, y=0.6, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_hip']:
-                    # 右股関節
-                    keypoint = KeyPoint(x=0.55, y=0.6, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_knee']:
-                    # 左膝（動的変化）
-                    y_offset = 0.1 * math.sin(frame_idx * 0.3)
-                    keypoint = KeyPoint(x=0.4, y=0.8 + y_offset, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_knee']:
-                    # 右膝（動的変化）
-                    y_offset = 0.1 * math.sin(frame_idx * 0.3 + math.pi)
-                    keypoint = KeyPoint(x=0.6, y=0.8 + y_offset, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_ankle']:
-                    # 左足首
-                    keypoint = KeyPoint(x=0.4, y=0.95, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_ankle']:
-                    # 右足首
-                    keypoint = KeyPoint(x=0.6, y=0.95, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_foot_index']:
-                    # 左つま先
-                    keypoint = KeyPoint(x=0.39, y=0.98, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_foot_index']:
-                    # 右つま先
-                    keypoint = KeyPoint(x=0.61, y=0.98, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_elbow']:
-                    # 左肘
-                    keypoint = KeyPoint(x=0.35, y=0.45, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_elbow']:
-                    # 右肘
-                    keypoint = KeyPoint(x=0.65, y=0.45, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['left_wrist']:
-                    # 左手首
-                    keypoint = KeyPoint(x=0.32, y=0.6, z=0.0, visibility=0.9)
-                elif kp_idx == LANDMARK_INDICES['right_wrist']:
-                    # 右手首
-                    keypoint = KeyPoint(x=0.68, y=0.6, z=0.0, visibility=0.9)
-                else:
-                    # その他のキーポイント
-                    keypoint = KeyPoint(x=0.5, y=0.5, z=0.0, visibility=0.5)
-                
-                frame_keypoints.append(keypoint)
-            
-            test_keypoints.append(frame_keypoints)
+        # ダミーテストデータ（基本的な人体ポーズ、膝のみフレームごとに上下動）
+        test_xs, test_ys, test_vis = _relative_angles_test_soa(test_frame_count)
         
-        print(f"✅ テストデータ生成完了: {len(test_keypoints)}フレーム")
+        print(f"✅ テストデータ生成完了: {test_frame_count}フレーム")
         
         # 角度計算器を作成
         calculator = AngleCalculator(mode=calculation_mode)
         
-        # 各フレームで角度を計算
+        # 全フレームの角度をまとめて計算し、レスポンスに載せるフレームだけ辞書にする
+        batch_angles = calculator.calculate_all_angles_soa(test_xs, test_ys, test_vis)
         results = []
-        for frame_idx, frame_keypoints in enumerate(test_keypoints):
-            frame_angles = calculator.calculate_all_angles(frame_keypoints)
+        for frame_idx in range(min(test_frame_count, 3)):  # 最初の3フレームのみ
+            frame_angles = frame_angles_from_batch(batch_angles, frame_idx)
             frame_angles['frame_index'] = frame_idx
             results.append(frame_angles)
         
         # 結果を整理
         summary = {
             "calculation_mode": calculation_mode,
-            "total_frames": len(results),
+            "total_frames": test_frame_count,
             "sample_angles": {}
         }
         
         if results:
-            first_frame = results[0]
-            for key, value in first_frame.items():
-                if key != 'frame_index' and key != 'calculation_mode' and value is not None and isinstance(value, (int, float)):
-                    summary["sample_angles"][key] = round(value, 1)
+            summary["sample_angles"] = _round_angle_dict(_sample_angles(results[0]))
         
         result = {
             "status": "success",
             "message": f"相対関節角度計算テスト完了 (モード: {calculation_mode})",
             "summary": summary,
-            "detailed_results": results[:3] if len(results) >= 3 else results,  # 最初の3フレームのみ
+            "detailed_results": results,
             "angle_definitions": {
                 "absolute_mode": {
                     "trunk_angle": "体幹ベクトルと鉛直軸の角度",
@@ -2682,88 +3740,71 @@ async def test_relative_angles(request: dict):
                     "hip_joint_angle": "大腿と体幹のはさみ角（肩中点-股関節-膝）",
                     "knee_joint_angle": "大腿と下腿のはさみ角（股関節-膝-足首）",
                     "ankle_joint_angle": "下腿と足部のはさみ角（膝-足首-つま先）",
+                    "shoulder_joint_angle": "体幹と上腕のはさみ角（股関節-肩-肘）",
                     "elbow_joint_angle": "上腕と前腕のはさみ角（肩-肘-手首）"
                 }
             }
         }
         
-        print(f"🎯 テスト完了: {calculation_mode}モードで{len(results)}フレーム処理")
+        print(f"🎯 テスト完了: {calculation_mode}モードで{test_frame_count}フレーム処理")
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ 相対角度計算テストエラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ 相対角度計算テストエラー: %s", e)
         return {
             "status": "error",
             "message": f"テスト実行エラー: {str(e)}"
         }
 
-@app.post("/compare_angle_modes")
-async def compare_angle_modes(request: dict):
+# 角度計算モード比較用の標準的なランニングポーズ（ランドマークindex → (x, y, 可視性)）
+COMPARE_MODES_TEST_POSE: Dict[int, tuple] = {
+    LEFT_SHOULDER: (0.42, 0.25, 0.95),
+    RIGHT_SHOULDER: (0.58, 0.25, 0.95),
+    LEFT_HIP: (0.44, 0.55, 0.95),
+    RIGHT_HIP: (0.56, 0.55, 0.95),
+    LEFT_KNEE: (0.40, 0.75, 0.95),
+    RIGHT_KNEE: (0.62, 0.75, 0.95),
+    LEFT_ANKLE: (0.38, 0.92, 0.95),
+    RIGHT_ANKLE: (0.64, 0.92, 0.95),
+    LEFT_FOOT_INDEX: (0.36, 0.95, 0.90),
+    RIGHT_FOOT_INDEX: (0.66, 0.95, 0.90),
+    LEFT_ELBOW: (0.36, 0.40, 0.90),
+    RIGHT_ELBOW: (0.64, 0.40, 0.90),
+    LEFT_WRIST: (0.34, 0.55, 0.85),
+    RIGHT_WRIST: (0.66, 0.55, 0.85),
+}
+
+@functools.lru_cache(maxsize=1)
+def _compare_modes_test_soa() -> tuple:
+    """compare_angle_modes 用: COMPARE_MODES_TEST_POSE の1フレーム"""
+    return _freeze_soa(*synthesize_keypoints_soa(1, COMPARE_MODES_TEST_POSE))
+
+@app.post("/compare_angle_modes", dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def compare_angle_modes(request: dict):
     """
     絶対角度と相対関節角度の計算結果を比較する
     """
     try:
         print("🔬 角度計算モード比較テストを開始...")
         
-        # テストデータを生成（1フレーム）
-        test_keypoints = []
-        
-        # 標準的なランニングポーズを模擬
-        frame_keypoints = []
-        for kp_idx in range(33):
-            if kp_idx == LANDMARK_INDICES['left_shoulder']:
-                keypoint = KeyPoint(x=0.42, y=0.25, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_shoulder']:
-                keypoint = KeyPoint(x=0.58, y=0.25, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_hip']:
-                keypoint = KeyPoint(x=0.44, y=0.55, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_hip']:
-                keypoint = KeyPoint(x=0.56, y=0.55, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_knee']:
-                keypoint = KeyPoint(x=0.40, y=0.75, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_knee']:
-                keypoint = KeyPoint(x=0.62, y=0.75, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_ankle']:
-                keypoint = KeyPoint(x=0.38, y=0.92, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_ankle']:
-                keypoint = KeyPoint(x=0.64, y=0.92, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_foot_index']:
-                keypoint = KeyPoint(x=0.36, y=0.95, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['right_foot_index']:
-                keypoint = KeyPoint(x=0.66, y=0.95, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['left_elbow']:
-                keypoint = KeyPoint(x=0.36, y=0.40, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['right_elbow']:
-                keypoint = KeyPoint(x=0.64, y=0.40, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['left_wrist']:
-                keypoint = KeyPoint(x=0.34, y=0.55, z=0.0, visibility=0.85)
-            elif kp_idx == LANDMARK_INDICES['right_wrist']:
-                keypoint = KeyPoint(x=0.66, y=0.55, z=0.0, visibility=0.85)
-            else:
-                keypoint = KeyPoint(x=0.5, y=0.5, z=0.0, visibility=0.5)
-            
-            frame_keypoints.append(keypoint)
+        # テストデータ（1フレーム、標準的なランニングポーズを模擬）
+        test_xs, test_ys, test_vis = _compare_modes_test_soa()
         
-        test_keypoints.append(frame_keypoints)
-        
-        # 両モードで角度を計算
-        absolute_calculator = AngleCalculator(mode="absolute")
-        relative_calculator = AngleCalculator(mode="relative")
-        
-        absolute_result = absolute_calculator.calculate_all_angles(frame_keypoints)
-        relative_result = relative_calculator.calculate_all_angles(frame_keypoints)
+        # 両モードの角度を1回の呼び出しで計算（共通の体幹角度は1回だけ計算される）
+        calculator = AngleCalculator()
+        absolute_batch, relative_batch = calculator.calculate_both_modes_soa(test_xs, test_ys, test_vis)
+        absolute_result = frame_angles_from_batch(absolute_batch, 0)
+        relative_result = frame_angles_from_batch(relative_batch, 0)
         
         # 結果を整理
         comparison = {
             "status": "success",
             "message": "角度計算モード比較完了",
-            "absolute_angles": {k: round(v, 1) if v is not None and isinstance(v, (int, float)) else v 
-                             for k, v in absolute_result.items()},
-            "relative_angles": {k: round(v, 1) if v is not None and isinstance(v, (int, float)) else v 
-                              for k, v in relative_result.items()},
+            "absolute_angles": _round_angle_dict(absolute_result),
+            "relative_angles": _round_angle_dict(relative_result),
             "mode_differences": {
                 "absolute_mode": "絶対角度 - 各部位ベクトルと鉛直軸の角度",
                 "relative_mode": "相対角度 - 隣接する身体部位間のはさみ角",
@@ -2779,16 +3820,14 @@ async def compare_angle_modes(request: dict):
         return comparison
         
     except Exception as e:
-        print(f"❌ モード比較テストエラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ モード比較テストエラー: %s", e)
         return {
             "status": "error",
             "message": f"比較テスト実行エラー: {str(e)}"
         }
 
-@app.post("/test_enhanced_absolute_angles")
-async def test_enhanced_absolute_angles(request: dict):
+@app.post("/test_enhanced_absolute_angles", dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_enhanced_absolute_angles(request: dict):
     """
     拡張された絶対角度計算機能をテストする
     新規追加された上腕、前腕、足部角度、および符号規則修正を検証
@@ -2796,89 +3835,29 @@ async def test_enhanced_absolute_angles(request: dict):
     try:
         print("🧪 拡張絶対角度計算テストを開始...")
         
-        test_frame_count = request.get('frame_count', 5)
+        test_frame_count = validate_test_frame_count(request.get('frame_count', 5))
         
         print(f"📝 テスト設定: フレーム数={test_frame_count}")
         
-        # ダミーテストデータを生成（さまざまなポーズ）
-        test_keypoints = []
-        for frame_idx in range(test_frame_count):
-            frame_keypoints = []
-            
-            # 動的なポーズ変化を模擬
-            pose_variation = frame_idx * 0.1
-            
-            # 33個のキーポイントを生成
-            for kp_idx in range(33):
-                if kp_idx == LANDMARK_INDICES['left_shoulder']:
-                    # 左肩（体幹の左上）
-                    keypoint = KeyPoint(x=0.40 + pose_variation * 0.05, y=0.25, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['right_shoulder']:
-                    # 右肩（体幹の右上）
-                    keypoint = KeyPoint(x=0.60 - pose_variation * 0.05, y=0.25, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['left_hip']:
-                    # 左股関節（体幹の左下）
-                    keypoint = KeyPoint(x=0.42 + pose_variation * 0.03, y=0.55, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['right_hip']:
-                    # 右股関節（体幹の右下）
-                    keypoint = KeyPoint(x=0.58 - pose_variation * 0.03, y=0.55, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['left_elbow']:
-                    # 左肘（動的変化）
-                    keypoint = KeyPoint(x=0.30 + pose_variation * 0.1, y=0.40 + pose_variation * 0.05, z=0.0, visibility=0.90)
-                elif kp_idx == LANDMARK_INDICES['right_elbow']:
-                    # 右肘（動的変化）
-                    keypoint = KeyPoint(x=0.70 - pose_variation * 0.1, y=0.40 + pose_variation * 0.05, z=0.0, visibility=0.90)
-                elif kp_idx == LANDMARK_INDICES['left_wrist']:
-                    # 左手首（動的変化）
-                    keypoint = KeyPoint(x=0.25 + pose_variation * 0.15, y=0.50 + pose_variation * 0.1, z=0.0, visibility=0.85)
-                elif kp_idx == LANDMARK_INDICES['right_wrist']:
-                    # 右手首（動的変化）
-                    keypoint = KeyPoint(x=0.75 - pose_variation * 0.15, y=0.50 + pose_variation * 0.1, z=0.0, visibility=0.85)
-                elif kp_idx == LANDMARK_INDICES['left_knee']:
-                    # 左膝（動的変化）
-                    keypoint = KeyPoint(x=0.40 + pose_variation * 0.08, y=0.75 + pose_variation * 0.03, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['right_knee']:
-                    # 右膝（動的変化）
-                    keypoint = KeyPoint(x=0.60 - pose_variation * 0.08, y=0.75 + pose_variation * 0.03, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['left_ankle']:
-                    # 左足首
-                    keypoint = KeyPoint(x=0.38 + pose_variation * 0.05, y=0.92, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['right_ankle']:
-                    # 右足首
-                    keypoint = KeyPoint(x=0.62 - pose_variation * 0.05, y=0.92, z=0.0, visibility=0.95)
-                elif kp_idx == LANDMARK_INDICES['left_foot_index']:
-                    # 左つま先（動的変化）
-                    keypoint = KeyPoint(x=0.35 + pose_variation * 0.08, y=0.95 + pose_variation * 0.02, z=0.0, visibility=0.90)
-                elif kp_idx == LANDMARK_INDICES['right_foot_index']:
-                    # 右つま先（動的変化）
-                    keypoint = KeyPoint(x=0.65 - pose_variation * 0.08, y=0.95 + pose_variation * 0.02, z=0.0, visibility=0.90)
-                else:
-                    # その他のキーポイント
-                    keypoint = KeyPoint(x=0.5, y=0.5, z=0.0, visibility=0.5)
-                
-                frame_keypoints.append(keypoint)
-            
-            test_keypoints.append(frame_keypoints)
+        # ダミーテストデータ（さまざまなポーズ、フレームごとに線形に変化）
+        test_xs, test_ys, test_vis = _enhanced_absolute_test_soa(test_frame_count)
         
-        print(f"✅ テストデータ生成完了: {len(test_keypoints)}フレーム")
+        print(f"✅ テストデータ生成完了: {test_frame_count}フレーム")
         
         # 拡張絶対角度計算器を作成
         calculator = AngleCalculator(mode="absolute")
         
-        # 各フレームで角度を計算
+        # 全フレームの角度をまとめて計算し、レスポンスに載せるフレームだけ辞書にする
+        batch_angles = calculator.calculate_all_angles_soa(test_xs, test_ys, test_vis)
         results = []
-        for frame_idx, frame_keypoints in enumerate(test_keypoints):
-            frame_angles = calculator.calculate_all_angles(frame_keypoints)
+        for frame_idx in range(min(test_frame_count, 2)):  # 最初の2フレームのみ
+            frame_angles = frame_angles_from_batch(batch_angles, frame_idx)
             frame_angles['frame_index'] = frame_idx
             results.append(frame_angles)
         
         # 結果を整理
         if results:
-            first_frame = results[0]
-            sample_angles = {}
-            for key, value in first_frame.items():
-                if key not in ['frame_index', 'calculation_mode'] and value is not None and isinstance(value, (int, float)):
-                    sample_angles[key] = round(value, 1)
+            sample_angles = _round_angle_dict(_sample_angles(results[0]))
         
         # 新規追加角度の数をカウント
         new_angles = [k for k in sample_angles.keys() if 'upper_arm' in k or 'forearm' in k or 'foot' in k]
@@ -2888,12 +3867,12 @@ async def test_enhanced_absolute_angles(request: dict):
             "message": f"拡張絶対角度計算テスト完了",
             "summary": {
                 "calculation_mode": "absolute",
-                "total_frames": len(results),
+                "total_frames": test_frame_count,
                 "total_angles": len(sample_angles),
                 "new_angles_count": len(new_angles),
                 "sample_angles": sample_angles
             },
-            "detailed_results": results[:2] if len(results) >= 2 else results,  # 最初の2フレームのみ
+            "detailed_results": results,
             "new_angle_definitions": {
                 "upper_arm_angle": "上腕ベクトル（肩→肘）と鉛直軸の角度",
                 "forearm_angle": "前腕ベクトル（肘→手首）と鉛直軸の角度", 
@@ -2911,60 +3890,60 @@ async def test_enhanced_absolute_angles(request: dict):
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ 拡張絶対角度計算テストエラー: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ 拡張絶対角度計算テストエラー: %s", e)
         return {
             "status": "error",
             "message": f"テスト実行エラー: {str(e)}"
         }
 
-@app.post("/test_angle_consistency")
-async def test_angle_consistency():
+# 角度一致性テスト用のシンプルな直立ポーズ（ランドマークindex → (x, y, 可視性)）
+ANGLE_CONSISTENCY_TEST_POSE: Dict[int, tuple] = {
+    LEFT_SHOULDER: (0.40, 0.25, 0.95),
+    RIGHT_SHOULDER: (0.60, 0.25, 0.95),
+    LEFT_HIP: (0.42, 0.55, 0.95),
+    RIGHT_HIP: (0.58, 0.55, 0.95),
+    LEFT_ELBOW: (0.30, 0.40, 0.90),
+    RIGHT_ELBOW: (0.70, 0.40, 0.90),
+    LEFT_WRIST: (0.25, 0.50, 0.85),
+    RIGHT_WRIST: (0.75, 0.50, 0.85),
+    LEFT_KNEE: (0.40, 0.75, 0.95),
+    RIGHT_KNEE: (0.60, 0.75, 0.95),
+    LEFT_ANKLE: (0.38, 0.92, 0.95),
+    RIGHT_ANKLE: (0.62, 0.92, 0.95),
+    LEFT_FOOT_INDEX: (0.35, 0.95, 0.90),
+    RIGHT_FOOT_INDEX: (0.65, 0.95, 0.90),
+}
+
+@functools.lru_cache(maxsize=1)
+def _angle_consistency_test_keypoints() -> tuple:
+    """test_angle_consistency 用: ANGLE_CONSISTENCY_TEST_POSE の33点（その他のキーポイントは中央・可視性0.5）"""
+    return tuple(
+        construct_keypoint(x=x, y=y, z=0.0, visibility=visibility)
+        for x, y, visibility in (ANGLE_CONSISTENCY_TEST_POSE.get(kp_idx, (0.5, 0.5, 0.5))
+                                 for kp_idx in range(NUM_LANDMARKS))
+    )
+
+@functools.lru_cache(maxsize=1)
+def _angle_consistency_test_coordinates() -> Dict[str, Dict[str, float]]:
+    """test_angle_consistency のレスポンス用: 主要14点の座標（ランドマーク名 → {'x', 'y'}）"""
+    return {
+        name: {'x': ANGLE_CONSISTENCY_TEST_POSE[idx][0], 'y': ANGLE_CONSISTENCY_TEST_POSE[idx][1]}
+        for name, idx in LANDMARK_INDICES.items()
+    }
+
+@app.post("/test_angle_consistency", dependencies=TEST_ENDPOINT_DEPENDENCIES)
+def test_angle_consistency():
     """
     フロントエンドとバックエンドの角度計算一致性をテストする
     """
     try:
         print("🔍 角度一致性テストを開始...")
         
-        # 固定のテストキーポイント（フロントエンドと比較しやすい値）
-        test_keypoints = []
-        
-        # 33個のキーポイントを生成（シンプルな直立ポーズ）
-        for kp_idx in range(33):
-            if kp_idx == LANDMARK_INDICES['left_shoulder']:
-                keypoint = KeyPoint(x=0.40, y=0.25, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_shoulder']:
-                keypoint = KeyPoint(x=0.60, y=0.25, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_hip']:
-                keypoint = KeyPoint(x=0.42, y=0.55, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_hip']:
-                keypoint = KeyPoint(x=0.58, y=0.55, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_elbow']:
-                keypoint = KeyPoint(x=0.30, y=0.40, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['right_elbow']:
-                keypoint = KeyPoint(x=0.70, y=0.40, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['left_wrist']:
-                keypoint = KeyPoint(x=0.25, y=0.50, z=0.0, visibility=0.85)
-            elif kp_idx == LANDMARK_INDICES['right_wrist']:
-                keypoint = KeyPoint(x=0.75, y=0.50, z=0.0, visibility=0.85)
-            elif kp_idx == LANDMARK_INDICES['left_knee']:
-                keypoint = KeyPoint(x=0.40, y=0.75, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_knee']:
-                keypoint = KeyPoint(x=0.60, y=0.75, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_ankle']:
-                keypoint = KeyPoint(x=0.38, y=0.92, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['right_ankle']:
-                keypoint = KeyPoint(x=0.62, y=0.92, z=0.0, visibility=0.95)
-            elif kp_idx == LANDMARK_INDICES['left_foot_index']:
-                keypoint = KeyPoint(x=0.35, y=0.95, z=0.0, visibility=0.90)
-            elif kp_idx == LANDMARK_INDICES['right_foot_index']:
-                keypoint = KeyPoint(x=0.65, y=0.95, z=0.0, visibility=0.90)
-            else:
-                keypoint = KeyPoint(x=0.5, y=0.5, z=0.0, visibility=0.5)
-            
-            test_keypoints.append(keypoint)
+        # 固定のテストキーポイント（フロントエンドと比較しやすい値、シンプルな直立ポーズの33点）
+        test_keypoints = _angle_consistency_test_keypoints()
         
         # バックエンド計算
         calculator = AngleCalculator(mode="absolute")
@@ -2977,22 +3956,7 @@ async def test_angle_consistency():
                 print(f"  {key}: {value:.2f}°")
         
         # キーポイント座標も返す（フロントエンドとの比較用）
-        keypoint_coordinates = {
-            'left_shoulder': {'x': test_keypoints[LANDMARK_INDICES['left_shoulder']].x, 'y': test_keypoints[LANDMARK_INDICES['left_shoulder']].y},
-            'right_shoulder': {'x': test_keypoints[LANDMARK_INDICES['right_shoulder']].x, 'y': test_keypoints[LANDMARK_INDICES['right_shoulder']].y},
-            'left_hip': {'x': test_keypoints[LANDMARK_INDICES['left_hip']].x, 'y': test_keypoints[LANDMARK_INDICES['left_hip']].y},
-            'right_hip': {'x': test_keypoints[LANDMARK_INDICES['right_hip']].x, 'y': test_keypoints[LANDMARK_INDICES['right_hip']].y},
-            'left_elbow': {'x': test_keypoints[LANDMARK_INDICES['left_elbow']].x, 'y': test_keypoints[LANDMARK_INDICES['left_elbow']].y},
-            'right_elbow': {'x': test_keypoints[LANDMARK_INDICES['right_elbow']].x, 'y': test_keypoints[LANDMARK_INDICES['right_elbow']].y},
-            'left_wrist': {'x': test_keypoints[LANDMARK_INDICES['left_wrist']].x, 'y': test_keypoints[LANDMARK_INDICES['left_wrist']].y},
-            'right_wrist': {'x': test_keypoints[LANDMARK_INDICES['right_wrist']].x, 'y': test_keypoints[LANDMARK_INDICES['right_wrist']].y},
-            'left_knee': {'x': test_keypoints[LANDMARK_INDICES['left_knee']].x, 'y': test_keypoints[LANDMARK_INDICES['left_knee']].y},
-            'right_knee': {'x': test_keypoints[LANDMARK_INDICES['right_knee']].x, 'y': test_keypoints[LANDMARK_INDICES['right_knee']].y},
-            'left_ankle': {'x': test_keypoints[LANDMARK_INDICES['left_ankle']].x, 'y': test_keypoints[LANDMARK_INDICES['left_ankle']].y},
-            'right_ankle': {'x': test_keypoints[LANDMARK_INDICES['right_ankle']].x, 'y': test_keypoints[LANDMARK_INDICES['right_ankle']].y},
-            'left_foot_index': {'x': test_keypoints[LANDMARK_INDICES['left_foot_index']].x, 'y': test_keypoints[LANDMARK_INDICES['left_foot_index']].y},
-            'right_foot_index': {'x': test_keypoints[LANDMARK_INDICES['right_foot_index']].x, 'y': test_keypoints[LANDMARK_INDICES['right_foot_index']].y}
-        }
+        keypoint_coordinates = _angle_consistency_test_coordinates()
         
         return {
             "message": "Angle consistency test completed",
@@ -3001,7 +3965,7 @@ async def test_angle_consistency():
         }
         
     except Exception as e:
-        print(f"❌ 角度一致性テストエラー: {str(e)}")
+        log.exception("❌ 角度一致性テストエラー: %s", e)
         raise HTTPException(status_code=500, detail=f"Consistency test failed: {str(e)}")
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ s-motion_girl_Velocity2.sdファイルから24個の関節点を読み込み、M
 
 import numpy as np
 from typing import List, Dict, Any
+import functools
 import os
 
 # ファイルパス（複数のパスを試す）
@@ -57,38 +58,35 @@ KEYPOINT_INDICES_24 = {
     "Pelvis": 23           # 24個目（骨盤中心 - Z座標が腰レベルのため首ではなく骨盤と判明）
 }
 
-def load_pose_data_from_file() -> List[List[float]]:
+@functools.lru_cache(maxsize=1)
+def load_pose_data_from_file() -> np.ndarray:
     """
     s-motion_girl_Velocity2.sdファイルから座標データを読み込む
+    ファイルは静的なので、読み込み・パースはプロセスごとに1回だけ行い結果を使い回す
     
     Returns:
-        101フレーム分の座標データ（各フレームは72個の値：24点 × 3座標）
+        101フレーム分の座標データ（(フレーム数, 72) の読み取り専用配列：24点 × 3座標）
+        読み込めない場合は (0, 72) の空配列
     """
     try:
-        with open(SD_FILE_PATH, 'r') as f:
-            lines = f.readlines()
+        if SD_FILE_PATH is None:
+            raise FileNotFoundError(SD_FILE_PATH)
         
-        # 最初の行はメタデータ（101,24,0.007300）
-        # 2行目以降が座標データ
-        pose_data = []
-        for line in lines[1:]:  # 最初の行をスキップ
-            line = line.strip()
-            if not line:
-                continue
-            values = [float(x) for x in line.split(',')]
-            if len(values) == 72:  # 24点 × 3座標 = 72
-                pose_data.append(values)
+        # 最初の行はメタデータ（101,24,0.007300）なので読み飛ばし、2行目以降を一度に配列化する
+        pose_data = np.loadtxt(SD_FILE_PATH, delimiter=',', skiprows=1, dtype=np.float64, ndmin=2)
+        if pose_data.shape[1] != 72:  # 24点 × 3座標 = 72
+            raise ValueError(f"1フレームの値の数が72ではありません: {pose_data.shape[1]}")
         
+        pose_data.setflags(write=False)
         print(f"✅ ファイルから{len(pose_data)}フレームのデータを読み込みました")
         return pose_data
     except FileNotFoundError:
         print(f"⚠️ ファイルが見つかりません: {SD_FILE_PATH}")
         print("⚠️ フォールバック: ハードコードされたデータを使用します")
-        # フォールバック: 空のリストを返す（後でエラー処理）
-        return []
     except Exception as e:
         print(f"❌ ファイル読み込みエラー: {str(e)}")
-        return []
+    # フォールバック: 空の配列を返す（後でエラー処理）
+    return np.empty((0, 72), dtype=np.float64)
 
 def get_all_frames_bounds(pose_data: List[List[float]]) -> Dict[str, float]:
     """
@@ -96,22 +94,15 @@ def get_all_frames_bounds(pose_data: List[List[float]]) -> Dict[str, float]:
     人体のアスペクト比を保持するため、各軸を独立に正規化する
     
     Args:
-        pose_data: 全フレームの座標データ
+        pose_data: 全フレームの座標データ（各フレーム72個の値：24点 × 3座標）
     
     Returns:
         最小値・最大値の辞書
     """
-    all_x, all_y, all_z = [], [], []
+    # (フレーム, 24点, xyz) の配列にして、軸ごとの最小・最大を1回のリダクションで求める
+    points = np.asarray(pose_data, dtype=np.float64).reshape(-1, 24, 3)
     
-    for frame_data in pose_data:
-        for i in range(24):  # 24個の関節点
-            idx = i * 3
-            if idx + 2 < len(frame_data):
-                all_x.append(frame_data[idx])
-                all_y.append(frame_data[idx + 1])
-                all_z.append(frame_data[idx + 2])
-    
-    if not all_x:
+    if points.size == 0:
         # デフォルト値
         return {
             'min_x': 0.0, 'max_x': 1.0,
@@ -119,9 +110,8 @@ def get_all_frames_bounds(pose_data: List[List[float]]) -> Dict[str, float]:
             'min_z': 0.0, 'max_z': 1.0
         }
     
-    min_x, max_x = min(all_x), max(all_x)
-    min_y, max_y = min(all_y), max(all_y)
-    min_z, max_z = min(all_z), max(all_z)
+    min_x, min_y, min_z = points.min(axis=(0, 1)).tolist()
+    max_x, max_y, max_z = points.max(axis=(0, 1)).tolist()
     
     # 各軸の範囲を計算
     range_x = max_x - min_x
@@ -152,258 +142,133 @@ def get_all_frames_bounds(pose_data: List[List[float]]) -> Dict[str, float]:
         'center_z': center_z
     }
 
-def convert_to_mediapipe_format(frame_data: List[float], bounds: Dict[str, float], frame_index: int = 0, total_frames: int = 101) -> List[Dict[str, float]]:
+# MediaPipe形式（33点）の各ランドマークに対応する24関節点のインデックス
+# NOSE_SOURCE_INDEX は Body Center と Head Top の中点（鼻の代用）を表す
+NOSE_SOURCE_INDEX = 24
+MEDIAPIPE_SOURCE_INDICES = np.array([
+    NOSE_SOURCE_INDEX, NOSE_SOURCE_INDEX,                          # 0-1: 鼻、（鼻周辺）
+    KEYPOINT_INDICES_24["Ear"],                                    # 2: 左目
+    NOSE_SOURCE_INDEX, NOSE_SOURCE_INDEX,                          # 3-4: （鼻周辺）
+    KEYPOINT_INDICES_24["Ear"],                                    # 5: 右目
+    NOSE_SOURCE_INDEX, NOSE_SOURCE_INDEX, NOSE_SOURCE_INDEX,
+    NOSE_SOURCE_INDEX, NOSE_SOURCE_INDEX,                          # 6-10: （鼻周辺）
+    KEYPOINT_INDICES_24["Left Shoulder"], KEYPOINT_INDICES_24["Right Shoulder"],  # 11-12: 肩
+    KEYPOINT_INDICES_24["Left Elbow"], KEYPOINT_INDICES_24["Right Elbow"],        # 13-14: 肘
+    KEYPOINT_INDICES_24["Left Wrist"], KEYPOINT_INDICES_24["Right Wrist"],        # 15-16: 手首
+    KEYPOINT_INDICES_24["Left Hand"], KEYPOINT_INDICES_24["Right Hand"],
+    KEYPOINT_INDICES_24["Left Hand"], KEYPOINT_INDICES_24["Right Hand"],
+    KEYPOINT_INDICES_24["Left Hand"], KEYPOINT_INDICES_24["Right Hand"],          # 17-22: 手（簡易版）
+    KEYPOINT_INDICES_24["Left Hip"], KEYPOINT_INDICES_24["Right Hip"],            # 23-24: 腰
+    KEYPOINT_INDICES_24["Left Knee"], KEYPOINT_INDICES_24["Right Knee"],          # 25-26: 膝
+    KEYPOINT_INDICES_24["Left Ankle"], KEYPOINT_INDICES_24["Right Ankle"],        # 27-28: 足首
+    KEYPOINT_INDICES_24["Left Heel"], KEYPOINT_INDICES_24["Right Heel"],          # 29-30: かかと
+    KEYPOINT_INDICES_24["Left Toe"], KEYPOINT_INDICES_24["Right Toe"],            # 31-32: つま先
+], dtype=np.int64)
+
+# 高さ方向（元データZ）のオフセット。目は耳の位置から上下にずらす
+MEDIAPIPE_Z_OFFSETS = np.zeros(33, dtype=np.float64)
+MEDIAPIPE_Z_OFFSETS[2] = -0.02
+MEDIAPIPE_Z_OFFSETS[5] = 0.02
+
+# 可視性（鼻・目・体の関節は0.9、鼻周辺の顔は0.5、手は0.7）
+MEDIAPIPE_VISIBILITY = np.full(33, 0.9, dtype=np.float64)
+MEDIAPIPE_VISIBILITY[[1, 3, 4, 6, 7, 8, 9, 10]] = 0.5
+MEDIAPIPE_VISIBILITY[17:23] = 0.7
+
+KEYPOINT_FIELDS = ('x', 'y', 'z', 'visibility')
+
+def convert_to_mediapipe_format_batch(pose_data, bounds: Dict[str, float]) -> np.ndarray:
     """
-    提供された24個の関節点をMediaPipe形式（33個のランドマーク）に変換
+    全フレームの24関節点をまとめてMediaPipe形式（33個のランドマーク）に変換
+    
+    座標系のマッピング（横から見た視点）:
+    - 元データのY軸（時間経過/ランニング方向）→ CanvasのX軸（左から右）
+    - 元データのZ軸（左右方向）→ CanvasのY軸（上から下、反転）
+    - 元データのX軸（前後方向/奥行き）→ 深度として扱う（2D表示では使用しない）
     
     Args:
-        frame_data: 72個の値（24点 × 3座標）
+        pose_data: 全フレームの座標データ（各フレーム72個の値：24点 × 3座標）
         bounds: 全フレームを通した座標の範囲
     
     Returns:
-        33個のMediaPipeランドマーク（x, y, z, visibility）
+        (フレーム数, 33, 4) の float64 配列（列は x, y, z, visibility）
     """
-    # データを24個の点に分割
-    points = []
-    for i in range(24):
-        idx = i * 3
-        if idx + 2 < len(frame_data):
-            points.append({
-                'x': frame_data[idx],
-                'y': frame_data[idx + 1],
-                'z': frame_data[idx + 2]
-            })
-        else:
-            # データが不足している場合はデフォルト値
-            points.append({'x': 0.0, 'y': 0.0, 'z': 0.0})
+    points = np.asarray(pose_data, dtype=np.float64).reshape(-1, 24, 3)
+    n_frames = points.shape[0]
     
     min_x, max_x = bounds['min_x'], bounds['max_x']
     min_y, max_y = bounds['min_y'], bounds['max_y']
     min_z, max_z = bounds['min_z'], bounds['max_z']
     max_range = bounds.get('max_range', max(max_x - min_x, max_y - min_y, max_z - min_z))
     center_x = bounds.get('center_x', (min_x + max_x) / 2)
-    center_y = bounds.get('center_y', (min_y + max_y) / 2)
     center_z = bounds.get('center_z', (min_z + max_z) / 2)
-    
-    # 正規化関数（アスペクト比を保持）
-    # 各軸を独立に正規化し、中央を0.5に配置
-    # Y軸は反転（元データではYが大きいほど下、CanvasではYが小さいほど上）
-    def normalize(value, min_val, max_val, center_val, max_range_val, flip_y=False):
-        if max_range_val == 0:
-            return 0.5
-        # 中央を基準に正規化
-        normalized = 0.5 + (value - center_val) / max_range_val
-        # Y軸を反転（Canvas座標系に合わせる）
-        if flip_y:
-            normalized = 1.0 - normalized
-        # 0.0-1.0の範囲にクランプ
-        return max(0.0, min(1.0, normalized))
-    
-    # MediaPipe形式の33個のランドマークを生成
-    # 座標系のマッピング（横から見た視点）:
-    # - 元データのY軸（時間経過/ランニング方向）→ CanvasのX軸（左から右）
-    # - 元データのZ軸（左右方向）→ CanvasのY軸（上から下、反転）
-    # - 元データのX軸（前後方向/奥行き）→ 深度として扱う（2D表示では使用しない）
-    # 
-    # 注意: データ分析により、Y軸が時間経過（単調増加）を表していることが判明
-    # Y軸の範囲: 0.542-3.565 (範囲: 3.023) → これを横方向の動きとして使用
-    
-    # Y軸の範囲を計算
     y_range = max_y - min_y
     
-    mediapipe_keypoints = []
+    # 鼻（Body Center と Head Top の中点）を25番目の点として追加し、33点分を一度に取り出す
+    nose = (points[:, KEYPOINT_INDICES_24["Body Center"]] + points[:, KEYPOINT_INDICES_24["Head Top"]]) / 2
+    source = np.concatenate((points, nose[:, np.newaxis]), axis=1)[:, MEDIAPIPE_SOURCE_INDICES]
+    
+    keypoints = np.empty((n_frames, 33, 4), dtype=np.float64)
+    # 各チャンネルは出力配列の列ビューに ufunc の out= で順に書き込み、中間配列を作らない
+    canvas_x = keypoints[:, :, 0]
+    canvas_y = keypoints[:, :, 1]
+    depth = keypoints[:, :, 2]
     
-    # 0-10: 顔のランドマーク
-    # 鼻（Body CenterとHead Topの中点、またはNeckを使用）
-    if len(points) > KEYPOINT_INDICES_24["Neck"]:
-        nose_point = points[KEYPOINT_INDICES_24["Neck"]]
+    # Canvas X: 元データのY軸を範囲で正規化（クランプしない）
+    if y_range > 0:
+        np.subtract(source[:, :, 1], min_y, out=canvas_x)
+        np.divide(canvas_x, y_range, out=canvas_x)
     else:
-        nose_x = (points[KEYPOINT_INDICES_24["Body Center"]]['x'] + points[KEYPOINT_INDICES_24["Head Top"]]['x']) / 2
-        nose_y = (points[KEYPOINT_INDICES_24["Body Center"]]['y'] + points[KEYPOINT_INDICES_24["Head Top"]]['y']) / 2
-        nose_z = (points[KEYPOINT_INDICES_24["Body Center"]]['z'] + points[KEYPOINT_INDICES_24["Head Top"]]['z']) / 2
-        nose_point = {'x': nose_x, 'y': nose_y, 'z': nose_z}
-    
-    # 横から見た視点: Y軸（時間経過）→ Canvas X、Z軸（左右）→ Canvas Y（反転）
-    # Y軸をX軸にマッピング（時間経過が横方向の動き）
-    # Y軸の範囲を0.0-1.0に正規化
-    nose_y_normalized = (nose_point['y'] - min_y) / y_range if y_range > 0 else 0.5
-    nose_x = nose_y_normalized  # Y軸（時間経過）→ Canvas X（左から右）
-    # Z軸をY軸にマッピング（左右方向が上下方向）
-    nose_y = normalize(nose_point['z'], min_z, max_z, center_z, max_range, flip_y=True)
-    # X軸は深度として保持
-    nose_z = normalize(nose_point['x'], min_x, max_x, center_x, max_range, flip_y=False)
-    
-    # 左目（Earの左側）- Y軸をX軸にマッピング、Z軸をY軸にマッピング
-    ear_y_normalized = (points[KEYPOINT_INDICES_24["Ear"]]['y'] - min_y) / y_range if y_range > 0 else 0.5
-    left_eye_x = ear_y_normalized
-    left_eye_y = normalize(points[KEYPOINT_INDICES_24["Ear"]]['z'] - 0.02, min_z, max_z, center_z, max_range, flip_y=True)
-    left_eye_z = normalize(points[KEYPOINT_INDICES_24["Ear"]]['x'], min_x, max_x, center_x, max_range, flip_y=False)
-    
-    # 右目（Earの右側）- Y軸をX軸にマッピング、Z軸をY軸にマッピング
-    right_eye_x = ear_y_normalized
-    right_eye_y = normalize(points[KEYPOINT_INDICES_24["Ear"]]['z'] + 0.02, min_z, max_z, center_z, max_range, flip_y=True)
-    right_eye_z = normalize(points[KEYPOINT_INDICES_24["Ear"]]['x'], min_x, max_x, center_x, max_range, flip_y=False)
-    
-    # 顔のランドマーク（簡易版）
-    for i in range(11):
-        if i == 0:  # 鼻
-            mediapipe_keypoints.append({'x': nose_x, 'y': nose_y, 'z': nose_z, 'visibility': 0.9})
-        elif i == 2:  # 左目
-            mediapipe_keypoints.append({'x': left_eye_x, 'y': left_eye_y, 'z': left_eye_z, 'visibility': 0.9})
-        elif i == 5:  # 右目
-            mediapipe_keypoints.append({'x': right_eye_x, 'y': right_eye_y, 'z': right_eye_z, 'visibility': 0.9})
-        else:
-            # その他の顔のランドマークは鼻の周辺に配置
-            mediapipe_keypoints.append({'x': nose_x, 'y': nose_y, 'z': nose_z, 'visibility': 0.5})
-    
-    # 11-12: 肩（Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    left_shoulder_y_normalized = (points[KEYPOINT_INDICES_24["Left Shoulder"]]['y'] - min_y) / y_range if y_range > 0 else 0.5
-    mediapipe_keypoints.append({
-        'x': left_shoulder_y_normalized,
-        'y': normalize(points[KEYPOINT_INDICES_24["Left Shoulder"]]['z'], min_z, max_z, center_z, max_range, flip_y=True),
-        'z': normalize(points[KEYPOINT_INDICES_24["Left Shoulder"]]['x'], min_x, max_x, center_x, max_range, flip_y=False),
-        'visibility': 0.9
-    })
-    right_shoulder_y_normalized = (points[KEYPOINT_INDICES_24["Right Shoulder"]]['y'] - min_y) / y_range if y_range > 0 else 0.5
-    mediapipe_keypoints.append({
-        'x': right_shoulder_y_normalized,
-        'y': normalize(points[KEYPOINT_INDICES_24["Right Shoulder"]]['z'], min_z, max_z, center_z, max_range, flip_y=True),
-        'z': normalize(points[KEYPOINT_INDICES_24["Right Shoulder"]]['x'], min_x, max_x, center_x, max_range, flip_y=False),
-        'visibility': 0.9
-    })
-    
-    # ヘルパー関数: Y座標をX座標にマッピング（時間経過が横方向の動き）
-    def get_x_from_y(point_y):
-        y_normalized = (point_y - min_y) / y_range if y_range > 0 else 0.5
-        return y_normalized
-    
-    # ヘルパー関数: Z座標をY座標にマッピング（左右方向が上下方向）
-    def get_y_from_z(point_z):
-        return normalize(point_z, min_z, max_z, center_z, max_range, flip_y=True)
-    
-    # ヘルパー関数: X座標を深度として保持
-    def get_z_from_x(point_x):
-        return normalize(point_x, min_x, max_x, center_x, max_range, flip_y=False)
-    
-    # 13-22: 腕（提供データから）
-    # 左肘、右肘、左腕首、右腕首（Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Elbow"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Elbow"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Elbow"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Elbow"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Elbow"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Elbow"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Wrist"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Wrist"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Wrist"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Wrist"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Wrist"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Wrist"]]['x']),
-        'visibility': 0.9
-    })
-    
-    # 手の詳細ランドマーク（17-22）は簡易版
-    for i in range(6):
-        if i % 2 == 0:  # 左手
-            mediapipe_keypoints.append({
-                'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Hand"]]['y']),
-                'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Hand"]]['z']),
-                'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Hand"]]['x']),
-                'visibility': 0.7
-            })
-        else:  # 右手
-            mediapipe_keypoints.append({
-                'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Hand"]]['y']),
-                'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Hand"]]['z']),
-                'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Hand"]]['x']),
-                'visibility': 0.7
-            })
-    
-    # 23-24: 腰（Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Hip"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Hip"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Hip"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Hip"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Hip"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Hip"]]['x']),
-        'visibility': 0.9
-    })
-    
-    # 25-26: 膝（Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Knee"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Knee"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Knee"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Knee"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Knee"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Knee"]]['x']),
-        'visibility': 0.9
-    })
-    
-    # 27-28: 足首（Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Ankle"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Ankle"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Ankle"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Ankle"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Ankle"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Ankle"]]['x']),
-        'visibility': 0.9
-    })
-    
-    # 29-30: かかと（提供データから、Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Heel"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Heel"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Heel"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Heel"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Heel"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Heel"]]['x']),
-        'visibility': 0.9
-    })
-    
-    # 31-32: つま先（提供データから、Y軸をX軸にマッピング、Z軸をY軸にマッピング）
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Left Toe"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Left Toe"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Left Toe"]]['x']),
-        'visibility': 0.9
-    })
-    mediapipe_keypoints.append({
-        'x': get_x_from_y(points[KEYPOINT_INDICES_24["Right Toe"]]['y']),
-        'y': get_y_from_z(points[KEYPOINT_INDICES_24["Right Toe"]]['z']),
-        'z': get_z_from_x(points[KEYPOINT_INDICES_24["Right Toe"]]['x']),
-        'visibility': 0.9
-    })
-    
-    return mediapipe_keypoints
+        canvas_x.fill(0.5)
+    
+    # Canvas Y: 元データのZ軸を中央基準で正規化して反転、深度: 元データのX軸を中央基準で正規化
+    # （アスペクト比を保持するため最大の範囲でスケーリングし、0.0-1.0にクランプ）
+    if max_range == 0:
+        canvas_y.fill(0.5)
+        depth.fill(0.5)
+    else:
+        np.add(source[:, :, 2], MEDIAPIPE_Z_OFFSETS, out=canvas_y)
+        np.subtract(canvas_y, center_z, out=canvas_y)
+        np.divide(canvas_y, max_range, out=canvas_y)
+        np.add(canvas_y, 0.5, out=canvas_y)
+        np.subtract(1.0, canvas_y, out=canvas_y)
+        np.clip(canvas_y, 0.0, 1.0, out=canvas_y)
+        
+        np.subtract(source[:, :, 0], center_x, out=depth)
+        np.divide(depth, max_range, out=depth)
+        np.add(depth, 0.5, out=depth)
+        np.clip(depth, 0.0, 1.0, out=depth)
+    
+    keypoints[:, :, 3] = MEDIAPIPE_VISIBILITY
+    return keypoints
 
-def convert_to_24_keypoints_format(frame_data: List[float], bounds: Dict[str, float]) -> List[Dict[str, float]]:
+def keypoints_array_to_dicts(keypoints: np.ndarray) -> List[List[Dict[str, float]]]:
+    """(フレーム数, 点数, 4) のキーポイント配列をフレームごとの辞書（x, y, z, visibility）のリストにする"""
+    return [
+        [dict(zip(KEYPOINT_FIELDS, landmark)) for landmark in frame]
+        for frame in keypoints.tolist()
+    ]
+
+def convert_to_mediapipe_format(frame_data: List[float], bounds: Dict[str, float], frame_index: int = 0, total_frames: int = 101) -> List[Dict[str, float]]:
     """
-    24個の関節点を正しい軸マッピングで正規化して返す
+    提供された24個の関節点をMediaPipe形式（33個のランドマーク）に変換
+    
+    Args:
+        frame_data: 72個の値（24点 × 3座標）
+        bounds: 全フレームを通した座標の範囲
+    
+    Returns:
+        33個のMediaPipeランドマーク（x, y, z, visibility）
+    """
+    # データが不足している点は0で埋める
+    row = np.zeros(72, dtype=np.float64)
+    n_values = min(len(frame_data) // 3 * 3, 72)
+    row[:n_values] = frame_data[:n_values]
+    return keypoints_array_to_dicts(convert_to_mediapipe_format_batch(row, bounds))[0]
+
+def convert_to_24_keypoints_format_batch(pose_data, bounds: Dict[str, float]) -> np.ndarray:
+    """
+    全フレームの24個の関節点をまとめて正しい軸マッピングで正規化する
     
     s-motionデータの座標系:
       - X軸: 左右方向（横方向、範囲小）
@@ -418,12 +283,14 @@ def convert_to_24_keypoints_format(frame_data: List[float], bounds: Dict[str, fl
     統一スケーリングでアスペクト比を保持する
     
     Args:
-        frame_data: 72個の値（24点 × 3座標）
+        pose_data: 全フレームの座標データ（各フレーム72個の値：24点 × 3座標）
         bounds: 全フレームを通した座標の範囲
     
     Returns:
-        24個のキーポイント（x, y, z, visibility）
+        (フレーム数, 24, 4) の float64 配列（列は x, y, z, visibility）
     """
+    points = np.asarray(pose_data, dtype=np.float64).reshape(-1, 24, 3)
+    
     center_y = bounds.get('center_y', (bounds['min_y'] + bounds['max_y']) / 2)
     center_z = bounds.get('center_z', (bounds['min_z'] + bounds['max_z']) / 2)
     
@@ -432,46 +299,64 @@ def convert_to_24_keypoints_format(frame_data: List[float], bounds: Dict[str, fl
     
     # 両表示軸で同じスケールを使用（アスペクト比を保持）
     display_range = max(range_y, range_z)
+    depth_range = (bounds['max_x'] - bounds['min_x']) or 1.0
+    
+    keypoints = np.empty(points.shape[:2] + (4,), dtype=np.float64)
+    # 各チャンネルは出力配列の列ビューに ufunc の out= で順に書き込み、中間配列を作らない
+    screen_x = keypoints[:, :, 0]
+    screen_y = keypoints[:, :, 1]
+    z_depth = keypoints[:, :, 2]
+    
+    # 画面X: 走行方向（元データY）を中央基準で正規化
+    np.subtract(points[:, :, 1], center_y, out=screen_x)
+    np.divide(screen_x, display_range, out=screen_x)
+    np.add(0.5, screen_x, out=screen_x)
+    # 画面Y: 高さ（元データZ）を反転（高いZ = 画面上部 = 低いY値）
+    np.subtract(points[:, :, 2], center_z, out=screen_y)
+    np.divide(screen_y, display_range, out=screen_y)
+    np.subtract(0.5, screen_y, out=screen_y)
+    # 深度: 左右方向（元データX、表示には直接使わない）
+    np.subtract(points[:, :, 0], bounds['min_x'], out=z_depth)
+    np.divide(z_depth, depth_range, out=z_depth)
+    np.clip(z_depth, 0.0, 1.0, out=z_depth)
+    keypoints[:, :, 3] = 0.9
+    return keypoints
+
+def convert_to_24_keypoints_format(frame_data: List[float], bounds: Dict[str, float]) -> List[Dict[str, float]]:
+    """
+    24個の関節点を正しい軸マッピングで正規化して返す（1フレーム版、変換は convert_to_24_keypoints_format_batch と同じ）
     
-    keypoints = []
-    for i in range(24):
-        idx = i * 3
-        if idx + 2 < len(frame_data):
-            raw_x = frame_data[idx]       # 左右方向（横）
-            raw_y = frame_data[idx + 1]   # 走行方向（前後）→ 画面X
-            raw_z = frame_data[idx + 2]   # 上下方向（高さ）→ 画面Y
-            
-            # サイドビュー表示用のマッピング（統一スケーリング）
-            # 画面X: 走行方向を中央基準で正規化
-            screen_x = 0.5 + (raw_y - center_y) / display_range
-            # 画面Y: 高さを反転（高いZ = 画面上部 = 低いY値）
-            screen_y = 0.5 - (raw_z - center_z) / display_range
-            # 深度: 左右方向（表示には直接使わない）
-            z_depth = (raw_x - bounds['min_x']) / ((bounds['max_x'] - bounds['min_x']) or 1.0)
-            
-            keypoints.append({
-                'x': screen_x,
-                'y': screen_y,
-                'z': max(0.0, min(1.0, z_depth)),
-                'visibility': 0.9
-            })
-        else:
-            # データが不足している場合はデフォルト値
-            keypoints.append({'x': 0.5, 'y': 0.5, 'z': 0.5, 'visibility': 0.0})
+    Args:
+        frame_data: 72個の値（24点 × 3座標）
+        bounds: 全フレームを通した座標の範囲
     
+    Returns:
+        24個のキーポイント（x, y, z, visibility）
+    """
+    n_points = min(len(frame_data) // 3, 24)
+    row = np.zeros(72, dtype=np.float64)
+    row[:n_points * 3] = frame_data[:n_points * 3]
+    keypoints = keypoints_array_to_dicts(convert_to_24_keypoints_format_batch(row, bounds))[0]
+    
+    # データが不足している場合はデフォルト値
+    for i in range(n_points, 24):
+        keypoints[i] = {'x': 0.5, 'y': 0.5, 'z': 0.5, 'visibility': 0.0}
     return keypoints
 
+@functools.lru_cache(maxsize=1)
 def get_standard_model_keypoints_from_coordinates() -> Dict[str, Any]:
     """
     提供された座標データから標準モデルキーポイントを生成（24関節点のまま）
+    入力は静的なファイルだけなので、生成結果はプロセスごとに1回だけ作って使い回す
     
     Returns:
         フレームごとのキーポイントデータ（24関節点）
+        共有の結果なので、呼び出し側で変更しないこと
     """
     # ファイルからデータを読み込む
     pose_data = load_pose_data_from_file()
     
-    if not pose_data:
+    if len(pose_data) == 0:
         print("❌ 座標データが読み込めませんでした")
         return {
             'status': 'error',
@@ -482,15 +367,15 @@ def get_standard_model_keypoints_from_coordinates() -> Dict[str, Any]:
     bounds = get_all_frames_bounds(pose_data)
     print(f"📊 座標範囲: X[{bounds['min_x']:.3f}, {bounds['max_x']:.3f}], Y[{bounds['min_y']:.3f}, {bounds['max_y']:.3f}], Z[{bounds['min_z']:.3f}, {bounds['max_z']:.3f}]")
     
-    frames = {}
-    
-    for frame_idx, frame_data in enumerate(pose_data):
-        # 24関節点のまま返す（変換しない）
-        keypoints_24 = convert_to_24_keypoints_format(frame_data, bounds)
-        frames[str(frame_idx)] = {
-            'keypoints': keypoints_24,
+    # 24関節点のまま、全フレームを配列上でまとめて正規化し、最後に一度だけ辞書にする
+    keypoints_24 = keypoints_array_to_dicts(convert_to_24_keypoints_format_batch(pose_data, bounds))
+    frames = {
+        str(frame_idx): {
+            'keypoints': frame_keypoints,
             'frame_number': frame_idx
         }
+        for frame_idx, frame_keypoints in enumerate(keypoints_24)
+    }
     
     print(f"✅ {len(frames)}フレームのキーポイントを生成しました（24関節点のまま）")
     
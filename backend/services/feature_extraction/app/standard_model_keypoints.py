@@ -4,7 +4,6 @@
 """
 
 import numpy as np
-import math
 from typing import Dict, List, Any, Optional
 
 # MediaPipe Pose Landmark インデックス
@@ -44,6 +43,41 @@ LANDMARK_INDICES = {
     "right_foot_index": 32
 }
 
+# 座標生成で使うランドマークのインデックス（呼び出しごとの辞書参照を避けるため整数定数にしておく）
+NOSE = LANDMARK_INDICES["nose"]
+LEFT_EYE_INNER = LANDMARK_INDICES["left_eye_inner"]
+LEFT_EYE = LANDMARK_INDICES["left_eye"]
+LEFT_EYE_OUTER = LANDMARK_INDICES["left_eye_outer"]
+RIGHT_EYE_INNER = LANDMARK_INDICES["right_eye_inner"]
+RIGHT_EYE = LANDMARK_INDICES["right_eye"]
+RIGHT_EYE_OUTER = LANDMARK_INDICES["right_eye_outer"]
+LEFT_EAR = LANDMARK_INDICES["left_ear"]
+RIGHT_EAR = LANDMARK_INDICES["right_ear"]
+MOUTH_LEFT = LANDMARK_INDICES["mouth_left"]
+MOUTH_RIGHT = LANDMARK_INDICES["mouth_right"]
+LEFT_SHOULDER = LANDMARK_INDICES["left_shoulder"]
+RIGHT_SHOULDER = LANDMARK_INDICES["right_shoulder"]
+LEFT_ELBOW = LANDMARK_INDICES["left_elbow"]
+RIGHT_ELBOW = LANDMARK_INDICES["right_elbow"]
+LEFT_WRIST = LANDMARK_INDICES["left_wrist"]
+RIGHT_WRIST = LANDMARK_INDICES["right_wrist"]
+LEFT_PINKY = LANDMARK_INDICES["left_pinky"]
+RIGHT_PINKY = LANDMARK_INDICES["right_pinky"]
+LEFT_INDEX = LANDMARK_INDICES["left_index"]
+RIGHT_INDEX = LANDMARK_INDICES["right_index"]
+LEFT_THUMB = LANDMARK_INDICES["left_thumb"]
+RIGHT_THUMB = LANDMARK_INDICES["right_thumb"]
+LEFT_HIP = LANDMARK_INDICES["left_hip"]
+RIGHT_HIP = LANDMARK_INDICES["right_hip"]
+LEFT_KNEE = LANDMARK_INDICES["left_knee"]
+RIGHT_KNEE = LANDMARK_INDICES["right_knee"]
+LEFT_ANKLE = LANDMARK_INDICES["left_ankle"]
+RIGHT_ANKLE = LANDMARK_INDICES["right_ankle"]
+LEFT_HEEL = LANDMARK_INDICES["left_heel"]
+RIGHT_HEEL = LANDMARK_INDICES["right_heel"]
+LEFT_FOOT_INDEX = LANDMARK_INDICES["left_foot_index"]
+RIGHT_FOOT_INDEX = LANDMARK_INDICES["right_foot_index"]
+
 # 標準的な人体の各部位の長さ（正規化座標、身長1.0を基準）
 STANDARD_BODY_DIMENSIONS = {
     "torso_length": 0.3,      # 体幹の長さ（腰から肩まで）
@@ -57,43 +91,58 @@ STANDARD_BODY_DIMENSIONS = {
     "foot_length": 0.1        # 足の長さ
 }
 
-def generate_keypoints_from_angles(
-    frame_data: Dict[str, float],
+# 角度の列順（generate_keypoints_from_angles_batch の frames の列）。日本語キーを優先し、英語キーにフォールバックする
+ANGLE_COLUMN_KEYS = (
+    ("体幹角度_平均", "trunk_angle"),
+    ("右大腿角度_平均", "right_thigh_angle"),
+    ("右下腿角度_平均", "right_shank_angle"),
+    ("左大腿角度_平均", "left_thigh_angle"),
+    ("左下腿角度_平均", "left_shank_angle"),
+)
+
+KEYPOINT_FIELDS = ("x", "y", "z", "visibility")
+
+def frame_angles_to_row(frame_data: Dict[str, float]) -> List[float]:
+    """
+    フレームの角度データを ANGLE_COLUMN_KEYS の列順の角度リストにする（キー名のバリエーションに対応）
+    """
+    return [frame_data.get(ja_key) or frame_data.get(en_key) or 0.0 for ja_key, en_key in ANGLE_COLUMN_KEYS]
+
+def generate_keypoints_from_angles_batch(
+    frames: np.ndarray,
     base_x: float = 0.5,
     base_y: float = 0.5
-) -> List[Dict[str, float]]:
+) -> np.ndarray:
     """
-    角度データから33個のMediaPipeランドマーク座標を生成
+    複数フレームの角度データから33個のMediaPipeランドマーク座標をまとめて生成
     
     Args:
-        frame_data: フレームの角度データ
-            - 体幹角度_平均 (trunk_angle)
-            - 右大腿角度_平均 (right_thigh_angle)
-            - 右下腿角度_平均 (right_shank_angle)
-            - 左大腿角度_平均 (left_thigh_angle)
-            - 左下腿角度_平均 (left_shank_angle)
+        frames: (フレーム数, 5) の角度配列（度）。列は 体幹・右大腿・右下腿・左大腿・左下腿
         base_x: 基準点のX座標（骨盤中心、デフォルト: 0.5）
         base_y: 基準点のY座標（骨盤中心、デフォルト: 0.5）
     
     Returns:
-        List[Dict]: 33個のキーポイント（x, y, z, visibility）
+        np.ndarray: (フレーム数, 33, 4) のキーポイント配列（x, y, z, visibility）
     """
-    # 角度データを取得（キー名のバリエーションに対応）
-    trunk_angle = frame_data.get("体幹角度_平均") or frame_data.get("trunk_angle") or 0.0
-    right_thigh_angle = frame_data.get("右大腿角度_平均") or frame_data.get("right_thigh_angle") or 0.0
-    right_shank_angle = frame_data.get("右下腿角度_平均") or frame_data.get("right_shank_angle") or 0.0
-    left_thigh_angle = frame_data.get("左大腿角度_平均") or frame_data.get("left_thigh_angle") or 0.0
-    left_shank_angle = frame_data.get("左下腿角度_平均") or frame_data.get("left_shank_angle") or 0.0
-    
-    # 角度をラジアンに変換
-    trunk_rad = math.radians(trunk_angle)
-    right_thigh_rad = math.radians(right_thigh_angle)
-    right_shank_rad = math.radians(right_shank_angle)
-    left_thigh_rad = math.radians(left_thigh_angle)
-    left_shank_rad = math.radians(left_shank_angle)
-    
-    # 33個のキーポイントを初期化
-    keypoints = [None] * 33
+    frames = np.asarray(frames, dtype=np.float64).reshape(-1, len(ANGLE_COLUMN_KEYS))
+    n_frames = frames.shape[0]
+    
+    # 角度をラジアンに変換し、sin/cos は列ごとに一度だけ計算する
+    rad = np.deg2rad(frames)
+    sin = np.sin(rad)
+    cos = np.cos(rad)
+    trunk_sin, right_thigh_sin, right_shank_sin, left_thigh_sin, left_shank_sin = sin.T
+    trunk_cos, right_thigh_cos, right_shank_cos, left_thigh_cos, left_shank_cos = cos.T
+    
+    # 設定されないランドマークは (0.5, 0.5, 0.0, 可視性0.0)
+    keypoints = np.empty((n_frames, 33, 4), dtype=np.float64)
+    keypoints[:, :, 0:2] = 0.5
+    keypoints[:, :, 2:4] = 0.0
+    
+    def set_keypoint(idx: int, x, y):
+        keypoints[:, idx, 0] = x
+        keypoints[:, idx, 1] = y
+        keypoints[:, idx, 3] = 0.9
     
     # 基準点: 骨盤中心（腰の中点）
     hip_center_x = base_x
@@ -101,137 +150,119 @@ def generate_keypoints_from_angles(
     
     # 体幹角度から肩の中心を計算
     torso_length = STANDARD_BODY_DIMENSIONS["torso_length"]
-    shoulder_center_x = hip_center_x + torso_length * math.sin(trunk_rad)
-    shoulder_center_y = hip_center_y - torso_length * math.cos(trunk_rad)
+    shoulder_center_x = hip_center_x + torso_length * trunk_sin
+    shoulder_center_y = hip_center_y - torso_length * trunk_cos
     
     # 肩幅から左右の肩を計算
     shoulder_width = STANDARD_BODY_DIMENSIONS["shoulder_width"]
     left_shoulder_x = shoulder_center_x - shoulder_width / 2
-    left_shoulder_y = shoulder_center_y
     right_shoulder_x = shoulder_center_x + shoulder_width / 2
-    right_shoulder_y = shoulder_center_y
+    shoulder_y = shoulder_center_y
     
-    # 骨盤幅から左右の腰を計算
+    # 骨盤幅から左右の腰を計算（角度に依存しないためスカラー）
     hip_width = STANDARD_BODY_DIMENSIONS["hip_width"]
     left_hip_x = hip_center_x - hip_width / 2
-    left_hip_y = hip_center_y
     right_hip_x = hip_center_x + hip_width / 2
-    right_hip_y = hip_center_y
+    hip_y = hip_center_y
     
     # 頭部（肩の中心から上に配置）
     head_radius = STANDARD_BODY_DIMENSIONS["head_radius"]
     nose_x = shoulder_center_x
     nose_y = shoulder_center_y - head_radius
     
-    # 右脚の計算
+    # 脚の計算
     thigh_length = STANDARD_BODY_DIMENSIONS["thigh_length"]
-    right_knee_x = right_hip_x + thigh_length * math.sin(right_thigh_rad)
-    right_knee_y = right_hip_y + thigh_length * math.cos(right_thigh_rad)
-    
     shank_length = STANDARD_BODY_DIMENSIONS["shank_length"]
-    right_ankle_x = right_knee_x + shank_length * math.sin(right_shank_rad)
-    right_ankle_y = right_knee_y + shank_length * math.cos(right_shank_rad)
-    
-    # 左脚の計算
-    left_knee_x = left_hip_x + thigh_length * math.sin(left_thigh_rad)
-    left_knee_y = left_hip_y + thigh_length * math.cos(left_thigh_rad)
+    right_knee_x = right_hip_x + thigh_length * right_thigh_sin
+    right_knee_y = hip_y + thigh_length * right_thigh_cos
+    right_ankle_x = right_knee_x + shank_length * right_shank_sin
+    right_ankle_y = right_knee_y + shank_length * right_shank_cos
     
-    left_ankle_x = left_knee_x + shank_length * math.sin(left_shank_rad)
-    left_ankle_y = left_knee_y + shank_length * math.cos(left_shank_rad)
+    left_knee_x = left_hip_x + thigh_length * left_thigh_sin
+    left_knee_y = hip_y + thigh_length * left_thigh_cos
+    left_ankle_x = left_knee_x + shank_length * left_shank_sin
+    left_ankle_y = left_knee_y + shank_length * left_shank_cos
     
-    # 腕の計算（簡易版：自然な位置に配置）
+    # 腕の計算（簡易版：体側に沿って自然な位置に配置）
     upper_arm_length = STANDARD_BODY_DIMENSIONS["upper_arm_length"]
     forearm_length = STANDARD_BODY_DIMENSIONS["forearm_length"]
-    
-    # 右腕（簡易版：体側に沿って配置）
     right_elbow_x = right_shoulder_x + upper_arm_length * 0.3
-    right_elbow_y = right_shoulder_y + upper_arm_length * 0.5
+    elbow_y = shoulder_y + upper_arm_length * 0.5
     right_wrist_x = right_elbow_x + forearm_length * 0.3
-    right_wrist_y = right_elbow_y + forearm_length * 0.5
-    
-    # 左腕（簡易版：体側に沿って配置）
+    wrist_y = elbow_y + forearm_length * 0.5
     left_elbow_x = left_shoulder_x - upper_arm_length * 0.3
-    left_elbow_y = left_shoulder_y + upper_arm_length * 0.5
     left_wrist_x = left_elbow_x - forearm_length * 0.3
-    left_wrist_y = left_elbow_y + forearm_length * 0.5
     
     # 足の計算
     foot_length = STANDARD_BODY_DIMENSIONS["foot_length"]
-    right_heel_x = right_ankle_x
-    right_heel_y = right_ankle_y + foot_length * 0.2
-    right_foot_index_x = right_ankle_x + foot_length
-    right_foot_index_y = right_ankle_y
-    
-    left_heel_x = left_ankle_x
-    left_heel_y = left_ankle_y + foot_length * 0.2
-    left_foot_index_x = left_ankle_x + foot_length
-    left_foot_index_y = left_ankle_y
-    
-    # キーポイントを設定
-    def set_keypoint(idx: int, x: float, y: float, z: float = 0.0, visibility: float = 0.9):
-        if 0 <= idx < 33:
-            keypoints[idx] = {
-                "x": max(0.0, min(1.0, x)),  # 0-1の範囲にクランプ
-                "y": max(0.0, min(1.0, y)),  # 0-1の範囲にクランプ
-                "z": z,
-                "visibility": visibility
-            }
     
     # 頭部
-    set_keypoint(LANDMARK_INDICES["nose"], nose_x, nose_y)
-    set_keypoint(LANDMARK_INDICES["left_eye"], nose_x - 0.02, nose_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["right_eye"], nose_x + 0.02, nose_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["left_ear"], nose_x - 0.03, nose_y)
-    set_keypoint(LANDMARK_INDICES["right_ear"], nose_x + 0.03, nose_y)
-    set_keypoint(LANDMARK_INDICES["mouth_left"], nose_x - 0.01, nose_y + 0.02)
-    set_keypoint(LANDMARK_INDICES["mouth_right"], nose_x + 0.01, nose_y + 0.02)
-    
-    # 肩
-    set_keypoint(LANDMARK_INDICES["left_shoulder"], left_shoulder_x, left_shoulder_y)
-    set_keypoint(LANDMARK_INDICES["right_shoulder"], right_shoulder_x, right_shoulder_y)
-    
-    # 腕
-    set_keypoint(LANDMARK_INDICES["left_elbow"], left_elbow_x, left_elbow_y)
-    set_keypoint(LANDMARK_INDICES["right_elbow"], right_elbow_x, right_elbow_y)
-    set_keypoint(LANDMARK_INDICES["left_wrist"], left_wrist_x, left_wrist_y)
-    set_keypoint(LANDMARK_INDICES["right_wrist"], right_wrist_x, right_wrist_y)
+    set_keypoint(NOSE, nose_x, nose_y)
+    set_keypoint(LEFT_EYE, nose_x - 0.02, nose_y - 0.01)
+    set_keypoint(RIGHT_EYE, nose_x + 0.02, nose_y - 0.01)
+    set_keypoint(LEFT_EAR, nose_x - 0.03, nose_y)
+    set_keypoint(RIGHT_EAR, nose_x + 0.03, nose_y)
+    set_keypoint(MOUTH_LEFT, nose_x - 0.01, nose_y + 0.02)
+    set_keypoint(MOUTH_RIGHT, nose_x + 0.01, nose_y + 0.02)
+    set_keypoint(LEFT_EYE_INNER, nose_x - 0.015, nose_y - 0.01)
+    set_keypoint(LEFT_EYE_OUTER, nose_x - 0.025, nose_y - 0.01)
+    set_keypoint(RIGHT_EYE_INNER, nose_x + 0.015, nose_y - 0.01)
+    set_keypoint(RIGHT_EYE_OUTER, nose_x + 0.025, nose_y - 0.01)
+    
+    # 肩・腕
+    set_keypoint(LEFT_SHOULDER, left_shoulder_x, shoulder_y)
+    set_keypoint(RIGHT_SHOULDER, right_shoulder_x, shoulder_y)
+    set_keypoint(LEFT_ELBOW, left_elbow_x, elbow_y)
+    set_keypoint(RIGHT_ELBOW, right_elbow_x, elbow_y)
+    set_keypoint(LEFT_WRIST, left_wrist_x, wrist_y)
+    set_keypoint(RIGHT_WRIST, right_wrist_x, wrist_y)
     
     # 手（簡易版：手首の近くに配置）
-    set_keypoint(LANDMARK_INDICES["left_pinky"], left_wrist_x - 0.01, left_wrist_y)
-    set_keypoint(LANDMARK_INDICES["right_pinky"], right_wrist_x + 0.01, right_wrist_y)
-    set_keypoint(LANDMARK_INDICES["left_index"], left_wrist_x - 0.01, left_wrist_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["right_index"], right_wrist_x + 0.01, right_wrist_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["left_thumb"], left_wrist_x, left_wrist_y + 0.01)
-    set_keypoint(LANDMARK_INDICES["right_thumb"], right_wrist_x, right_wrist_y + 0.01)
-    
-    # 腰
-    set_keypoint(LANDMARK_INDICES["left_hip"], left_hip_x, left_hip_y)
-    set_keypoint(LANDMARK_INDICES["right_hip"], right_hip_x, right_hip_y)
-    
-    # 脚
-    set_keypoint(LANDMARK_INDICES["left_knee"], left_knee_x, left_knee_y)
-    set_keypoint(LANDMARK_INDICES["right_knee"], right_knee_x, right_knee_y)
-    set_keypoint(LANDMARK_INDICES["left_ankle"], left_ankle_x, left_ankle_y)
-    set_keypoint(LANDMARK_INDICES["right_ankle"], right_ankle_x, right_ankle_y)
-    set_keypoint(LANDMARK_INDICES["left_heel"], left_heel_x, left_heel_y)
-    set_keypoint(LANDMARK_INDICES["right_heel"], right_heel_x, right_heel_y)
-    set_keypoint(LANDMARK_INDICES["left_foot_index"], left_foot_index_x, left_foot_index_y)
-    set_keypoint(LANDMARK_INDICES["right_foot_index"], right_foot_index_x, right_foot_index_y)
-    
-    # その他のランドマーク（簡易版：近くのポイントから推定）
-    set_keypoint(LANDMARK_INDICES["left_eye_inner"], nose_x - 0.015, nose_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["left_eye_outer"], nose_x - 0.025, nose_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["right_eye_inner"], nose_x + 0.015, nose_y - 0.01)
-    set_keypoint(LANDMARK_INDICES["right_eye_outer"], nose_x + 0.025, nose_y - 0.01)
-    
-    # Noneのキーポイントをデフォルト値で埋める
-    for i in range(33):
-        if keypoints[i] is None:
-            keypoints[i] = {
-                "x": 0.5,
-                "y": 0.5,
-                "z": 0.0,
-                "visibility": 0.0
-            }
+    set_keypoint(LEFT_PINKY, left_wrist_x - 0.01, wrist_y)
+    set_keypoint(RIGHT_PINKY, right_wrist_x + 0.01, wrist_y)
+    set_keypoint(LEFT_INDEX, left_wrist_x - 0.01, wrist_y - 0.01)
+    set_keypoint(RIGHT_INDEX, right_wrist_x + 0.01, wrist_y - 0.01)
+    set_keypoint(LEFT_THUMB, left_wrist_x, wrist_y + 0.01)
+    set_keypoint(RIGHT_THUMB, right_wrist_x, wrist_y + 0.01)
+    
+    # 腰・脚・足
+    set_keypoint(LEFT_HIP, left_hip_x, hip_y)
+    set_keypoint(RIGHT_HIP, right_hip_x, hip_y)
+    set_keypoint(LEFT_KNEE, left_knee_x, left_knee_y)
+    set_keypoint(RIGHT_KNEE, right_knee_x, right_knee_y)
+    set_keypoint(LEFT_ANKLE, left_ankle_x, left_ankle_y)
+    set_keypoint(RIGHT_ANKLE, right_ankle_x, right_ankle_y)
+    set_keypoint(LEFT_HEEL, left_ankle_x, left_ankle_y + foot_length * 0.2)
+    set_keypoint(RIGHT_HEEL, right_ankle_x, right_ankle_y + foot_length * 0.2)
+    set_keypoint(LEFT_FOOT_INDEX, left_ankle_x + foot_length, left_ankle_y)
+    set_keypoint(RIGHT_FOOT_INDEX, right_ankle_x + foot_length, right_ankle_y)
+    
+    # x, y は0-1の範囲にクランプ（出力配列の上で直接行う）
+    xy = keypoints[:, :, 0:2]
+    np.clip(xy, 0.0, 1.0, out=xy)
     
     return keypoints
+
+def generate_keypoints_from_angles(
+    frame_data: Dict[str, float],
+    base_x: float = 0.5,
+    base_y: float = 0.5
+) -> List[Dict[str, float]]:
+    """
+    角度データから33個のMediaPipeランドマーク座標を生成（1フレーム版）
+    
+    Args:
+        frame_data: フレームの角度データ
+            - 体幹角度_平均 (trunk_angle)
+            - 右大腿角度_平均 (right_thigh_angle)
+            - 右下腿角度_平均 (right_shank_angle)
+            - 左大腿角度_平均 (left_thigh_angle)
+            - 左下腿角度_平均 (left_shank_angle)
+        base_x: 基準点のX座標（骨盤中心、デフォルト: 0.5）
+        base_y: 基準点のY座標（骨盤中心、デフォルト: 0.5）
+    
+    Returns:
+        List[Dict]: 33個のキーポイント（x, y, z, visibility）
+    """
+    keypoints = generate_keypoints_from_angles_batch([frame_angles_to_row(frame_data)], base_x, base_y)
+    return [dict(zip(KEYPOINT_FIELDS, landmark)) for landmark in keypoints[0].tolist()]
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+バッチ化・Numba化した角度計算と接地検出が、フレーム単位の単体版（スカラー関数）と
+同じ結果を返すことを確認するスクリプト
+リポジトリ同梱の pose_result.json を入力に、カーネル版とNumPyフォールバック版の両方を比較する
+"""
+
+import os
+import sys
+import json
+import numpy as np
+from scipy import signal
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# プロジェクトのパスを追加
+sys.path.append(os.path.join(ROOT_DIR, 'backend/services/feature_extraction/app'))
+
+try:
+    from fastapi.testclient import TestClient
+    import main
+    from main import (
+        KeyPoint,
+        AngleCalculator,
+        calculate_trunk_angle,
+        calculate_thigh_angle,
+        calculate_lower_leg_angle,
+        calculate_upper_arm_angle,
+        calculate_forearm_angle,
+        calculate_foot_angle,
+        calculate_hip_joint_angle_relative,
+        calculate_knee_joint_angle_relative,
+        calculate_ankle_joint_angle_relative,
+        calculate_shoulder_joint_angle_relative,
+        calculate_elbow_joint_angle_relative,
+    )
+    print("✅ モジュールのインポートが成功しました")
+except ImportError as e:
+    print(f"❌ インポートエラー: {e}")
+    sys.exit(1)
+
+# 角度の許容誤差（度）。バッチ版は float32 配列で計算するため単体版と完全には一致しない
+ANGLE_TOLERANCE = 1e-2
+
+def load_pose_result():
+    """pose_result.json を読み込み、フレームごとのKeyPointリストとFPSを返す"""
+    with open(os.path.join(ROOT_DIR, 'pose_result.json'), encoding='utf-8') as f:
+        pose_result = json.load(f)
+    all_keypoints = [[KeyPoint(**kp) for kp in frame['keypoints']] for frame in pose_result['pose_data']]
+    return pose_result, all_keypoints, float(pose_result['video_info']['fps'])
+
+def to_nan(value):
+    """単体版の None をバッチ版と同じNaNにする"""
+    return np.nan if value is None else value
+
+def scalar_cycle_angles(keypoints):
+    """1フレームの11指標を単体版の関数で計算する（列順は CYCLE_ANGLE_KEYS）"""
+    row = [calculate_trunk_angle(keypoints)]
+    row += [calculate_thigh_angle(keypoints[main.LEFT_HIP], keypoints[main.LEFT_KNEE], 'left'),
+            calculate_thigh_angle(keypoints[main.RIGHT_HIP], keypoints[main.RIGHT_KNEE], 'right')]
+    row += [calculate_lower_leg_angle(keypoints[main.LEFT_KNEE], keypoints[main.LEFT_ANKLE], 'left'),
+            calculate_lower_leg_angle(keypoints[main.RIGHT_KNEE], keypoints[main.RIGHT_ANKLE], 'right')]
+    row += [calculate_upper_arm_angle(keypoints[main.LEFT_SHOULDER], keypoints[main.LEFT_ELBOW], 'left'),
+            calculate_upper_arm_angle(keypoints[main.RIGHT_SHOULDER], keypoints[main.RIGHT_ELBOW], 'right')]
+    row += [calculate_forearm_angle(keypoints[main.LEFT_ELBOW], keypoints[main.LEFT_WRIST], 'left'),
+            calculate_forearm_angle(keypoints[main.RIGHT_ELBOW], keypoints[main.RIGHT_WRIST], 'right')]
+    row += [calculate_foot_angle(keypoints[main.LEFT_ANKLE], keypoints[main.LEFT_FOOT_INDEX], 'left'),
+            calculate_foot_angle(keypoints[main.RIGHT_ANKLE], keypoints[main.RIGHT_FOOT_INDEX], 'right')]
+    return [to_nan(angle) for angle in row]
+
+def scalar_extract_angles(keypoints):
+    """
+    /extract の1フレーム分を単体版の関数で計算する（列順は EXTRACT_ANGLE_KEYS）
+    左上腕・左前腕は /extract と同じく肘0.1・肩/手首0.3の可視性を確認する
+    """
+    row = scalar_cycle_angles(keypoints)
+    left_elbow = keypoints[main.LEFT_ELBOW]
+    if left_elbow.visibility < 0.1 or keypoints[main.LEFT_SHOULDER].visibility < 0.3:
+        row[5] = np.nan
+    if left_elbow.visibility < 0.1 or keypoints[main.LEFT_WRIST].visibility < 0.3:
+        row[7] = np.nan
+    return row
+
+def scalar_relative_angles(keypoints):
+    """1フレームの相対関節角度を単体版の関数で計算する（列順は RELATIVE_JOINT_NAMES）"""
+    row = []
+    for side in ('left', 'right'):
+        row.append(calculate_hip_joint_angle_relative(keypoints, side))
+    for side in ('left', 'right'):
+        row.append(calculate_knee_joint_angle_relative(keypoints, side))
+    for side in ('left', 'right'):
+        row.append(calculate_ankle_joint_angle_relative(keypoints, side))
+    for side in ('left', 'right'):
+        row.append(calculate_shoulder_joint_angle_relative(keypoints, side))
+    for side in ('left', 'right'):
+        row.append(calculate_elbow_joint_angle_relative(keypoints, side))
+    return [to_nan(angle) for angle in row]
+
+def scalar_foot_strikes(all_keypoints, video_fps):
+    """
+    detect_foot_strikes_advanced と同じ手順を、np.interp・signal.savgol_filter と
+    Pythonのループだけで行う接地検出（バッチ版の比較用）
+    """
+    n_frames = len(all_keypoints)
+    ankle_y = np.array([
+        [kp.y if kp.visibility > 0.5 else np.nan for kp in (frame[main.LEFT_ANKLE], frame[main.RIGHT_ANKLE])]
+        for frame in all_keypoints
+    ], dtype=np.float32).astype(np.float64)
+
+    window_length = min(7, n_frames // 3)
+    if window_length % 2 == 0:
+        window_length -= 1
+    window_length = max(3, window_length)
+
+    inverted = []
+    indices = np.arange(n_frames)
+    for column in ankle_y.T:
+        mask = ~np.isnan(column)
+        filled = np.interp(indices, indices[mask], column[mask])
+        inverted.append(-signal.savgol_filter(filled, window_length, 3))
+
+    min_interval_frames = max(1, int(video_fps * 2 * 60 / 220))
+    min_prominence = np.std(inverted[0]) * 0.3
+    candidates = []
+    for foot, series in zip(('left', 'right'), inverted):
+        peaks, _ = signal.find_peaks(series, prominence=min_prominence, distance=min_interval_frames)
+        candidates += [(int(frame), foot) for frame in peaks]
+
+    # 同一フレームは左足を先にして、直前の候補と同じ足の候補を除外する
+    final_strikes = []
+    for frame, foot in sorted(candidates, key=lambda strike: (strike[0], strike[1] != 'left')):
+        if final_strikes and final_strikes[-1][1] == foot:
+            continue
+        final_strikes.append((frame, foot))
+    return final_strikes
+
+def report(name, ok, detail=""):
+    """比較結果を1行で出力する"""
+    print(f"{'✅' if ok else '❌'} {name}{': ' + detail if detail else ''}")
+    return ok
+
+def max_angle_diff(actual, expected):
+    """NaNの位置が一致するかと、有効値の最大誤差を返す"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    same_nan = np.array_equal(np.isnan(actual), np.isnan(expected))
+    valid = ~np.isnan(expected)
+    diff = float(np.max(np.abs(actual[valid] - expected[valid]), initial=0.0))
+    return same_nan, diff
+
+def check_angles(name, actual, expected):
+    """角度配列を単体版と比較して結果を出力する"""
+    same_nan, diff = max_angle_diff(actual, expected)
+    return report(name, same_nan and diff <= ANGLE_TOLERANCE, f"NaN位置一致={same_nan}, 最大誤差={diff:.2e}°")
+
+def test_cycle_angles(all_keypoints):
+    """1サイクル角度カーネル（並列版・逐次版・NumPy版）を単体版と比較"""
+    print("\n🧪 1サイクル角度カーネル vs 単体版")
+    print("=" * 60)
+    xs, ys, vis = main.keypoints_to_soa(all_keypoints)
+    expected = np.array([scalar_cycle_angles(frame) for frame in all_keypoints])
+
+    short = main.CYCLE_PARALLEL_MIN_FRAMES - 1
+    results = [
+        check_angles(f"compute_cycle_angles（{len(xs)}フレーム）", main.compute_cycle_angles(xs, ys, vis), expected),
+        check_angles(f"compute_cycle_angles（{short}フレーム）",
+                     main.compute_cycle_angles(xs[:short], ys[:short], vis[:short]), expected[:short]),
+        check_angles("NumPy版（_trunk_angles_batch + _absolute_segment_angles）",
+                     np.column_stack([main._trunk_angles_batch(xs, ys, vis),
+                                      main._absolute_segment_angles(xs, ys, vis)]), expected),
+    ]
+    if main.NUMBA_AVAILABLE:
+        results.append(check_angles("_cycle_angles_kernel（float64入力）", main._cycle_angles_kernel(
+            xs.astype(np.float64), ys.astype(np.float64), vis.astype(np.float64),
+            main._ABS_TAIL, main._ABS_HEAD, main._ABS_TAIL_VIS, main._ABS_HEAD_VIS), expected))
+    return all(results)
+
+def test_relative_angles(all_keypoints):
+    """相対関節角度（_angles_all_frames とNumPy版）を単体版と比較"""
+    print("\n🧪 相対関節角度 vs 単体版")
+    print("=" * 60)
+    xs, ys, vis = main.keypoints_to_soa(all_keypoints)
+    expected = np.array([scalar_relative_angles(frame) for frame in all_keypoints])
+
+    batch = AngleCalculator(main.AngleCalculationMode.RELATIVE)._calculate_relative_angles_soa(xs, ys, vis)
+    actual = np.column_stack([batch[name] for name in main.RELATIVE_JOINT_NAMES])
+
+    ext_xs, ext_ys, ext_vis = main._append_shoulder_center(xs, ys, vis)
+    numpy_angles = main._angles_all_frames_numpy(
+        ext_xs, ext_ys, ext_vis,
+        main.RELATIVE_TRIPLES_A, main.RELATIVE_TRIPLES_B, main.RELATIVE_TRIPLES_C, 0.5
+    )
+    return all([
+        check_angles("_calculate_relative_angles_soa", actual, expected),
+        check_angles("_angles_all_frames_numpy", numpy_angles, expected),
+    ])
+
+def test_fill_smooth_and_invert(all_keypoints):
+    """NaN補間・平滑化・反転の一括処理を np.interp + signal.savgol_filter と比較"""
+    print("\n🧪 fill_smooth_and_invert vs scipy")
+    print("=" * 60)
+    xs, ys, vis = main.keypoints_to_soa(all_keypoints)
+    ankle_y = np.where(vis[:, main.ANKLE_IDX] > 0.5, ys[:, main.ANKLE_IDX], np.nan).astype(np.float64)
+    # 補間の経路を通すため、先頭・途中・末尾に欠損を追加する
+    ankle_y[:3, 0] = np.nan
+    ankle_y[40:46, 1] = np.nan
+    ankle_y[-2:, 1] = np.nan
+
+    indices = np.arange(len(ankle_y))
+    filled = np.column_stack([
+        np.interp(indices, indices[~np.isnan(column)], column[~np.isnan(column)]) for column in ankle_y.T
+    ])
+    expected = -signal.savgol_filter(filled, 7, 3, axis=0).T
+
+    numpy_filled = ankle_y.copy()
+    main._fill_nans_linear_numpy(numpy_filled)
+    results = [
+        check_angles("fill_smooth_and_invert", main.fill_smooth_and_invert(ankle_y.copy(), 7, 3), expected),
+        check_angles("NumPy版（_fill_nans_linear_numpy + savgol_smooth）",
+                     -main.savgol_smooth(numpy_filled, 7, 3).T, expected),
+    ]
+    if main.NUMBA_AVAILABLE:
+        kernel_filled = ankle_y.copy()
+        main._fill_nans_linear_kernel(kernel_filled)
+        results.append(check_angles("_fill_nans_linear_kernel", kernel_filled, filled))
+    return all(results)
+
+def test_foot_strikes(all_keypoints, video_fps):
+    """接地検出と左右交互マージ（カーネル版とNumPy版）を単体版と比較"""
+    print("\n🧪 detect_foot_strikes_advanced vs 単体版")
+    print("=" * 60)
+    actual = main.detect_foot_strikes_advanced(all_keypoints, video_fps)
+    expected = scalar_foot_strikes(all_keypoints, video_fps)
+    print(f"📍 バッチ版: {actual}")
+    print(f"📍 単体版:   {expected}")
+    results = [report("接地フレーム・足の一致", actual == expected, f"{len(actual)}個")]
+
+    # 同一フレームの候補・同じ足の連続を含む入力でマージ関数を比較
+    left = np.array([3, 10, 12, 30, 41], dtype=np.int64)
+    right = np.array([3, 20, 25, 41, 50], dtype=np.int64)
+    expected_merge = main._merge_alternating_strikes_numpy(left, right)
+    actual_merge = main.merge_alternating_strikes(left, right)
+    results.append(report("merge_alternating_strikes vs NumPy版",
+                          all(np.array_equal(a, e) for a, e in zip(actual_merge, expected_merge))))
+    return all(results)
+
+def test_cycle_selection(all_keypoints, video_fps):
+    """代表サイクルが1ストライドの範囲に収まり、その統計値が単体版と一致することを確認"""
+    print("\n🧪 代表サイクルの選択と統計値")
+    print("=" * 60)
+    strikes = main.detect_foot_strikes_advanced(all_keypoints, video_fps)
+    by_foot = {foot: [frame for frame, f in strikes if f == foot] for foot in ('right', 'left')}
+    foot_order = ('right', 'left') if len(by_foot['right']) >= len(by_foot['left']) else ('left', 'right')
+    cycle = None
+    for foot in foot_order:
+        cycle = main.select_stride_cycle(by_foot[foot], video_fps)
+        if cycle is not None:
+            break
+    if cycle is None:
+        return report("代表サイクルの選択", False, "1ストライドの範囲に収まる接地ペアがありません")
+
+    _, start, end = cycle
+    min_interval, max_interval = main.stride_interval_limits(video_fps)
+    results = [report("サイクル長が1ストライドの範囲内", min_interval <= end - start <= max_interval,
+                      f"{foot}足 {start}〜{end} ({end - start}フレーム, 範囲 {min_interval}〜{max_interval})")]
+
+    stats = main.analyze_user_run_and_get_stats(all_keypoints, video_fps)
+    expected = np.array([scalar_cycle_angles(frame) for frame in all_keypoints[start:end + 1]])
+    for j, angle_key in enumerate(main.CYCLE_ANGLE_KEYS):
+        column = expected[:, j][~np.isnan(expected[:, j])]
+        actual = stats[angle_key]
+        ok = actual['count'] == len(column)
+        if ok and len(column):
+            ok = all(abs(actual[name] - float(func(column))) <= ANGLE_TOLERANCE
+                     for name, func in (('mean', np.mean), ('min', np.min), ('max', np.max), ('std', np.std)))
+        results.append(report(f"{angle_key} の統計値", ok, f"count={actual['count']}"))
+    return all(results)
+
+def test_extract_endpoint(pose_result, all_keypoints):
+    """/extract のフレーム単位の角度を単体版と比較"""
+    print("\n🧪 /extract の角度 vs 単体版")
+    print("=" * 60)
+    client = TestClient(main.app)
+    response = client.post("/extract", json={
+        "pose_data": pose_result["pose_data"],
+        "video_info": pose_result["video_info"]
+    })
+    if response.status_code != 200:
+        return report("/extract", False, f"HTTPステータス {response.status_code}")
+
+    angle_data = response.json()["features"]["angle_data"]
+    valid_keypoints = [frame for frame, pose_frame in zip(all_keypoints, pose_result["pose_data"])
+                       if pose_frame["landmarks_detected"]]
+    actual = np.array([[to_nan(row[key]) for key in main.EXTRACT_ANGLE_KEYS] for row in angle_data])
+    expected = np.array([scalar_extract_angles(frame) for frame in valid_keypoints])
+    return check_angles(f"/extract angle_data（{len(angle_data)}フレーム）", actual, expected)
+
+if __name__ == "__main__":
+    print("🧪 バッチ化カーネルの一致性テスト")
+    print(f"・Numba: {'有効' if main.NUMBA_AVAILABLE else '無効'}, AOTカーネル: {'有効' if main.AOT_KERNELS_AVAILABLE else '無効'}")
+
+    pose_result, all_keypoints, video_fps = load_pose_result()
+    print(f"📊 フレーム数: {len(all_keypoints)}, FPS: {video_fps}")
+
+    results = [
+        test_cycle_angles(all_keypoints),
+        test_relative_angles(all_keypoints),
+        test_fill_smooth_and_invert(all_keypoints),
+        test_foot_strikes(all_keypoints, video_fps),
+        test_cycle_selection(all_keypoints, video_fps),
+        test_extract_endpoint(pose_result, all_keypoints),
+    ]
+
+    print(f"\n{'✅ すべて一致しました' if all(results) else '❌ 不一致があります'}")
+    sys.exit(0 if all(results) else 1)